@@ -0,0 +1,336 @@
+"""Read-only JSON API over the graphGita corpora (ASGI, no framework).
+
+Serves the same normalized corpora, indexes and shared graph as the Streamlit apps:
+
+    GET /api/corpora
+    GET /api/{corpus}/verses/{chapter}/{shloka}      (also /api/{corpus}/verses/2.47)
+    GET /api/{corpus}/chapters/{chapter}
+    GET /api/{corpus}/problems                        problem ids and descriptions
+    GET /api/{corpus}/problems/{problem}              problem with its verses
+    GET /api/{corpus}/themes                          themes with shloka counts
+    GET /api/{corpus}/themes/{theme}                  chapters for a theme
+    GET /api/{corpus}/search?q=detachment&limit=20
+    GET /api/{corpus}/graph/{node}                    ego graph, e.g. Chapter_2 or Problem_anger
+    GET /api/metrics                                  request timings (Prometheus text format)
+
+The corpus data never changes while the process runs, so successful responses of routes
+that take no query parameters are built once, serialized and kept with their ETag in an
+LRU cache of at most MAX_CACHED_BYTES; repeated requests are a dictionary lookup, and
+clients or a CDN revalidate with If-None-Match. Search results depend on the query and
+are built per request.
+
+Run locally with any ASGI server, e.g. `uvicorn api.index:app`.
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import networkx as nx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from gita_align import parse_verse_id
+from gita_corpus import CorpusRegistry, display_node_id, node_id
+from gita_metrics import METRICS
+
+CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=86400"
+# Response bodies kept per process; the precomputed responses take about 4 MB
+MAX_CACHED_BYTES = 64 * 1024 * 1024
+SEARCH_FIELDS = ('meaning', 'interpretation', 'transliteration', 'life_application')
+
+
+class NotFound(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+_registry: Optional[CorpusRegistry] = None
+_registry_lock = threading.Lock()
+# path -> (status, body, etag), least recently used first
+_responses: 'OrderedDict[str, Tuple[int, bytes, str]]' = OrderedDict()
+_responses_bytes = 0
+_responses_lock = threading.Lock()
+_search_indexes: Dict[str, Dict[str, set]] = {}
+
+
+def get_registry() -> CorpusRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CorpusRegistry()
+    return _registry
+
+
+def get_corpus(corpus_id: str):
+    registry = get_registry()
+    if corpus_id not in registry.corpora:
+        raise NotFound(f"Unknown corpus '{corpus_id}'")
+    return registry.get(corpus_id)
+
+
+def tokenize(text: str) -> List[str]:
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+
+def search_index(corpus) -> Dict[str, set]:
+    """Inverted index from word to (chapter, shloka) for one corpus, built on first search."""
+    if corpus.id not in _search_indexes:
+        index: Dict[str, set] = {}
+        for key, shloka in corpus.shlokas.items():
+            words = set(tokenize(' '.join(shloka[field] for field in SEARCH_FIELDS)))
+            words.update(word for keyword in shloka['keywords'] for word in tokenize(keyword))
+            for word in words:
+                index.setdefault(word, set()).add(key)
+        _search_indexes[corpus.id] = index
+    return _search_indexes[corpus.id]
+
+
+def themes_with_counts(corpus) -> List[Dict]:
+    """Chapter themes and philosophical aspects with the number of shlokas whose keywords match."""
+    counts: Dict[str, int] = {}
+    for chapter in corpus.data['chapters']:
+        for theme in {chapter['main_theme'], *chapter['philosophical_aspects']} - {''}:
+            counts[theme] = counts.get(theme, 0) + sum(
+                1 for shloka in chapter['shlokas']
+                if any(keyword.lower() in theme.lower() for keyword in shloka['keywords']))
+    return [{'theme': theme, 'shlokas': count}
+            for theme, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))]
+
+
+def chapter_overview(chapter: Dict) -> Dict:
+    return {key: value for key, value in chapter.items() if key != 'shlokas'}
+
+
+# Route handlers: each returns a JSON-serializable payload or raises NotFound/BadRequest
+def list_corpora(params):
+    registry = get_registry()
+    return [{'id': corpus_id, 'title': registry.title(corpus_id), 'work': registry.corpora[corpus_id].work}
+            for corpus_id in registry.ids()]
+
+
+def get_verse(params, corpus_id, chapter, shloka=None):
+    corpus = get_corpus(corpus_id)
+    reference = parse_verse_id(f"{chapter}.{shloka}" if shloka else chapter)
+    if not reference:
+        raise BadRequest("Verse must be given as /verses/{chapter}/{shloka} or /verses/{chapter}.{shloka}")
+    record = corpus.get_shloka(*reference)
+    if record is None:
+        raise NotFound(f"No verse {reference[0]}.{reference[1]} in {corpus_id}")
+    return record
+
+
+def get_chapter(params, corpus_id, chapter):
+    record = get_corpus(corpus_id).get_chapter(int(chapter)) if chapter.isascii() and chapter.isdigit() else None
+    if record is None:
+        raise NotFound(f"No chapter {chapter} in {corpus_id}")
+    return record
+
+
+def list_problems(params, corpus_id):
+    problems = get_corpus(corpus_id).data['problem_solutions_map']
+    return [{'problem': problem, 'description': details['description']} for problem, details in problems.items()]
+
+
+def get_problem(params, corpus_id, problem):
+    corpus = get_corpus(corpus_id)
+    details = corpus.data['problem_solutions_map'].get(problem)
+    if details is None:
+        raise NotFound(f"No problem '{problem}' in {corpus_id}")
+    verses = [corpus.get_shloka(ref['chapter'], ref['shloka']) for ref in details['references']]
+    return {'problem': problem, 'description': details['description'],
+            'references': details['references'], 'verses': [verse for verse in verses if verse]}
+
+
+def list_themes(params, corpus_id):
+    return themes_with_counts(get_corpus(corpus_id))
+
+
+def get_theme(params, corpus_id, theme):
+    chapters = [chapter_overview(chapter) for chapter in get_corpus(corpus_id).data['chapters']
+                if theme in chapter['main_theme'] or theme in chapter['philosophical_aspects']]
+    if not chapters:
+        raise NotFound(f"No chapters for theme '{theme}' in {corpus_id}")
+    return {'theme': theme, 'chapters': chapters}
+
+
+def search(params, corpus_id):
+    corpus = get_corpus(corpus_id)
+    words = tokenize(params.get('q', ''))
+    if not words:
+        raise BadRequest("Missing search query ?q=")
+    try:
+        limit = max(1, min(100, int(params.get('limit', 20))))
+    except ValueError:
+        raise BadRequest("limit must be a number")
+    index = search_index(corpus)
+    matches = set.intersection(*(index.get(word, set()) for word in words))
+    results = [corpus.shlokas[key] for key in sorted(matches)[:limit]]
+    return {'query': params['q'], 'total': len(matches), 'results': results}
+
+
+def get_graph(params, corpus_id, local_id):
+    registry = get_registry()
+    get_corpus(corpus_id)
+    G = registry.ensure_graph(corpus_id)
+    center = node_id(corpus_id, local_id)
+    with registry.lock:
+        if center not in G:
+            raise NotFound(f"No graph node '{local_id}' in {corpus_id}")
+        subgraph = nx.ego_graph(G, center, radius=1)
+        nodes = [{'id': display_node_id(node, corpus_id), **data} for node, data in subgraph.nodes(data=True)]
+        edges = [{'source': display_node_id(source, corpus_id),
+                  'target': display_node_id(target, corpus_id)}
+                 for source, target in subgraph.edges()]
+    return {'center': local_id, 'nodes': nodes, 'edges': edges}
+
+
+# ASCII patterns: /chapters/٣ must not match and be cached next to /chapters/3
+ROUTES = [
+    (re.compile(r'^/api/corpora$', re.ASCII), list_corpora),
+    (re.compile(r'^/api/(?P<corpus_id>\w+)/verses/(?P<chapter>[\d.:]+)(?:/(?P<shloka>\d+))?$', re.ASCII), get_verse),
+    (re.compile(r'^/api/(?P<corpus_id>\w+)/chapters/(?P<chapter>[^/]+)$', re.ASCII), get_chapter),
+    (re.compile(r'^/api/(?P<corpus_id>\w+)/problems$', re.ASCII), list_problems),
+    (re.compile(r'^/api/(?P<corpus_id>\w+)/problems/(?P<problem>[^/]+)$', re.ASCII), get_problem),
+    (re.compile(r'^/api/(?P<corpus_id>\w+)/themes$', re.ASCII), list_themes),
+    (re.compile(r'^/api/(?P<corpus_id>\w+)/themes/(?P<theme>[^/]+)$', re.ASCII), get_theme),
+    (re.compile(r'^/api/(?P<corpus_id>\w+)/search$', re.ASCII), search),
+    (re.compile(r'^/api/(?P<corpus_id>\w+)/graph/(?P<local_id>[^/]+)$', re.ASCII), get_graph),
+]
+# Routes whose response depends on the query string; they are not cached
+QUERY_ROUTES = {search}
+
+
+def encode(status: int, payload) -> Tuple[int, bytes, str]:
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return status, body, '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def render(path: str, query: str) -> Tuple[int, bytes, str]:
+    """Build (or fetch the precomputed) response for one request target.
+
+    Cached responses are keyed by path alone: only routes that read no query
+    parameters are cached, so junk parameters cannot add entries."""
+    with _responses_lock:
+        cached = _responses.get(path)
+        if cached is not None:
+            _responses.move_to_end(path)
+            return cached
+
+    params = {name: values[0] for name, values in parse_qs(query).items()}
+    cacheable = False
+    for pattern, handler in ROUTES:
+        match = pattern.match(path)
+        if match:
+            cacheable = handler not in QUERY_ROUTES
+            try:
+                started = time.perf_counter()
+                response = encode(200, handler(params, **{k: v for k, v in match.groupdict().items() if v}))
+                METRICS.observe('api', handler.__name__, time.perf_counter() - started)
+            except NotFound as e:
+                response = encode(404, {'error': str(e)})
+            except BadRequest as e:
+                response = encode(400, {'error': str(e)})
+            break
+    else:
+        response = encode(404, {'error': f"No route for {path}"})
+
+    # Only successful responses are kept, so arbitrary unknown paths cannot fill the cache
+    if cacheable and response[0] == 200:
+        cache_response(path, response)
+    return response
+
+
+def cache_response(path: str, response: Tuple[int, bytes, str]) -> None:
+    """Keep a response, evicting the least recently used ones beyond MAX_CACHED_BYTES."""
+    global _responses_bytes
+    size = len(response[1])
+    if size > MAX_CACHED_BYTES:
+        return
+    with _responses_lock:
+        if path in _responses:
+            return
+        _responses[path] = response
+        _responses_bytes += size
+        while _responses_bytes > MAX_CACHED_BYTES:
+            _, evicted = _responses.popitem(last=False)
+            _responses_bytes -= len(evicted[1])
+
+
+def precompute(corpus_ids: Optional[List[str]] = None) -> int:
+    """Render every verse, chapter, problem and theme response ahead of traffic."""
+    registry = get_registry()
+    paths = ['/api/corpora']
+    for corpus_id in corpus_ids or registry.ids():
+        corpus = registry.get(corpus_id)
+        paths += [f'/api/{corpus_id}/problems', f'/api/{corpus_id}/themes']
+        paths += [f'/api/{corpus_id}/chapters/{number}' for number in corpus.chapters]
+        paths += [f'/api/{corpus_id}/verses/{chapter}/{shloka}' for chapter, shloka in corpus.shlokas]
+        paths += [f'/api/{corpus_id}/problems/{problem}' for problem in corpus.data['problem_solutions_map']]
+    for path in paths:
+        render(path, '')
+    return len(paths)
+
+
+def preload(corpus_ids: Optional[List[str]] = None) -> int:
+    """Load corpora, graph and search indexes and precompute responses before serving.
+
+    gita_serve.py calls this in its parent process, so forked workers start warm and share
+    the data copy-on-write. Precomputed bodies are flat bytes objects, so serving them only
+    touches the page holding each object header, not the payload itself."""
+    registry = get_registry()
+    corpus_ids = registry.preload(corpus_ids)
+    for corpus_id in corpus_ids:
+        search_index(registry.get(corpus_id))
+    return precompute(corpus_ids)
+
+
+async def app(scope, receive, send):
+    """ASGI entry point (GET/HEAD only)."""
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                get_registry()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    started = time.perf_counter()
+    if scope['method'] == 'GET' and scope['path'] == '/api/metrics':
+        body = METRICS.to_prometheus().encode('utf-8')
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/plain; version=0.0.4'), (b'cache-control', b'no-store'),
+            (b'content-length', str(len(body)).encode())]})
+        await send({'type': 'http.response.body', 'body': body})
+        return
+    if scope['method'] not in ('GET', 'HEAD'):
+        status, body, etag = encode(405, {'error': "Method not allowed"})
+    else:
+        # ASGI servers percent-decode the path already
+        path = scope['path'].rstrip('/') or '/'
+        status, body, etag = render(path, scope.get('query_string', b'').decode('latin-1'))
+
+    headers = [(b'content-type', b'application/json; charset=utf-8'), (b'etag', etag.encode())]
+    headers.append((b'cache-control', CACHE_CONTROL.encode() if status == 200 else b'no-store'))
+    if_none_match = dict(scope.get('headers', [])).get(b'if-none-match', b'').decode()
+    if status == 200 and etag in (tag.strip() for tag in if_none_match.split(',')):
+        status, body = 304, b''
+    headers.append((b'content-length', str(len(body)).encode()))
+
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
+    METRICS.observe('api', 'request', time.perf_counter() - started)
@@ -1,52 +1,103 @@
 import streamlit as st
 import json
-import networkx as nx
-from streamlit_agraph import agraph, Node, Edge, Config
-from typing import Dict, List, Optional, Union, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Union, Tuple
 import os
-from gtts import gTTS
-import os
-from io import BytesIO
+from gita_corpus import DEFAULT_CORPUS, CorpusRegistry, display_node_id, node_id
+from gita_align import AlignmentIndex, load_or_build, parse_verse_id, verse_id
+from gita_audio import AudioService
+from gita_clusters import NODE_BUDGET, ClusterTree, lod_graph
+from gita_metrics import METRICS, run_instrumented, timed
+from gita_payload import vis_payload
+from gita_webgl import graph_payload, webgl_graph
+
+# networkx and streamlit_agraph are imported by the graph views that use them, so a cold
+# worker serving text-only views never pays for them
+if TYPE_CHECKING:
+    import networkx as nx
+    from streamlit_agraph import Node, Edge, Config
+
+# Node colors and sizes by type, shared by the vis.js graphs and the WebGL full graph
+NODE_STYLES = {
+    'problem': {'color': '#FFD700', 'size': 30},
+    'chapter': {'color': '#87CEEB', 'size': 25},
+    'shloka': {'color': '#F08080', 'size': 20},
+    'theme': {'color': '#90EE90', 'size': 35},
+    'character': {'color': '#FFD700', 'size': 30},
+    'event': {'color': '#87CEEB', 'size': 25}
+}
+EDGE_STYLE = {'color': '#666666', 'smooth': {'type': 'curvedCW', 'roundness': 0.2}}
+
+# Opt-in: number of verse clips to synthesize ahead when a chapter or problem page opens
+AUDIO_PREFETCH = int(os.environ.get('GRAPHGITA_AUDIO_PREFETCH', '0'))
+# How often a pending audio placeholder checks its job
+AUDIO_POLL_SECONDS = 0.5
+
+@st.cache_resource
+def get_corpus_registry() -> CorpusRegistry:
+    """One corpus registry (data, indexes and graph) shared by every session of this process"""
+    return CorpusRegistry()
+
+@st.cache_resource
+def get_audio_service() -> AudioService:
+    """Background speech synthesis shared by every session, so each clip is generated once"""
+    return AudioService()
+
+@st.cache_resource
+def get_alignment_index() -> AlignmentIndex:
+    """Cross-edition verse alignment, precomputed by gita_align.py or built once per process"""
+    return load_or_build(get_corpus_registry())
+
+@st.cache_resource
+def get_cluster_tree(corpus_id: str) -> ClusterTree:
+    """Chapter, keyword-community and problem clusters of a corpus, built once per process"""
+    return ClusterTree.build(get_corpus_registry().get(corpus_id))
+
+@st.cache_resource
+def get_full_graph_payload() -> Dict:
+    """Positions and typed arrays of every corpus for the WebGL graph, built once per process"""
+    return graph_payload([get_cluster_tree(corpus_id) for corpus_id in get_corpus_registry().ids()], NODE_STYLES)
+
+def show_edition_comparison(registry: CorpusRegistry, corpus_id: str):
+    """Sidebar lookup showing one verse in every edition of the selected text"""
+    with st.sidebar.expander("🔀 Compare a verse across editions"):
+        reference = st.text_input("Verse (chapter.verse)", placeholder="2.47", key="compare_verse")
+        if not reference:
+            return
+        parsed = parse_verse_id(reference)
+        if not parsed:
+            st.warning("Enter a verse as chapter.verse, e.g. 2.47")
+            return
+        work = registry.corpora[corpus_id].work
+        records = get_alignment_index().compare(registry, work, verse_id(*parsed))
+        if not records:
+            st.info(f"Verse {verse_id(*parsed)} was not found in any edition.")
+        for edition_id, shloka in records:
+            st.markdown(f"**{registry.title(edition_id)}** (Shloka {shloka['chapter']}.{shloka['shloka_number']})")
+            st.text(shloka['sanskrit_text'])
+            st.write(shloka['meaning'] or shloka['interpretation'])
 
 # Helper Functions
-def display_shloka_content(shloka, chapter_num):
-    """Helper function to display shloka content with audio controls"""
+@st.experimental_fragment
+def display_shloka_content(shloka, chapter_num, key_scope="theme"):
+    """Verse card with audio controls; pressing an audio button reruns only this card,
+    which then polls until the clip is ready"""
     # Sanskrit Text Section
     shloka_text = shloka.get('sanskrit_text', '')
     if shloka_text:
         col1, col2 = st.columns([1, 4])
         with col1:
-            if st.button("🔊 Sanskrit", 
-                       key=f"sanskrit_theme_{chapter_num}_{shloka['shloka_number']}"):
-                audio_file = generate_audio(
-                    shloka_text,
-                    filename=f"sanskrit_{chapter_num}_{shloka['shloka_number']}.mp3",
-                    lang='hi'
-                )
-                st.audio(audio_file, format="audio/mp3")
+            audio_controls("🔊 Sanskrit", shloka_text, 'hi',
+                           key=f"sanskrit_{key_scope}_{chapter_num}_{shloka['shloka_number']}")
         with col2:
             st.markdown("**Sanskrit Text:**")
             st.text(shloka_text)
     
     # English sections
     if 'transliteration' in shloka:
-        # Create English text without transliteration
-        english_text = f"Meaning: {shloka.get('meaning', '')}\n\n"
-        if 'interpretation' in shloka:
-            english_text += f"Interpretation: {shloka['interpretation']}\n\n"
-        if 'life_application' in shloka:
-            english_text += f"Life Application: {shloka['life_application']}"
-        
         col1, col2 = st.columns([1, 4])
         with col1:
-            if st.button("🔊 Explanation", 
-                       key=f"english_theme_{chapter_num}_{shloka['shloka_number']}"):
-                audio_file = generate_audio(
-                    english_text,
-                    filename=f"english_{chapter_num}_{shloka['shloka_number']}.mp3",
-                    lang='en'
-                )
-                st.audio(audio_file, format="audio/mp3")
+            audio_controls("🔊 Explanation", explanation_text(shloka), 'en',
+                           key=f"english_{key_scope}_{chapter_num}_{shloka['shloka_number']}")
         
         # Display text sections
         with col2:
@@ -65,51 +116,110 @@ def display_shloka_content(shloka, chapter_num):
                 st.markdown("**Life Application:**")
                 st.write(shloka['life_application'])
 
-def generate_audio(text: str, filename: str = "shloka.mp3", lang: str = 'hi'):
-    """Generate audio from text with language support and loading spinner"""
-    with st.spinner('Generating audio, please wait...'):
-        if lang == 'en':
-            lang = 'en-IN'  # Use Indian English accent
-        
-        audio_bytes = BytesIO()
-        tts = gTTS(text=text, lang=lang)
-        tts.write_to_fp(audio_bytes)
-        audio_bytes.seek(0)
-        return audio_bytes
-
-def create_node(id: str, label: str, node_type: str) -> Node:
-    """Helper function to create nodes with consistent styling"""
-    type_to_style = {
-        'problem': {'color': '#FFD700', 'size': 30, 'shape': 'dot'},
-        'chapter': {'color': '#87CEEB', 'size': 25, 'shape': 'dot'},
-        'shloka': {'color': '#F08080', 'size': 20, 'shape': 'dot'},
-        'theme': {'color': '#90EE90', 'size': 35, 'shape': 'dot'},
-        'character': {'color': '#FFD700', 'size': 30, 'shape': 'dot'},
-        'event': {'color': '#87CEEB', 'size': 25, 'shape': 'dot'}
-    }
-    
-    style = type_to_style.get(node_type, {'color': '#FFFFFF', 'size': 25, 'shape': 'dot'})
-    
-    return Node(
-        id=id,
-        label=label,
-        size=style['size'],
-        shape=style['shape'],
-        color=style['color']
-    )
+def explanation_text(shloka) -> str:
+    """English text read out by the Explanation button (without the transliteration)"""
+    english_text = f"Meaning: {shloka.get('meaning', '')}\n\n"
+    if 'interpretation' in shloka:
+        english_text += f"Interpretation: {shloka['interpretation']}\n\n"
+    if 'life_application' in shloka:
+        english_text += f"Life Application: {shloka['life_application']}"
+    return english_text
 
-def create_edge(source: str, target: str, label: str = "") -> Edge:
-    """Helper function to create edges with consistent styling"""
-    return Edge(
-        source=source,
-        target=target,
-        label=label,
-        color="#666666",
-        smooth={'type': 'curvedCW', 'roundness': 0.2}
-    )
+def prefetch_audio(page_key: str, shlokas):
+    """Queue the first AUDIO_PREFETCH clips of a page for background synthesis, once per page view"""
+    if not AUDIO_PREFETCH or st.session_state.get("audio_prefetched_page") == page_key:
+        return
+    st.session_state["audio_prefetched_page"] = page_key
+    clips = []
+    for shloka in shlokas:
+        if shloka.get('sanskrit_text'):
+            clips.append((shloka['sanskrit_text'], 'hi'))
+        if 'transliteration' in shloka:
+            clips.append((explanation_text(shloka), 'en'))
+    get_audio_service().prefetch(clips, AUDIO_PREFETCH)
+
+def audio_controls(label: str, text: str, lang: str, key: str):
+    """Audio button; the clip is synthesized in the background and shown once it is ready.
 
-def create_agraph_config() -> Config:
+    While the job is pending the verse card polls (see poll_fragment), so the card alone
+    reruns until the player can be shown. Session state only holds the pending job, then
+    a flag: the player reads the clip from the shared audio cache, so no session keeps
+    mp3 bytes."""
+    if st.button(label, key=key):
+        job = get_audio_service().request(text, lang)
+        if job is None:
+            st.warning("Audio generation is busy, please try again in a moment.")
+            return
+        st.session_state[f"{key}_job"] = job
+    job = st.session_state.get(f"{key}_job")
+    if job and job.done():
+        del st.session_state[f"{key}_job"]
+        if job.error:
+            st.error(f"Audio generation failed: {job.error}")
+            st.session_state.pop(f"{key}_ready", None)
+        else:
+            st.session_state[f"{key}_ready"] = True
+    elif job:
+        st.caption("⏳ Generating audio...")
+        poll_fragment(AUDIO_POLL_SECONDS)
+        return
+    if st.session_state.get(f"{key}_ready"):
+        audio = get_audio_service().cached(text, lang)
+        if audio is None:
+            # Evicted from the cache; the button synthesizes it again
+            del st.session_state[f"{key}_ready"]
+        else:
+            st.audio(audio, format="audio/mp3")
+
+def poll_fragment(interval: float):
+    """Rerun the running fragment every `interval` seconds, as run_every would, from now on.
+
+    Streamlit 1.34 only sets run_every where a fragment is declared and does not nest
+    fragments, so a verse card that starts an audio job asks for polling itself with the
+    same auto_rerun message. The browser drops polling on the next full script run."""
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None or ctx.current_fragment_id is None:
+        return
+    # Reset by main(), which only runs on full script runs
+    polling = st.session_state.setdefault("polling_fragments", set())
+    if ctx.current_fragment_id in polling:
+        return
+    polling.add(ctx.current_fragment_id)
+    msg = ForwardMsg()
+    msg.auto_rerun.interval = interval
+    msg.auto_rerun.fragment_id = ctx.current_fragment_id
+    ctx.enqueue(msg)
+
+def agraph(nodes: List['Node'], edges: List['Edge'], config: 'Config') -> Optional[str]:
+    """Render an agraph component from a compact payload; returns the clicked node's id.
+
+    Node and edge styles are sent once in the config and node ids as integers (see
+    gita_payload.py); streamlit_agraph is imported on first use."""
+    from streamlit_agraph import _agraph
+
+    data, options, ids = vis_payload(nodes, edges, config.to_dict(), NODE_STYLES, EDGE_STYLE)
+    clicked = _agraph(data=data, config=options)
+    return ids[clicked] if isinstance(clicked, int) and 0 <= clicked < len(ids) else None
+
+def create_node(id: str, label: str, node_type: str) -> 'Node':
+    """Helper function to create nodes; their style comes from NODE_STYLES by type"""
+    from streamlit_agraph import Node
+
+    return Node(id=id, label=label, group=node_type)
+
+def create_edge(source: str, target: str, label: str = "") -> 'Edge':
+    """Helper function to create edges; their style is EDGE_STYLE"""
+    from streamlit_agraph import Edge
+
+    return Edge(source=source, target=target, label=label)
+
+def create_agraph_config() -> 'Config':
     """Create consistent agraph configuration for graph visualization"""
+    from streamlit_agraph import Config
+
     config = Config(
         width="100%",
         height=600,
@@ -227,68 +337,38 @@ def show_about_section():
     """, unsafe_allow_html=True)
 
 class GitaGraphRAG:
-    def __init__(self):
-        self.current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.data_path = os.path.join(self.current_dir, 'data', 'bhagavad_gita_complete.json')
+    def __init__(self, corpus_id: str = DEFAULT_CORPUS, registry: Optional[CorpusRegistry] = None):
+        self.registry = registry or get_corpus_registry()
+        self.corpus_id = corpus_id
+        self.corpus = None
         self.data = self._load_data()
-        self.G = nx.Graph()
-        self.build_knowledge_graph()
         
+    @timed('_load_data')
     def _load_data(self) -> Optional[Dict]:
-        """Load the Bhagavad Gita JSON data"""
+        """Load the selected corpus (parsed once per process by the shared registry)"""
         try:
-            with open(self.data_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data
+            self.corpus = self.registry.get(self.corpus_id)
+            return self.corpus.data
         except Exception as e:
             st.error(f"Error loading data: {str(e)}")
             return None
             
+    @property
+    def G(self) -> 'nx.Graph':
+        """The shared knowledge graph, with this corpus added on first use by a graph view"""
+        self.build_knowledge_graph()
+        return self.registry.graph
+
+    @timed('build_knowledge_graph')
     def build_knowledge_graph(self) -> None:
-        """Build the knowledge graph from the loaded data"""
+        """Add the corpus to the shared knowledge graph (once per process)"""
         if not self.data:
             return
-            
-        # Add problem nodes first
-        if 'problem_solutions_map' in self.data:
-            for problem, details in self.data['problem_solutions_map'].items():
-                problem_id = f"Problem_{problem}"
-                self.G.add_node(problem_id,
-                              type='problem',
-                              name=problem,
-                              description=details['description'])
-                
-                # Add references as edges to chapters/shlokas
-                for ref in details['references']:
-                    shloka_id = f"Shloka_{ref['chapter']}_{ref['shloka']}"
-                    chapter_id = f"Chapter_{ref['chapter']}"
-                    
-                    # Add edges to both chapter and shloka
-                    self.G.add_edge(problem_id, chapter_id)
-                    self.G.add_edge(problem_id, shloka_id)
-        
-        # Add chapter nodes
-        if 'chapters' in self.data:
-            for chapter in self.data['chapters']:
-                chapter_id = f"Chapter_{chapter['number']}"
-                node_attrs = {
-                    'type': 'chapter',
-                    'name': chapter.get('name', ''),
-                    'number': chapter.get('number', 0),
-                    'summary': chapter.get('summary', ''),
-                    'main_theme': chapter.get('main_theme', '')
-                }
-                self.G.add_node(chapter_id, **node_attrs)
-                
-                # Add shloka nodes
-                for shloka in chapter.get('shlokas', []):
-                    shloka_id = f"Shloka_{chapter['number']}_{shloka['shloka_number']}"
-                    self.G.add_node(shloka_id,
-                                  type='shloka',
-                                  sanskrit_text=shloka.get('sanskrit_text', ''),
-                                  meaning=shloka.get('meaning', ''),
-                                  interpretation=shloka.get('interpretation', ''))
-                    self.G.add_edge(chapter_id, shloka_id)
+        self.registry.ensure_graph(self.corpus_id)
+
+    def node_id(self, local_id: str) -> str:
+        """Namespaced graph id for a node of this corpus, e.g. Chapter_2"""
+        return node_id(self.corpus_id, local_id)
 
     def get_problem_solutions(self, problem: str) -> Optional[Dict]:
         """Get solutions for a specific problem"""
@@ -298,40 +378,40 @@ class GitaGraphRAG:
 
     def get_shloka_by_reference(self, chapter: int, shloka: int) -> Optional[Dict]:
         """Get shloka details by chapter and shloka number"""
-        if 'chapters' in self.data:
-            chapter_data = next((ch for ch in self.data['chapters'] 
-                               if ch['number'] == chapter), None)
-            if chapter_data:
-                return next((sh for sh in chapter_data.get('shlokas', [])
-                           if sh['shloka_number'] == shloka), None)
-        return None
+        return self.corpus.get_shloka(chapter, shloka)
 
-    def visualize_chapter_graph(self, node_id: str) -> Tuple[List[Node], List[Edge]]:
+    @timed('visualize_chapter_graph')
+    def visualize_chapter_graph(self, node_id: str) -> Tuple[List['Node'], List['Edge']]:
         """Create agraph visualization of the graph for a specific node"""
+        import networkx as nx
+
         nodes = []
         edges = []
         seen_nodes = set()
         
         # Create subgraph for the selected node
-        subgraph = nx.ego_graph(self.G, node_id, radius=1)
+        with self.registry.lock:
+            subgraph = nx.ego_graph(self.G, self.node_id(node_id), radius=1)
         
         # Add nodes
         for node in subgraph.nodes():
             if node not in seen_nodes:
-                node_data = self.G.nodes[node]
-                node_type = node_data['type']
+                node_data = subgraph.nodes[node]
+                node_type = node_data.get('type')
                 label = f"{node_data.get('name', '')} {node.split('_')[-1]}"
                 
-                nodes.append(create_node(node, label, node_type))
+                nodes.append(create_node(display_node_id(node, self.corpus_id), label, node_type))
                 seen_nodes.add(node)
         
         # Add edges
         for source, target in subgraph.edges():
-            edges.append(create_edge(source, target))
+            edges.append(create_edge(display_node_id(source, self.corpus_id),
+                                     display_node_id(target, self.corpus_id)))
         
         return nodes, edges
 
-    def visualize_theme_relationships(self, selected_theme: str, related_chapters: list) -> Tuple[List[Node], List[Edge]]:
+    @timed('visualize_theme_relationships')
+    def visualize_theme_relationships(self, selected_theme: str, related_chapters: list) -> Tuple[List['Node'], List['Edge']]:
         """Create agraph visualization showing relationships between theme, chapters, and shlokas"""
         nodes = []
         edges = []
@@ -370,6 +450,16 @@ class GitaGraphRAG:
         
         return nodes, edges
 
+    @timed('visualize_clusters')
+    def visualize_clusters(self, expanded: List[str]) -> Tuple[List['Node'], List['Edge'], List[str]]:
+        """Create agraph visualization of the corpus clusters, with the clusters in `expanded` opened"""
+        clusters, links, opened = lod_graph(get_cluster_tree(self.corpus_id), expanded)
+        nodes = [create_node(cluster['id'], cluster['label'], cluster['type']) for cluster in clusters]
+        edges = [create_edge(source, target, str(count) if count > 1 else "")
+                 for source, target, count in links]
+        return nodes, edges, opened
+
+    @timed('display_chapter_insights')
     def display_chapter_insights(self):
         """Display chapter insights with character-centric relationships."""
         st.header("Ontology of Characters")
@@ -453,55 +543,7 @@ class GitaGraphRAG:
                             if shloka:
                                 st.markdown(f"#### Shloka {shloka_num}")
                                 
-                                shloka_text = shloka.get('sanskrit_text', '')
-                                if shloka_text:
-                                    col1, col2 = st.columns([1, 4])
-                                    with col1:
-                                        if st.button("🔊 Sanskrit", 
-                                                   key=f"sanskrit_{selected_chapter_num}_{char}_{event_index}_{shloka_index}"):
-                                            audio_file = generate_audio(
-                                                shloka_text,
-                                                filename=f"sanskrit_{selected_chapter_num}_{shloka_num}.mp3",
-                                                lang='hi'
-                                            )
-                                            st.audio(audio_file, format="audio/mp3")
-                                    with col2:
-                                        st.markdown("**Sanskrit Text:**")
-                                        st.text(shloka_text)
-                                
-                                if 'transliteration' in shloka:
-                                    english_text = f"Meaning: {shloka.get('meaning', '')}\n\n"
-                                    if 'interpretation' in shloka:
-                                        english_text += f"Interpretation: {shloka['interpretation']}\n\n"
-                                    if 'life_application' in shloka:
-                                        english_text += f"Life Application: {shloka['life_application']}"
-                                    
-                                    col1, col2 = st.columns([1, 4])
-                                    with col1:
-                                        if st.button("🔊 Explanation", 
-                                                   key=f"english_{selected_chapter_num}_{char}_{event_index}_{shloka_index}"):
-                                            audio_file = generate_audio(
-                                                english_text,
-                                                filename=f"english_{selected_chapter_num}_{shloka_num}.mp3",
-                                                lang='en'
-                                            )
-                                            st.audio(audio_file, format="audio/mp3")
-                                    
-                                    with col2:
-                                        if 'transliteration' in shloka:
-                                            st.markdown("**Transliteration:**")
-                                            st.write(shloka['transliteration'])
-                                        
-                                        st.markdown("**Meaning:**")
-                                        st.write(shloka['meaning'])
-                                        
-                                        if 'interpretation' in shloka:
-                                            st.markdown("**Interpretation:**")
-                                            st.write(shloka['interpretation'])
-                                        
-                                        if 'life_application' in shloka:
-                                            st.markdown("**Life Application:**")
-                                            st.write(shloka['life_application'])
+                                display_shloka_content(shloka, selected_chapter_num, f"{char}_{event_index}_{shloka_index}")
 
                 char_relationships = [
                     rel for rel in selected_chapter.get('character_relationships', [])
@@ -516,6 +558,7 @@ class GitaGraphRAG:
         config = create_agraph_config()
         agraph(nodes=nodes, edges=edges, config=config)
 
+@timed('get_themes_from_chapters')
 def get_themes_from_chapters(data):
     """Extract all unique themes from chapters with their shloka counts"""
     theme_counts = {}
@@ -543,6 +586,7 @@ def get_themes_from_chapters(data):
     
     return sorted_themes
 
+@timed('find_chapters_by_theme')
 def find_chapters_by_theme(data, theme):
     """Find all chapters that contain a specific theme"""
     matching_chapters = []
@@ -552,8 +596,96 @@ def find_chapters_by_theme(data, theme):
             matching_chapters.append(chapter)
     return matching_chapters
 
+def show_cluster_graph(rag, scope: str, expanded: Optional[List[str]] = None):
+    """Level-of-detail graph of the corpus: clusters first, a click opens or closes one.
+
+    At most NODE_BUDGET nodes are sent to the browser however large the corpus is."""
+    key = f"clusters_{rag.corpus_id}_{scope}"
+    if key not in st.session_state:
+        st.session_state[key] = list(expanded or [])
+    nodes, edges, opened = rag.visualize_clusters(st.session_state[key])
+    # Expansions that no longer fit the node budget are closed
+    st.session_state[key] = opened
+    st.caption(f"Click a cluster to open or close it (up to {NODE_BUDGET} nodes are shown).")
+    clicked = agraph(nodes=nodes, edges=edges, config=create_agraph_config())
+
+    # The component keeps returning the last click until its data changes
+    handled = f"{key}_clicked"
+    tree = get_cluster_tree(rag.corpus_id)
+    if not clicked:
+        st.session_state.pop(handled, None)
+    elif clicked != st.session_state.get(handled) and tree.is_cluster(clicked):
+        st.session_state[handled] = clicked
+        if clicked in opened:
+            # Closing a cluster closes the clusters opened inside it too
+            st.session_state[key] = [cluster for cluster in opened if not tree.within(cluster, clicked)]
+        else:
+            st.session_state[key] = opened + [clicked]
+        st.rerun()
+
+def show_chapter_panels(rag, chapter_data, selected_chapter_num):
+    """Chapter content, knowledge graph or corpus map.
+
+    Only the visible panel is rendered, so the graph component mounts at full size on
+    first paint instead of inside a hidden tab, which needed a second script run."""
+    panel = st.radio(
+        "Chapter view",
+        ["📝 Chapter Content", "🕸️ Knowledge Graph", "🗺️ Corpus Map"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="chapter_panel"
+    )
+    
+    if panel == "📝 Chapter Content":
+        prefetch_audio(f"{rag.corpus_id}/chapter/{selected_chapter_num}", chapter_data.get('shlokas', []))
+        st.markdown("### 📋 Summary")
+        st.write(chapter_data['summary'])
+        
+        st.markdown("### 🕉️ Shlokas")
+        for shloka in chapter_data.get('shlokas', []):
+            with st.expander(f"🪶 Shloka {shloka['shloka_number']}"):
+                display_shloka_content(shloka, selected_chapter_num, "ch")
+    elif panel == "🕸️ Knowledge Graph":
+        st.markdown("### 🕸️ Chapter Knowledge Graph")
+        nodes, edges = rag.visualize_chapter_graph(f"Chapter_{selected_chapter_num}")
+        if len(nodes) > NODE_BUDGET:
+            # Too many verses to read or lay out: show the chapter's keyword communities instead
+            show_cluster_graph(rag, f"chapter_{selected_chapter_num}", [f"Chapter_{selected_chapter_num}"])
+        else:
+            config = create_agraph_config()
+            agraph(nodes=nodes, edges=edges, config=config)
+    else:
+        st.markdown(f"### 🗺️ {rag.corpus.title} Map")
+        show_cluster_graph(rag, "corpus")
+
+def show_full_graph(registry: CorpusRegistry):
+    """Every chapter, verse and life problem of every corpus in one WebGL graph."""
+    st.caption("Drag to pan, scroll to zoom, double-click to reset. Click a node to read it below.")
+    clicked = webgl_graph(get_full_graph_payload(), height=720, key="full_graph")
+    if not clicked:
+        return
+    corpus_id, local_id = clicked.split(':', 1)
+    corpus = registry.get(corpus_id)
+    kind, _, rest = local_id.partition('_')
+    st.markdown(f"#### {corpus.title}")
+    if kind == 'Shloka':
+        chapter_num, shloka_num = (int(part) for part in rest.split('_'))
+        st.markdown(f"**Shloka {chapter_num}.{shloka_num}**")
+        display_shloka_content(corpus.get_shloka(chapter_num, shloka_num), chapter_num, f"full_{corpus_id}")
+    elif kind == 'Chapter':
+        chapter = corpus.get_chapter(int(rest))
+        st.markdown(f"**Chapter {chapter['number']}: {chapter.get('name', '')}**")
+        st.write(chapter.get('summary', ''))
+    elif kind == 'Problem':
+        details = corpus.data.get('problem_solutions_map', {}).get(rest, {})
+        st.markdown(f"**{rest.replace('_', ' ').title()}**: {details.get('description', '')}")
+        for ref in details.get('references', []):
+            st.markdown(f"- Chapter {ref['chapter']}, Shloka {ref['shloka']}")
+
 def main():
     st.set_page_config(page_title="Bhagavad Gita Knowledge Graph", layout="wide")
+    # A full run makes the browser stop every fragment's polling
+    st.session_state["polling_fragments"] = set()
     
     # Custom CSS for sidebar
     st.markdown("""
@@ -578,14 +710,25 @@ def main():
     </style>
     """, unsafe_allow_html=True)
     
+    # Corpus selection; every corpus is normalized to the same model at load time
+    registry = get_corpus_registry()
+    corpus_id = st.sidebar.selectbox(
+        "Choose a text:",
+        registry.ids(),
+        format_func=registry.title,
+        key="corpus_selector"
+    )
+    
+    show_edition_comparison(registry, corpus_id)
+    
     # Main title with emoji
-    st.title("🕉️ Bhagavad Gita Knowledge Graph")
+    st.title(f"🕉️ {registry.title(corpus_id)} Knowledge Graph")
     
     # Initialize the RAG system
-    rag = GitaGraphRAG()
+    rag = GitaGraphRAG(corpus_id, registry)
     
     if not rag.data:
-        st.error("Failed to load Bhagavad Gita data.")
+        st.error(f"Failed to load {registry.title(corpus_id)} data.")
         return
     
     # Enhanced Sidebar for navigation
@@ -598,9 +741,11 @@ def main():
         
         view_option = st.selectbox(
             "Choose your exploration path:",
-            ["Chapter Topology", "Ontologies of Wisdom", "Philosophical Themes Triples", "Ontology of Characters"],
+            ["Chapter Topology", "Ontologies of Wisdom", "Philosophical Themes Triples", "Ontology of Characters",
+             "Full Graph Explorer"],
             format_func=lambda x: f"📌 {x}"  # Add emoji prefix
         )
+        METRICS.set_view(view_option)
     
     # Show About section in sidebar
     show_about_section()
@@ -622,84 +767,14 @@ def main():
         if chapter_data:
             st.subheader(f"📜 Chapter {selected_chapter_num}: {chapter_data['name']}")
             
-            content_tab, graph_tab = st.tabs(["📝 Chapter Content", "🕸️ Knowledge Graph"])
-            
-            with content_tab:
-                st.markdown("### 📋 Summary")
-                st.write(chapter_data['summary'])
-                
-                st.markdown("### 🕉️ Shlokas")
-                for shloka in chapter_data.get('shlokas', []):
-                    with st.expander(f"🪶 Shloka {shloka['shloka_number']}"):
-                        shloka_text = shloka.get('sanskrit_text', '')
-                        
-                        if shloka_text:
-                            col1, col2 = st.columns([1, 4])
-                            with col1:
-                                if st.button("🔊 Sanskrit", 
-                                           key=f"sanskrit_ch_{selected_chapter_num}_{shloka['shloka_number']}"):
-                                    audio_file = generate_audio(
-                                        shloka_text,
-                                        filename=f"sanskrit_{selected_chapter_num}_{shloka['shloka_number']}.mp3",
-                                        lang='hi'
-                                    )
-                                    st.audio(audio_file, format="audio/mp3")
-                            with col2:
-                                st.markdown("**Sanskrit Text:**")
-                                st.text(shloka_text)
-                        
-                        if 'transliteration' in shloka:
-                            english_text = f"Meaning: {shloka.get('meaning', '')}\n\n"
-                            if 'interpretation' in shloka:
-                                english_text += f"Interpretation: {shloka['interpretation']}\n\n"
-                            if 'life_application' in shloka:
-                                english_text += f"Life Application: {shloka['life_application']}"
-                            
-                            col1, col2 = st.columns([1, 4])
-                            with col1:
-                                if st.button("🔊 Explanation", 
-                                           key=f"english_ch_{selected_chapter_num}_{shloka['shloka_number']}"):
-                                    audio_file = generate_audio(
-                                        english_text,
-                                        filename=f"english_{selected_chapter_num}_{shloka['shloka_number']}.mp3",
-                                        lang='en'
-                                    )
-                                    st.audio(audio_file, format="audio/mp3")
-                            
-                            with col2:
-                                if 'transliteration' in shloka:
-                                    st.markdown("**Transliteration:**")
-                                    st.write(shloka['transliteration'])
-                                
-                                st.markdown("**Meaning:**")
-                                st.write(shloka['meaning'])
-                                
-                                if 'interpretation' in shloka:
-                                    st.markdown("**Interpretation:**")
-                                    st.write(shloka['interpretation'])
-                                
-                                if 'life_application' in shloka:
-                                    st.markdown("**Life Application:**")
-                                    st.write(shloka['life_application'])
-            
-            with graph_tab:
-                st.markdown("### 🕸️ Chapter Knowledge Graph")
-                
-                if 'first_render' not in st.session_state:
-                    st.session_state.first_render = True
-                    st.rerun()
-                
-                nodes, edges = rag.visualize_chapter_graph(f"Chapter_{selected_chapter_num}")
-                config = create_agraph_config()
-                agraph(nodes=nodes, edges=edges, config=config)
-                
-                if st.session_state.first_render:
-                    st.session_state.first_render = False
+            show_chapter_panels(rag, chapter_data, selected_chapter_num)
 
     elif view_option == "Ontologies of Wisdom":
-        st.header("🧠 Knowledge Pathways from Bhagavad Gita")
+        st.header(f"🧠 Knowledge Pathways from {rag.corpus.title}")
         
         problems = list(rag.data['problem_solutions_map'].keys())
+        if not problems:
+            st.info("No life challenges are mapped for this text yet.")
         selected_problem = st.radio(
             "Select a life challenge to explore solutions:",
             problems,
@@ -714,60 +789,14 @@ def main():
             st.write(problem_data['description'])
             
             st.subheader("🕉️ Relevant Shlokas")
-            for ref in problem_data['references']:
-                shloka = rag.get_shloka_by_reference(ref['chapter'], ref['shloka'])
+            references = [(ref, rag.get_shloka_by_reference(ref['chapter'], ref['shloka']))
+                          for ref in problem_data['references']]
+            prefetch_audio(f"{rag.corpus_id}/problem/{selected_problem}",
+                           [shloka for _, shloka in references if shloka])
+            for ref, shloka in references:
                 if shloka:
                     with st.expander(f"📜 Chapter {ref['chapter']}, Shloka {ref['shloka']}"):
-                        shloka_text = shloka.get('sanskrit_text', '')
-                        
-                        if shloka_text:
-                            col1, col2 = st.columns([1, 4])
-                            with col1:
-                                if st.button("🔊 Sanskrit", 
-                                           key=f"sanskrit_wisdom_{ref['chapter']}_{ref['shloka']}"):
-                                    audio_file = generate_audio(
-                                        shloka_text,
-                                        filename=f"sanskrit_{ref['chapter']}_{ref['shloka']}.mp3",
-                                        lang='hi'
-                                    )
-                                    st.audio(audio_file, format="audio/mp3")
-                            with col2:
-                                st.markdown("**Sanskrit Text:**")
-                                st.text(shloka_text)
-                        
-                        if 'transliteration' in shloka:
-                            english_text = f"Meaning: {shloka.get('meaning', '')}\n\n"
-                            if 'interpretation' in shloka:
-                                english_text += f"Interpretation: {shloka['interpretation']}\n\n"
-                            if 'life_application' in shloka:
-                                english_text += f"Life Application: {shloka['life_application']}"
-                            
-                            col1, col2 = st.columns([1, 4])
-                            with col1:
-                                if st.button("🔊 Explanation", 
-                                           key=f"english_wisdom_{ref['chapter']}_{ref['shloka']}"):
-                                    audio_file = generate_audio(
-                                        english_text,
-                                        filename=f"english_{ref['chapter']}_{ref['shloka']}.mp3",
-                                        lang='en'
-                                    )
-                                    st.audio(audio_file, format="audio/mp3")
-                            
-                            with col2:
-                                if 'transliteration' in shloka:
-                                    st.markdown("**Transliteration:**")
-                                    st.write(shloka['transliteration'])
-                                
-                                st.markdown("**Meaning:**")
-                                st.write(shloka['meaning'])
-                                
-                                if 'interpretation' in shloka:
-                                    st.markdown("**Interpretation:**")
-                                    st.write(shloka['interpretation'])
-                                
-                                if 'life_application' in shloka:
-                                    st.markdown("**Life Application:**")
-                                    st.write(shloka['life_application'])
+                        display_shloka_content(shloka, ref['chapter'], "wisdom")
 
             st.markdown("---")
             st.subheader("🕸️ Problem-Solution Graph")
@@ -861,5 +890,9 @@ def main():
     elif view_option == "Ontology of Characters":
         rag.display_chapter_insights()
 
+    elif view_option == "Full Graph Explorer":
+        st.header("🌌 Full Graph Explorer")
+        show_full_graph(registry)
+
 if __name__ == "__main__":
-    main()
+    run_instrumented(main)
@@ -4,70 +4,40 @@ import networkx as nx
 from streamlit_d3graph import d3graph
 from typing import Dict, List, Optional, Union
 import os
+from gita_corpus import DEFAULT_CORPUS, CorpusRegistry, display_node_id, node_id
+
+@st.cache_resource
+def get_corpus_registry() -> CorpusRegistry:
+    """One corpus registry (data, indexes and graph) shared by every session of this process"""
+    return CorpusRegistry()
 
 class GitaGraphRAG:
-    def __init__(self):
-        self.current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.data_path = os.path.join(self.current_dir, 'data', 'bhagavad_gita_complete.json')
+    def __init__(self, corpus_id: str = DEFAULT_CORPUS, registry: Optional[CorpusRegistry] = None):
+        self.registry = registry or get_corpus_registry()
+        self.corpus_id = corpus_id
+        self.corpus = None
         self.data = self._load_data()
-        self.G = nx.Graph()
+        self.G = self.registry.graph
         self.build_knowledge_graph()
         
     def _load_data(self) -> Optional[Dict]:
-        """Load the Bhagavad Gita JSON data"""
+        """Load the selected corpus (parsed once per process by the shared registry)"""
         try:
-            with open(self.data_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data
+            self.corpus = self.registry.get(self.corpus_id)
+            return self.corpus.data
         except Exception as e:
             st.error(f"Error loading data: {str(e)}")
             return None
             
     def build_knowledge_graph(self) -> None:
-        """Build the knowledge graph from the loaded data"""
+        """Add the corpus to the shared knowledge graph (once per process)"""
         if not self.data:
             return
-            
-        # Add problem nodes first
-        if 'problem_solutions_map' in self.data:
-            for problem, details in self.data['problem_solutions_map'].items():
-                problem_id = f"Problem_{problem}"
-                self.G.add_node(problem_id,
-                              type='problem',
-                              name=problem,
-                              description=details['description'])
-                
-                # Add references as edges to chapters/shlokas
-                for ref in details['references']:
-                    shloka_id = f"Shloka_{ref['chapter']}_{ref['shloka']}"
-                    chapter_id = f"Chapter_{ref['chapter']}"
-                    
-                    # Add edges to both chapter and shloka
-                    self.G.add_edge(problem_id, chapter_id)
-                    self.G.add_edge(problem_id, shloka_id)
-        
-        # Add chapter nodes
-        if 'chapters' in self.data:
-            for chapter in self.data['chapters']:
-                chapter_id = f"Chapter_{chapter['number']}"
-                node_attrs = {
-                    'type': 'chapter',
-                    'name': chapter.get('name', ''),
-                    'number': chapter.get('number', 0),
-                    'summary': chapter.get('summary', ''),
-                    'main_theme': chapter.get('main_theme', '')
-                }
-                self.G.add_node(chapter_id, **node_attrs)
-                
-                # Add shloka nodes
-                for shloka in chapter.get('shlokas', []):
-                    shloka_id = f"Shloka_{chapter['number']}_{shloka['shloka_number']}"
-                    self.G.add_node(shloka_id,
-                                  type='shloka',
-                                  sanskrit_text=shloka.get('sanskrit_text', ''),
-                                  meaning=shloka.get('meaning', ''),
-                                  interpretation=shloka.get('interpretation', ''))
-                    self.G.add_edge(chapter_id, shloka_id)
+        self.registry.ensure_graph(self.corpus_id)
+
+    def node_id(self, local_id: str) -> str:
+        """Namespaced graph id for a node of this corpus, e.g. Chapter_2"""
+        return node_id(self.corpus_id, local_id)
 
     def get_problem_solutions(self, problem: str) -> Optional[Dict]:
         """Get solutions for a specific problem"""
@@ -77,18 +47,13 @@ class GitaGraphRAG:
 
     def get_shloka_by_reference(self, chapter: int, shloka: int) -> Optional[Dict]:
         """Get shloka details by chapter and shloka number"""
-        if 'chapters' in self.data:
-            chapter_data = next((ch for ch in self.data['chapters'] 
-                               if ch['number'] == chapter), None)
-            if chapter_data:
-                return next((sh for sh in chapter_data.get('shlokas', [])
-                           if sh['shloka_number'] == shloka), None)
-        return None
+        return self.corpus.get_shloka(chapter, shloka)
 
     def visualize_chapter_graph(self, node_id: str) -> d3graph:
         """Create labeled D3 visualization of the graph for a specific node"""
         # Create subgraph for the selected node
-        subgraph = nx.ego_graph(self.G, node_id, radius=1)
+        with self.registry.lock:
+            subgraph = nx.ego_graph(self.G, self.node_id(node_id), radius=1)
         adjmat = nx.adjacency_matrix(subgraph).todense()
         
         # Get node types and create color mapping
@@ -104,7 +69,7 @@ class GitaGraphRAG:
         d3 = d3graph(collision=1, charge=250)
         d3.graph(adjmat)
         d3.set_node_properties(
-            label=list(subgraph.nodes()),
+            label=[display_node_id(node, self.corpus_id) for node in subgraph.nodes()],
             color=node_colors,
             cmap="Set1"
         )
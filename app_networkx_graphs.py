@@ -1,75 +1,58 @@
 
 import streamlit as st
 import json
-import networkx as nx
-import matplotlib.pyplot as plt
-from typing import Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 import os
+from gita_corpus import DEFAULT_CORPUS, CorpusRegistry, display_node_id, node_id
+from gita_render import CHAPTER_STYLE, CHARACTER_STYLE, THEME_STYLE, GraphRenderer
+
+# networkx and matplotlib are imported by the views that draw graphs
+if TYPE_CHECKING:
+    import networkx as nx
+
+@st.cache_resource
+def get_corpus_registry() -> CorpusRegistry:
+    """One corpus registry (data, indexes and graph) shared by every session of this process"""
+    return CorpusRegistry()
+
+@st.cache_resource
+def get_graph_renderer() -> GraphRenderer:
+    """One render pool and graph image cache shared by every session of this process"""
+    return GraphRenderer()
 
 class GitaGraphRAG:
-    def __init__(self):
-        self.current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.data_path = os.path.join(self.current_dir, 'data', 'bhagavad_gita_complete.json')
+    def __init__(self, corpus_id: str = DEFAULT_CORPUS, registry: Optional[CorpusRegistry] = None,
+                 renderer: Optional[GraphRenderer] = None):
+        self.registry = registry or get_corpus_registry()
+        self.renderer = renderer or get_graph_renderer()
+        self.corpus_id = corpus_id
+        self.corpus = None
         self.data = self._load_data()
-        self.G = nx.Graph()
-        self.build_knowledge_graph()
         
     def _load_data(self) -> Optional[Dict]:
-        """Load the Bhagavad Gita JSON data"""
+        """Load the selected corpus (parsed once per process by the shared registry)"""
         try:
-            with open(self.data_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                #st.write("Available keys in JSON:", list(data.keys()))
-                return data
+            self.corpus = self.registry.get(self.corpus_id)
+            return self.corpus.data
         except Exception as e:
             st.error(f"Error loading data: {str(e)}")
             return None
             
+    @property
+    def G(self) -> 'nx.Graph':
+        """The shared knowledge graph, with this corpus added on first use"""
+        self.build_knowledge_graph()
+        return self.registry.graph
+
     def build_knowledge_graph(self) -> None:
-        """Build the knowledge graph from the loaded data"""
+        """Add the corpus to the shared knowledge graph (once per process)"""
         if not self.data:
             return
-            
-        # Add problem nodes first
-        if 'problem_solutions_map' in self.data:
-            for problem, details in self.data['problem_solutions_map'].items():
-                problem_id = f"Problem_{problem}"
-                self.G.add_node(problem_id,
-                              type='problem',
-                              name=problem,
-                              description=details['description'])
-                
-                # Add references as edges to chapters/shlokas
-                for ref in details['references']:
-                    shloka_id = f"Shloka_{ref['chapter']}_{ref['shloka']}"
-                    chapter_id = f"Chapter_{ref['chapter']}"
-                    
-                    # Add edges to both chapter and shloka
-                    self.G.add_edge(problem_id, chapter_id)
-                    self.G.add_edge(problem_id, shloka_id)
-        
-        # Add chapter nodes
-        if 'chapters' in self.data:
-            for chapter in self.data['chapters']:
-                chapter_id = f"Chapter_{chapter['number']}"
-                node_attrs = {
-                    'type': 'chapter',
-                    'name': chapter.get('name', ''),
-                    'number': chapter.get('number', 0),
-                    'summary': chapter.get('summary', ''),
-                    'main_theme': chapter.get('main_theme', '')
-                }
-                self.G.add_node(chapter_id, **node_attrs)
-                
-                # Add shloka nodes
-                for shloka in chapter.get('shlokas', []):
-                    shloka_id = f"Shloka_{chapter['number']}_{shloka['shloka_number']}"
-                    self.G.add_node(shloka_id,
-                                  type='shloka',
-                                  sanskrit_text=shloka.get('sanskrit_text', ''),
-                                  meaning=shloka.get('meaning', ''),
-                                  interpretation=shloka.get('interpretation', ''))
-                    self.G.add_edge(chapter_id, shloka_id)
+        self.registry.ensure_graph(self.corpus_id)
+
+    def node_id(self, local_id: str) -> str:
+        """Namespaced graph id for a node of this corpus, e.g. Chapter_2"""
+        return node_id(self.corpus_id, local_id)
 
     def get_problem_solutions(self, problem: str) -> Optional[Dict]:
         """Get solutions for a specific problem"""
@@ -79,38 +62,33 @@ class GitaGraphRAG:
 
     def get_shloka_by_reference(self, chapter: int, shloka: int) -> Optional[Dict]:
         """Get shloka details by chapter and shloka number"""
-        if 'chapters' in self.data:
-            chapter_data = next((ch for ch in self.data['chapters'] 
-                               if ch['number'] == chapter), None)
-            if chapter_data:
-                return next((sh for sh in chapter_data.get('shlokas', [])
-                           if sh['shloka_number'] == shloka), None)
-        return None
-
-    def visualize_chapter_graph(self, node_id: str) -> plt.Figure:
-        """Create a visualization of the graph for a specific node"""
-        subgraph = nx.ego_graph(self.G, node_id, radius=1)
-        
-        pos = nx.spring_layout(subgraph)
-        plt.figure(figsize=(12, 8))
-        
-        # Draw nodes with different colors for different types
-        node_colors = []
-        for node in subgraph.nodes():
-            node_type = self.G.nodes[node]['type']
-            if node_type == 'problem':
-                node_colors.append('yellow')
-            elif node_type == 'chapter':
-                node_colors.append('skyblue')
-            elif node_type == 'shloka':
-                node_colors.append('lightcoral')
-            else:
-                node_colors.append('lightgreen')
-        
-        nx.draw(subgraph, pos, with_labels=True, node_color=node_colors,
-                node_size=2000, font_size=8)
-        plt.title(f"Knowledge Graph for {node_id}")
-        return plt
+        return self.corpus.get_shloka(chapter, shloka)
+
+    def visualize_chapter_graph(self, node_id: str) -> bytes:
+        """Rendered image of the graph around a specific node"""
+        def build():
+            import networkx as nx
+
+            with self.registry.lock:
+                subgraph = nx.ego_graph(self.G, self.node_id(node_id), radius=1)
+
+            # Draw nodes with different colors for different types
+            node_colors = []
+            for node in subgraph.nodes():
+                node_type = subgraph.nodes[node]['type']
+                if node_type == 'problem':
+                    node_colors.append('yellow')
+                elif node_type == 'chapter':
+                    node_colors.append('skyblue')
+                elif node_type == 'shloka':
+                    node_colors.append('lightcoral')
+                else:
+                    node_colors.append('lightgreen')
+
+            labels = {node: display_node_id(node, self.corpus_id) for node in subgraph.nodes()}
+            return subgraph, node_colors, labels, f"Knowledge Graph for {node_id}"
+
+        return self.renderer.render(('chapter', self.node_id(node_id), self.corpus.version), CHAPTER_STYLE, build)
     
     def display_chapter_insights(self):
         """Display chapter insights for the selected chapter, including a focused graph."""
@@ -183,39 +161,63 @@ class GitaGraphRAG:
         """Visualize the character ontology for the selected chapter."""
         st.markdown("### Chapter Ontology Graph")
 
-        # Build the graph for the selected chapter
-        G = nx.DiGraph()
-        chapter_node = f"Chapter {chapter['number']}: {chapter['name']}"
-        G.add_node(chapter_node, type="chapter")
-
-        key_events = chapter.get("key_events", [])
-        for event in key_events:
-            event_node = f"{chapter['name']} - {event['event']}"
-            G.add_node(event_node, type="event")
-            G.add_edge(chapter_node, event_node)
-
-            # Add associated characters
-            for character in event["characters"]:
-                character_node = f"Character: {character}"
-                G.add_node(character_node, type="character")
-                G.add_edge(event_node, character_node)
-
-        # Draw the graph
-        pos = nx.spring_layout(G)
-        plt.figure(figsize=(10, 6))
-
-        # Node colors based on type
-        node_colors = [
-            "lightblue" if G.nodes[node]["type"] == "chapter"
-            else "lightgreen" if G.nodes[node]["type"] == "event"
-            else "lightcoral"
-            for node in G.nodes
-        ]
-
-        nx.draw(
-            G, pos, with_labels=True, node_size=2000, node_color=node_colors, font_size=8
-        )
-        st.pyplot(plt)
+        def build():
+            import networkx as nx
+
+            # Build the graph for the selected chapter
+            G = nx.DiGraph()
+            chapter_node = f"Chapter {chapter['number']}: {chapter['name']}"
+            G.add_node(chapter_node, type="chapter")
+
+            key_events = chapter.get("key_events", [])
+            for event in key_events:
+                event_node = f"{chapter['name']} - {event['event']}"
+                G.add_node(event_node, type="event")
+                G.add_edge(chapter_node, event_node)
+
+                # Add associated characters
+                for character in event["characters"]:
+                    character_node = f"Character: {character}"
+                    G.add_node(character_node, type="character")
+                    G.add_edge(event_node, character_node)
+
+            # Node colors based on type
+            node_colors = [
+                "lightblue" if G.nodes[node]["type"] == "chapter"
+                else "lightgreen" if G.nodes[node]["type"] == "event"
+                else "lightcoral"
+                for node in G.nodes
+            ]
+            return G, node_colors, None, None
+
+        key = ('characters', self.node_id(f"Chapter_{chapter['number']}"), self.corpus.version)
+        st.image(self.renderer.render(key, CHARACTER_STYLE, build), use_column_width=True)
+
+    def visualize_theme_graph(self, selected_theme: str, related_chapters: list) -> bytes:
+        """Rendered image of a theme and the chapters that share it"""
+        def build():
+            import networkx as nx
+
+            # Create a focused graph for the theme
+            theme_graph = nx.Graph()
+            theme_id = f"Theme_{selected_theme}"
+            theme_graph.add_node(theme_id, type='theme', name=selected_theme)
+
+            # Add related chapters
+            for chapter in related_chapters:
+                chapter_id = f"Chapter_{chapter['number']}"
+                theme_graph.add_node(chapter_id,
+                                type='chapter',
+                                name=chapter['name'])
+                theme_graph.add_edge(theme_id, chapter_id)
+
+            # Draw nodes with different colors
+            node_colors = ['lightgreen' if node == theme_id else 'skyblue'
+                        for node in theme_graph.nodes()]
+            return theme_graph, node_colors, None, f"Theme Relationships: {selected_theme}"
+
+        return self.renderer.render(('theme', self.node_id(f"Theme_{selected_theme}"), self.corpus.version),
+                                    THEME_STYLE, build)
 
     
 def get_themes_from_chapters(data):
@@ -305,8 +307,7 @@ def main():
             with col2:
                 # Display graph visualization
                 st.markdown("####    Chapter Knowledge Graph")
-                fig = rag.visualize_chapter_graph(f"Chapter_{selected_chapter_num}")
-                st.pyplot(fig)
+                st.image(rag.visualize_chapter_graph(f"Chapter_{selected_chapter_num}"), use_column_width=True)
 
             # Display shlokas
             st.markdown("### Shlokas")
@@ -385,8 +386,7 @@ def main():
                 # Visualize problem connections
                 st.subheader("Problem-Solution Graph")
                 problem_id = f"Problem_{selected_problem}"
-                fig = rag.visualize_chapter_graph(problem_id)
-                st.pyplot(fig)
+                st.image(rag.visualize_chapter_graph(problem_id), use_column_width=True)
     
     elif view_option == "Philosophical Themes Triples":
         st.header("Philosophical Themes Navigator")
@@ -462,32 +462,7 @@ def main():
                 # Display theme relationships
                 st.markdown("### Theme Relationships")
                 
-                # Create a focused graph for the theme
-                theme_graph = nx.Graph()
-                theme_id = f"Theme_{selected_theme}"
-                theme_graph.add_node(theme_id, type='theme', name=selected_theme)
-                
-                # Add related chapters
-                for chapter in related_chapters:
-                    chapter_id = f"Chapter_{chapter['number']}"
-                    theme_graph.add_node(chapter_id, 
-                                    type='chapter',
-                                    name=chapter['name'])
-                    theme_graph.add_edge(theme_id, chapter_id)
-                
-                # Visualize theme relationships
-                pos = nx.spring_layout(theme_graph)
-                plt.figure(figsize=(8, 8))
-                
-                # Draw nodes with different colors
-                node_colors = ['lightgreen' if node == theme_id else 'skyblue' 
-                            for node in theme_graph.nodes()]
-                
-                nx.draw(theme_graph, pos, with_labels=True, 
-                    node_color=node_colors,
-                    node_size=2000, font_size=8)
-                plt.title(f"Theme Relationships: {selected_theme}")
-                st.pyplot(plt)
+                st.image(rag.visualize_theme_graph(selected_theme, related_chapters), use_column_width=True)
                 
                 # Display theme statistics
                 st.markdown("### Theme Statistics")
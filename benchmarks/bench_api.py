@@ -0,0 +1,168 @@
+"""Requests/sec benchmark for the read-only API in api/index.py.
+
+By default the ASGI app is driven in-process by concurrent asyncio clients, which measures
+the app itself (routing, response cache, ETag handling) without a server in the way. With
+--url it instead load-tests a running deployment (`uvicorn api.index:app`, vercel dev, ...)
+from a pool of keep-alive HTTP client threads.
+
+    python benchmarks/bench_api.py --requests 20000 --concurrency 64
+    python benchmarks/bench_api.py --url http://127.0.0.1:8000 --concurrency 32 --min-rps 500
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_generation import percentile
+from gita_corpus import CorpusRegistry
+
+
+def request_mix(count, seed, registry=None):
+    """A reproducible mix of verse, chapter, problem, theme, search and graph requests."""
+    rng = random.Random(seed)
+    registry = registry or CorpusRegistry()
+    targets = []
+    for corpus_id in registry.ids():
+        corpus = registry.get(corpus_id)
+        keys = list(corpus.shlokas)
+        problems = list(corpus.data["problem_solutions_map"])
+        for _ in range(count):
+            roll = rng.random()
+            if roll < 0.5:
+                chapter, shloka = rng.choice(keys)
+                targets.append((f"/api/{corpus_id}/verses/{chapter}/{shloka}", ""))
+            elif roll < 0.6:
+                targets.append((f"/api/{corpus_id}/chapters/{rng.choice(list(corpus.chapters))}", ""))
+            elif roll < 0.7 and problems:
+                targets.append((f"/api/{corpus_id}/problems/{rng.choice(problems)}", ""))
+            elif roll < 0.8:
+                targets.append((f"/api/{corpus_id}/search", f"q={rng.choice(['detachment', 'self', 'action', 'mind'])}"))
+            else:
+                targets.append((f"/api/{corpus_id}/graph/Chapter_{rng.choice(list(corpus.chapters))}", ""))
+    rng.shuffle(targets)
+    return targets[:count]
+
+
+async def run_in_process(targets, concurrency, revalidate):
+    from api.index import app
+
+    latencies, statuses, etags = [], {}, {}
+    queue = asyncio.Queue()
+    for target in targets:
+        queue.put_nowait(target)
+
+    async def client():
+        while not queue.empty():
+            path, query = queue.get_nowait()
+            headers = [(b"if-none-match", etags[path].encode())] if revalidate and path in etags else []
+            response = {}
+
+            async def receive():
+                return {"type": "http.request"}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    response.update(status=message["status"], headers=dict(message["headers"]))
+
+            started = time.perf_counter()
+            await app({"type": "http", "method": "GET", "path": path, "query_string": query.encode(),
+                       "headers": headers}, receive, send)
+            latencies.append(time.perf_counter() - started)
+            statuses[response["status"]] = statuses.get(response["status"], 0) + 1
+            etags[path] = response["headers"][b"etag"].decode()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, statuses
+
+
+def run_against_url(url, targets, concurrency, revalidate):
+    parts = urlsplit(url)
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    chunks = [targets[i::concurrency] for i in range(concurrency)]
+
+    def client(chunk):
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        etags = {}
+        for path, query in chunk:
+            headers = {"If-None-Match": etags[path]} if revalidate and path in etags else {}
+            started = time.perf_counter()
+            connection.request("GET", parts.path.rstrip("/") + path + (f"?{query}" if query else ""), headers=headers)
+            response = connection.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - started
+            etags[path] = response.getheader("ETag", "")
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(chunk,)) for chunk in chunks]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, latencies, statuses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match for paths seen before")
+    parser.add_argument("--precompute", action="store_true", help="Render all static responses before measuring")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Also write the results to this file (for CI tracking)")
+    parser.add_argument("--min-rps", type=float, help="Exit non-zero if requests/sec falls below this")
+    args = parser.parse_args(argv)
+
+    targets = request_mix(args.requests, args.seed)
+    precompute_s = None
+    if args.url:
+        elapsed, latencies, statuses = run_against_url(args.url, targets, args.concurrency, args.revalidate)
+    else:
+        if args.precompute:
+            from api.index import precompute
+            started = time.perf_counter()
+            precompute()
+            precompute_s = round(time.perf_counter() - started, 3)
+        elapsed, latencies, statuses = asyncio.run(run_in_process(targets, args.concurrency, args.revalidate))
+
+    latencies_ms = [latency * 1000 for latency in latencies]
+    results = {
+        "target": args.url or "in-process",
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_sec": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_p50_ms": round(percentile(latencies_ms, 50), 3),
+        "latency_p99_ms": round(percentile(latencies_ms, 99), 3),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "precompute_s": precompute_s
+    }
+    print(json.dumps(results, indent=4))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+    if args.min_rps is not None and results["requests_per_sec"] < args.min_rps:
+        print(f"FAIL: {results['requests_per_sec']} requests/sec < {args.min_rps}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""Benchmarks for corpus loading, indexing, graph building and view payloads in app.py.
+
+Times each GitaGraphRAG / view helper on the real corpus and on synthetic corpora scaled
+up from it (default 1x and 100x, see synthetic_corpus.py), and reports the median and min
+per case. --replicate scales by copying the real chapters instead, which keeps the theme,
+keyword and problem vocabularies at their real size.
+Save a run as a baseline and later runs fail when any case regresses past the tolerance:
+
+    python benchmarks/bench_corpus.py --scales 1,100 --json bench_corpus.json
+    python benchmarks/bench_corpus.py --baseline bench_corpus.json --tolerance 0.25
+"""
+import argparse
+import copy
+import importlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from gita_clusters import ClusterTree, lod_graph
+from gita_corpus import DATA_DIR, DEFAULT_CORPUS, CorpusRegistry
+from gita_webgl import graph_payload
+from synthetic_corpus import generate_corpus, scaled_arguments
+
+
+def load_app_module(name="app"):
+    """Import app.py (or another app module) outside `streamlit run`.
+
+    streamlit_agraph registers its component with the Streamlit runtime at import time,
+    so an (unstarted) runtime has to exist first."""
+    from streamlit.runtime import Runtime, RuntimeConfig
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
+
+    if not Runtime.exists():
+        Runtime(RuntimeConfig(script_path=os.path.join(ROOT, f"{name}.py"), command_line=None,
+                              media_file_storage=MemoryMediaFileStorage("/media"),
+                              uploaded_file_manager=MemoryUploadedFileManager("/_stcore/upload_file")))
+    return importlib.import_module(name)
+
+
+def scaled_corpus(scale, replicate=False, seed=0):
+    """The real corpus at 1x; otherwise a synthetic corpus `scale` times its size, or with
+    `replicate` the real chapters and problems copied `scale` times under new numbers."""
+    with open(os.path.join(DATA_DIR, f"{DEFAULT_CORPUS}_complete.json"), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if scale == 1:
+        return data
+    if not replicate:
+        return generate_corpus(seed=seed, **scaled_arguments(scale))
+    chapters, problems = [], {}
+    count = len(data["chapters"])
+    for copy_index in range(scale):
+        offset = copy_index * count
+        for chapter in data["chapters"]:
+            chapter = copy.deepcopy(chapter)
+            chapter["number"] += offset
+            chapters.append(chapter)
+        for problem, details in data["problem_solutions_map"].items():
+            problems[f"{problem}_{copy_index}" if copy_index else problem] = {
+                "description": details["description"],
+                "references": [{"chapter": ref["chapter"] + offset, "shloka": ref["shloka"]}
+                               for ref in details["references"]]
+            }
+    return {"problem_solutions_map": problems, "chapters": chapters}
+
+
+def write_data_dir(directory, data):
+    with open(os.path.join(directory, f"{DEFAULT_CORPUS}_complete.json"), "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    with open(os.path.join(directory, "corpora.json"), "w", encoding="utf-8") as f:
+        json.dump({DEFAULT_CORPUS: {"file": f"{DEFAULT_CORPUS}_complete.json"}}, f)
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {"median_ms": round(statistics.median(timings) * 1000, 3), "min_ms": round(min(timings) * 1000, 3)}
+
+
+def bench_scale(data_dir, repeat):
+    """Every benchmark case for the corpus in `data_dir`."""
+    app = load_app_module()
+    GitaGraphRAG, get_themes_from_chapters, find_chapters_by_theme = \
+        app.GitaGraphRAG, app.get_themes_from_chapters, app.find_chapters_by_theme
+    results = {}
+
+    def fresh_rag():
+        # A registry that has parsed the corpus but not graphed it yet
+        registry = CorpusRegistry(data_dir)
+        registry.get(DEFAULT_CORPUS)
+        rag = GitaGraphRAG.__new__(GitaGraphRAG)
+        rag.registry, rag.corpus_id = registry, DEFAULT_CORPUS
+        rag.corpus = registry.get(DEFAULT_CORPUS)
+        rag.data = rag.corpus.data
+        return rag
+
+    def load_data():
+        rag = GitaGraphRAG.__new__(GitaGraphRAG)
+        rag.registry, rag.corpus_id, rag.corpus = CorpusRegistry(data_dir), DEFAULT_CORPUS, None
+        rag._load_data()
+
+    results["_load_data"] = measure(load_data, repeat)
+    rags = [fresh_rag() for _ in range(repeat)]
+    results["build_knowledge_graph"] = measure(lambda: rags.pop().build_knowledge_graph(), repeat)
+
+    rag = GitaGraphRAG(registry=CorpusRegistry(data_dir))
+    references = [(ref["chapter"], ref["shloka"]) for details in rag.data["problem_solutions_map"].values()
+                  for ref in details["references"]]
+    themes = [theme for theme, _ in get_themes_from_chapters(rag.data)]
+    chapter_ids = [f"Chapter_{chapter['number']}" for chapter in rag.data["chapters"]]
+    problem_ids = [f"Problem_{problem}" for problem in rag.data["problem_solutions_map"]]
+    related = {theme: find_chapters_by_theme(rag.data, theme) for theme in themes}
+
+    results["get_shloka_by_reference (all refs)"] = measure(
+        lambda: [rag.get_shloka_by_reference(*ref) for ref in references], repeat)
+    results["get_themes_from_chapters"] = measure(lambda: get_themes_from_chapters(rag.data), repeat)
+    results["find_chapters_by_theme (all themes)"] = measure(
+        lambda: [find_chapters_by_theme(rag.data, theme) for theme in themes], repeat)
+    results["visualize_chapter_graph (all chapters)"] = measure(
+        lambda: [rag.visualize_chapter_graph(node) for node in chapter_ids], repeat)
+    results["visualize_chapter_graph (all problems)"] = measure(
+        lambda: [rag.visualize_chapter_graph(node) for node in problem_ids], repeat)
+    results["visualize_theme_relationships (all themes)"] = measure(
+        lambda: [rag.visualize_theme_relationships(theme, related[theme]) for theme in themes], repeat)
+    results["ClusterTree.build"] = measure(lambda: ClusterTree.build(rag.corpus), max(1, repeat // 2))
+    tree = ClusterTree.build(rag.corpus)
+    results["lod_graph (each chapter opened)"] = measure(
+        lambda: [lod_graph(tree, [node]) for node in chapter_ids], repeat)
+    lod_nodes = max(len(lod_graph(tree, [node])[0]) for node in chapter_ids)
+    results["graph_payload (full graph)"] = measure(lambda: graph_payload([tree], app.NODE_STYLES), repeat)
+    payload = graph_payload([tree], app.NODE_STYLES)
+    payload_kb = sum(len(value) if isinstance(value, bytes) else len(json.dumps(value))
+                     for value in payload["parts"].values()) / 1024
+    sizes = {
+        "chapters": len(chapter_ids),
+        "shlokas": len(rag.corpus.shlokas),
+        "problems": len(problem_ids),
+        "references": len(references),
+        "themes": len(themes),
+        "lod_max_nodes": lod_nodes,
+        "webgl_nodes": len(payload["ids"]),
+        "webgl_payload_kb": round(payload_kb, 1)
+    }
+    return sizes, results
+
+
+def compare(results, baseline, tolerance):
+    """Cases whose median exceeds the baseline median by more than `tolerance`."""
+    failures = []
+    for scale, run in results.items():
+        for case, timing in run["cases"].items():
+            reference = baseline.get(scale, {}).get("cases", {}).get(case)
+            if reference and timing["median_ms"] > reference["median_ms"] * (1 + tolerance):
+                failures.append(f"{scale} {case}: {timing['median_ms']} ms > "
+                                f"{reference['median_ms']} ms baseline (+{tolerance:.0%})")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1,100", help="Comma separated corpus scale factors")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--replicate", action="store_true", help="Scale by copying the real corpus")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic corpora")
+    parser.add_argument("--json", help="Also write the results to this file (usable as a baseline)")
+    parser.add_argument("--baseline", help="Results file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown over the baseline")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for scale in [int(value) for value in args.scales.split(",")]:
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_data_dir(data_dir, scaled_corpus(scale, args.replicate, args.seed))
+            sizes, cases = bench_scale(data_dir, args.repeat)
+        results[f"{scale}x"] = {"sizes": sizes, "cases": cases}
+        print(f"{scale}x corpus: {sizes}")
+        for case, timing in cases.items():
+            print(f"  {case:<45} median {timing['median_ms']:>10.3f} ms   min {timing['min_ms']:>10.3f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            failures = compare(results, json.load(f), args.tolerance)
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Throughput benchmark for the generation pipeline against a local mock LLM endpoint.
+
+Starts an HTTP server that speaks the same response format as the Claude API Gateway
+(with configurable latency and error distributions), runs src/graphGita_engine.py
+through the real ClaudeHTTPProvider against it, and reports verses/sec, p50/p99 call
+latency, retries, structured-output repairs and peak memory.
+
+    python benchmarks/bench_generation.py --chapters 1-2 --concurrency 8 --latency-ms 50 --error-rate 0.02
+    python benchmarks/bench_generation.py --json bench_generation.json --min-verses-per-sec 20
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from graphGita_engine import ClaudeHTTPProvider, GenerationEngine, load_chapter_info, mock_response, parse_chapters, run
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def make_handler(latency_ms, jitter, error_rate, malformed_rate, seed):
+    rng = random.Random(seed)
+
+    class MockLLMHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            prompt = request["messages"][0]["content"]
+            system_content, _, user_content = prompt.partition("\n\nUser: ")
+            roll = rng.random()
+            # Log-normal latency around the configured median, like real provider tails
+            if latency_ms:
+                time.sleep(latency_ms / 1000 * rng.lognormvariate(0, jitter))
+            if roll < error_rate:
+                self._send(500, {"message": "mock upstream error"})
+                return
+            text = mock_response(system_content, user_content)
+            if roll < error_rate + malformed_rate and text.startswith("{"):
+                text = text[:len(text) // 2]  # truncated JSON, exercises extraction and repair
+            self._send(200, {"content": [{"type": "text", "text": text}]})
+
+    return MockLLMHandler
+
+
+def serve(port_queue, latency_ms, jitter, error_rate, malformed_rate, seed):
+    server = ThreadingHTTPServer(("127.0.0.1", 0),
+                                 make_handler(latency_ms, jitter, error_rate, malformed_rate, seed))
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_mock_server(latency_ms=0.0, jitter=0.25, error_rate=0.0, malformed_rate=0.0, seed=42):
+    """Run the mock endpoint in a child process so its work does not skew the pipeline's numbers."""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, daemon=True,
+                                      args=(port_queue, latency_ms, jitter, error_rate, malformed_rate, seed))
+    process.start()
+    return process, f"http://127.0.0.1:{port_queue.get(timeout=10)}/"
+
+
+def run_benchmark(args):
+    server, endpoint = start_mock_server(args.latency_ms, args.jitter, args.error_rate, args.malformed_rate, args.seed)
+    try:
+        chapter_info = load_chapter_info()
+        chapter_numbers = parse_chapters(args.chapters, chapter_info)
+        provider = ClaudeHTTPProvider(endpoint, max_retries=args.max_retries, backoff=args.backoff)
+        engine = GenerationEngine(provider, concurrency=args.concurrency, window_size=args.window_size)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            if args.trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            gita_data = run(engine, chapter_numbers, os.path.join(tmp, "bhagavad_gita_complete.json"),
+                            chapter_info=chapter_info)
+            elapsed = time.perf_counter() - started
+            _, peak_traced = tracemalloc.get_traced_memory()
+            if args.trace_memory:
+                tracemalloc.stop()
+    finally:
+        server.terminate()
+
+    verses = sum(len(chapter["shlokas"]) for chapter in gita_data["chapters"])
+    latencies_ms = [latency * 1000 for latency in provider.stats["latencies"]]
+    repairs = {label: {"repaired": counts["repaired"], "failed": counts["failed"]}
+               for label, counts in engine.report.counts.items()}
+    return {
+        "chapters": chapter_numbers,
+        "concurrency": args.concurrency,
+        "verses": verses,
+        "elapsed_s": round(elapsed, 3),
+        "verses_per_sec": round(verses / elapsed, 2) if elapsed else 0.0,
+        "calls": provider.stats["calls"],
+        "call_latency_p50_ms": round(percentile(latencies_ms, 50), 2),
+        "call_latency_p99_ms": round(percentile(latencies_ms, 99), 2),
+        "retries": provider.stats["retries"],
+        "failed_calls": provider.stats["failures"],
+        "repairs": repairs,
+        "peak_traced_mb": round(peak_traced / 2 ** 20, 2) if args.trace_memory else None,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chapters", default="1-2")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--window-size", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Median mock call latency")
+    parser.add_argument("--jitter", type=float, default=0.25, help="Sigma of the log-normal latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with HTTP 500")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of JSON answers truncated")
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--backoff", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also report the peak Python heap via tracemalloc (slows the run down)")
+    parser.add_argument("--json", help="Also write the results to this file (for CI tracking)")
+    parser.add_argument("--min-verses-per-sec", type=float, help="Exit non-zero if throughput falls below this")
+    parser.add_argument("--max-p99-ms", type=float, help="Exit non-zero if p99 call latency exceeds this")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args)
+    print(json.dumps(results, indent=4))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+    if args.min_verses_per_sec is not None and results["verses_per_sec"] < args.min_verses_per_sec:
+        print(f"FAIL: {results['verses_per_sec']} verses/sec < {args.min_verses_per_sec}")
+        return 1
+    if args.max_p99_ms is not None and results["call_latency_p99_ms"] > args.max_p99_ms:
+        print(f"FAIL: p99 {results['call_latency_p99_ms']} ms > {args.max_p99_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Bytes sent to the browser per graph view: streamlit_agraph's encoding vs gita_payload's.
+
+For every chapter, problem and theme graph, every chapter of the corpus map opened in
+turn, and the WebGL full graph, reports the component arguments' size in two encodings:
+
+- `legacy`: nodes and edges as create_node/create_edge built them before gita_payload
+  (style, shape and title per node, color and smooth config per edge), JSON-encoded by
+  streamlit_agraph;
+- `compact`: gita_payload.vis_payload, as the app sends them now.
+
+For the WebGL graph it reports the first render and a rerun, which only sends digests.
+
+    python benchmarks/bench_payload.py --scales 1,20 --json bench_payload.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_corpus import load_app_module, scaled_corpus, write_data_dir
+from gita_clusters import ClusterTree, lod_graph
+from gita_corpus import DEFAULT_CORPUS, CorpusRegistry
+from gita_payload import delta, dumps, vis_payload
+from gita_webgl import graph_payload
+
+LEGACY_EDGE = {"color": "#666666", "smooth": {"type": "curvedCW", "roundness": 0.2}}
+
+
+def legacy_size(app, nodes, edges, config):
+    """Size of streamlit_agraph's arguments for the nodes and edges app.py used to build."""
+    from streamlit_agraph import Edge, Node
+
+    legacy_nodes = [Node(id=node.id, label=node.label, shape="dot",
+                         **app.NODE_STYLES.get(node.group, {"color": "#FFFFFF", "size": 25})).to_dict()
+                    for node in nodes]
+    legacy_edges = [Edge(source=edge.source, target=edge.to, label=getattr(edge, "label", ""), **LEGACY_EDGE).to_dict()
+                    for edge in edges]
+    data = json.dumps({"nodes": legacy_nodes, "edges": legacy_edges})
+    return len(data.encode("utf-8")) + len(json.dumps(config.__dict__).encode("utf-8"))
+
+
+def compact_size(app, nodes, edges, config):
+    data, options, _ = vis_payload(nodes, edges, config.to_dict(), app.NODE_STYLES, app.EDGE_STYLE)
+    return len(data.encode("utf-8")) + len(options.encode("utf-8"))
+
+
+def part_size(value):
+    return len(value) if isinstance(value, bytes) else len(dumps(value).encode("utf-8"))
+
+
+def bench_scale(data_dir):
+    app = load_app_module()
+    registry = CorpusRegistry(data_dir)
+    rag = app.GitaGraphRAG(registry=registry)
+    config = app.create_agraph_config()
+    tree = ClusterTree.build(registry.get(DEFAULT_CORPUS))
+
+    views = {
+        "chapter graphs": [rag.visualize_chapter_graph(f"Chapter_{number}") for number in rag.corpus.chapters],
+        "problem graphs": [rag.visualize_chapter_graph(f"Problem_{problem}")
+                           for problem in rag.data["problem_solutions_map"]],
+        "theme graphs": [rag.visualize_theme_relationships(theme, app.find_chapters_by_theme(rag.data, theme))
+                         for theme, _ in app.get_themes_from_chapters(rag.data)]
+    }
+    lod = []
+    for chapter in tree.children.get("", []):
+        clusters, links, _ = lod_graph(tree, [chapter])
+        lod.append(([app.create_node(cluster["id"], cluster["label"], cluster["type"]) for cluster in clusters],
+                    [app.create_edge(source, target, str(count) if count > 1 else "") for source, target, count in links]))
+    views["corpus map clicks"] = lod
+
+    results = {}
+    for view, graphs in views.items():
+        legacy = [legacy_size(app, nodes, edges, config) for nodes, edges in graphs]
+        compact = [compact_size(app, nodes, edges, config) for nodes, edges in graphs]
+        results[view] = {
+            "graphs": len(graphs),
+            "max_nodes": max((len(nodes) for nodes, _ in graphs), default=0),
+            "legacy_kb": round(sum(legacy) / 1024, 1),
+            "compact_kb": round(sum(compact) / 1024, 1),
+            "largest_legacy_kb": round(max(legacy, default=0) / 1024, 1),
+            "largest_compact_kb": round(max(compact, default=0) / 1024, 1),
+            "ratio": round(sum(legacy) / max(1, sum(compact)), 1)
+        }
+
+    payload = graph_payload([ClusterTree.build(registry.get(corpus_id)) for corpus_id in registry.ids()],
+                            app.NODE_STYLES)
+    first = delta(payload["parts"], payload["digests"], None)
+    rerun = delta(payload["parts"], payload["digests"], payload["digests"])
+    results["webgl full graph"] = {
+        "nodes": len(payload["ids"]),
+        "first_render_kb": round(sum(part_size(value) for value in first.values()) / 1024, 1),
+        "rerun_kb": round(part_size(rerun["digests"]) / 1024, 2)
+    }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1,20", help="Comma separated corpus scale factors")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic corpora")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for scale in [int(value) for value in args.scales.split(",")]:
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_data_dir(data_dir, scaled_corpus(scale, seed=args.seed))
+            results[f"{scale}x"] = bench_scale(data_dir)
+        print(f"{scale}x corpus:")
+        for view, result in results[f"{scale}x"].items():
+            print(f"  {view:<18} " + "  ".join(f"{key} {value}" for key, value in result.items()))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Render time and memory of the static graph images in app_networkx_graphs.py.
+
+Renders every chapter, problem and theme graph of the real corpus `--rounds` times, as
+sessions viewing the same pages would, in three modes:
+
+- `pyplot`: the previous drawing code (plt.figure per render, never closed, unseeded layout);
+- `figure`: gita_render's object-oriented Figure drawing with the cache disabled;
+- `figure+cache`: GraphRenderer as the app uses it.
+
+Reports the median render time of the first round and of repeat rounds, the pyplot
+figures left open, and how much the process RSS grew.
+
+    python benchmarks/bench_render.py --rounds 3
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_corpus import load_app_module
+from gita_corpus import CorpusRegistry
+from gita_render import GraphRenderer
+
+
+def pyplot_draw(G, node_colors, labels, title, style):
+    """The drawing code app_networkx_graphs.py used before gita_render, plus st.pyplot's savefig."""
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
+    pos = nx.spring_layout(G)
+    plt.figure(figsize=style['figsize'])
+    options = {'labels': labels} if labels is not None else {}
+    nx.draw(G, pos, with_labels=True, node_color=node_colors,
+            node_size=style['node_size'], font_size=style['font_size'], **options)
+    if title:
+        plt.title(title)
+    image = BytesIO()
+    plt.savefig(image, format=style['format'], dpi=style['dpi'], bbox_inches='tight')
+    return image.getvalue()
+
+
+def rss_mb():
+    with open("/proc/self/status", "r") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def views(rag, app):
+    """One callable per graph image the app can show."""
+    calls = [lambda number=number: rag.visualize_chapter_graph(f"Chapter_{number}")
+             for number in rag.corpus.chapters]
+    calls += [lambda problem=problem: rag.visualize_chapter_graph(f"Problem_{problem}")
+              for problem in rag.data["problem_solutions_map"]]
+    for theme in app.get_themes_from_chapters(rag.data):
+        related = app.find_chapters_by_theme(rag.data, theme)
+        calls.append(lambda theme=theme, related=related: rag.visualize_theme_graph(theme, related))
+    return calls
+
+
+def bench_mode(renderer, rounds, limit):
+    import matplotlib.pyplot as plt
+
+    app = load_app_module("app_networkx_graphs")
+    rag = app.GitaGraphRAG(registry=CorpusRegistry(), renderer=renderer)
+    calls = views(rag, app)[:limit]
+    started_rss = rss_mb()
+    first, repeat = [], []
+    for round_index in range(rounds):
+        for call in calls:
+            started = time.perf_counter()
+            call()
+            (first if round_index == 0 else repeat).append((time.perf_counter() - started) * 1000)
+    result = {
+        "images": len(calls),
+        "first_round_median_ms": round(statistics.median(first), 3),
+        "repeat_median_ms": round(statistics.median(repeat), 3) if repeat else None,
+        "open_pyplot_figures": len(plt.get_fignums()),
+        "rss_growth_mb": round(rss_mb() - started_rss, 1)
+    }
+    plt.close("all")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=3, help="Times every image is requested")
+    parser.add_argument("--limit", type=int, default=80, help="Images per round")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    modes = {
+        "pyplot": lambda: GraphRenderer(workers=1, cache_size=0, draw=pyplot_draw),
+        "figure": lambda: GraphRenderer(cache_size=0),
+        "figure+cache": lambda: GraphRenderer()
+    }
+    results = {}
+    for mode, renderer in modes.items():
+        results[mode] = bench_mode(renderer(), args.rounds, args.limit)
+        print(f"{mode:<14} " + "  ".join(f"{key} {value}" for key, value in results[mode].items()))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
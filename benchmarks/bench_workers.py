@@ -0,0 +1,153 @@
+"""Memory per worker of the pre-forking API server (gita_serve.py), with and without preloading.
+
+Starts `gita_serve.py` once per mode, drives the same request mix as bench_api.py through
+it so every worker has served verses, chapters, problems, searches and graphs, and then
+reads /proc/<pid>/smaps_rollup for the parent and each worker:
+
+- RSS: resident pages, counting pages shared with other processes in full;
+- PSS: resident pages with each shared page divided among the processes sharing it;
+- USS: pages private to the process (what killing it would free).
+
+The sum of PSS over the parent and all workers is the real memory cost of the server.
+Modes: `on-demand` (every worker loads and indexes the corpora itself), `preload`
+(loaded once in the parent before forking) and `preload+freeze` (also gc.freeze()).
+
+    python benchmarks/bench_workers.py --workers 4
+    python benchmarks/bench_workers.py --workers 8 --scale 20 --json bench_workers.json
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_api import request_mix, run_against_url
+from bench_corpus import scaled_corpus, write_data_dir
+from bench_generation import percentile
+from gita_corpus import DATA_DIR, CorpusRegistry
+
+MODES = {
+    "on-demand": ["--no-preload", "--no-gc-freeze"],
+    "preload": ["--no-gc-freeze"],
+    "preload+freeze": []
+}
+
+
+def memory_kb(pid):
+    """RSS, PSS and USS of one process in kB, from /proc/<pid>/smaps_rollup."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0])
+    return {"rss": fields["Rss"], "pss": fields["Pss"],
+            "uss": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def children(pid):
+    found = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat", "r") as f:
+                    # The command name may contain spaces; the parent pid follows the closing ')'
+                    if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                        found.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+    return sorted(found)
+
+
+def start_server(workers, flags, data_dir, timeout=600):
+    """Launch gita_serve.py on a free port; returns (process, url, seconds until it answered)."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = dict(os.environ, GRAPHGITA_DATA_DIR=data_dir)
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "gita_serve.py"), "--workers", str(workers),
+                                "--port", str(port), *flags], cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"gita_serve.py exited with {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"{url}/api/corpora", timeout=5) as response:
+                if response.status == 200 and len(children(process.pid)) == workers:
+                    return process, url, time.perf_counter() - started
+        except OSError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("gita_serve.py did not start in time")
+
+
+def bench_mode(mode, workers, data_dir, targets, concurrency):
+    process, url, ready_s = start_server(workers, MODES[mode], data_dir)
+    try:
+        elapsed, latencies, statuses = run_against_url(url, targets, concurrency, revalidate=False)
+        parent = memory_kb(process.pid)
+        per_worker = [memory_kb(pid) for pid in children(process.pid)]
+    finally:
+        process.terminate()
+        process.wait()
+    latencies_ms = [latency * 1000 for latency in latencies]
+
+    def mean_mb(field):
+        return round(sum(worker[field] for worker in per_worker) / len(per_worker) / 1024, 1)
+
+    return {
+        "ready_s": round(ready_s, 2),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "latency_p50_ms": round(percentile(latencies_ms, 50), 3),
+        "latency_p99_ms": round(percentile(latencies_ms, 99), 3),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "worker_rss_mb": mean_mb("rss"),
+        "worker_pss_mb": mean_mb("pss"),
+        "worker_uss_mb": mean_mb("uss"),
+        "parent_pss_mb": round(parent["pss"] / 1024, 1),
+        "total_pss_mb": round((parent["pss"] + sum(worker["pss"] for worker in per_worker)) / 1024, 1)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--scale", type=int, default=1, help="Serve a synthetic corpus this many times the real one")
+    parser.add_argument("--requests", type=int, default=4000, help="Requests driven through each server")
+    parser.add_argument("--concurrency", type=int, default=32, help="Keep-alive client connections")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma separated modes to run")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        data_dir = DATA_DIR
+        if args.scale > 1:
+            data_dir = scratch
+            write_data_dir(data_dir, scaled_corpus(args.scale, seed=args.seed))
+        targets = request_mix(args.requests, args.seed, CorpusRegistry(data_dir))
+        results = {"workers": args.workers, "scale": args.scale, "modes": {}}
+        for mode in args.modes.split(","):
+            results["modes"][mode] = bench_mode(mode, args.workers, data_dir, targets, args.concurrency)
+            print(f"{mode:<16} " + "  ".join(f"{key} {value}" for key, value in results["modes"][mode].items()
+                                             if key != "statuses"))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+"""Load test for the Streamlit app with many concurrent user sessions.
+
+Starts `streamlit run app.py` (or targets a running server with --url). Each simulated user
+opens its own websocket session, the same way a browser does, then takes a random walk:
+it switches views and texts, picks chapters, problems and themes, and presses audio buttons.
+Every interaction is one script run. Its latency is the time from sending the rerun to the
+final script_finished; runs that end in st.rerun() are followed through to the final run,
+and widgets inside st.experimental_fragment rerun only their fragment, as in a browser.
+An audio press is timed until the clip's player is delivered: the pressed verse card's
+auto reruns (its polling while the clip is generated) are followed as a browser would.
+The report gives per-view and per-action p50/p99 latencies and the server process's CPU
+and RSS per session, for capacity planning.
+
+By default the launched server answers text-to-speech requests locally after
+--tts-latency-ms instead of calling Google, so runs are offline and repeatable;
+--real-tts uses gTTS as deployed. --audio-prefetch K starts it with GRAPHGITA_AUDIO_PREFETCH=K,
+and --audio-order sequential makes users play a page's clips in order, as listeners do.
+
+    python benchmarks/load_test.py --users 20 --steps 15
+    python benchmarks/load_test.py --users 50 --audio-rate 0.3 --json load_test.json
+    python benchmarks/load_test.py --url http://127.0.0.1:8501 --server-pid 12345 --users 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_generation import percentile
+
+APP = os.path.join(ROOT, "app.py")
+VIEW_LABEL = "Choose your exploration path:"
+CORPUS_LABEL = "Choose a text:"
+# A short silent MPEG audio frame, returned by the local TTS stand-in
+SILENT_MP3 = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+def serve(port, tts_latency_ms, app=APP):
+    """Run `streamlit run <app>` in this process, optionally with a local TTS stand-in."""
+    if tts_latency_ms is not None:
+        import gtts
+
+        def write_to_fp(self, fp):
+            time.sleep(tts_latency_ms / 1000)
+            fp.write(SILENT_MP3)
+
+        gtts.gTTS.write_to_fp = write_to_fp
+
+    from streamlit.web import cli
+    sys.argv = ["streamlit", "run", app, "--server.headless=true", f"--server.port={port}",
+                "--server.fileWatcherType=none", "--browser.gatherUsageStats=false"]
+    cli.main()
+
+
+def start_server(tts_latency_ms, audio_prefetch=0, app=APP):
+    """Launch the app on a free port; returns (process, base url) once it answers health checks."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    command = [sys.executable, os.path.abspath(__file__), "--serve", str(port), "--app", app]
+    if tts_latency_ms is not None:
+        command += ["--tts-latency-ms", str(tts_latency_ms)]
+    env = dict(os.environ, GRAPHGITA_AUDIO_PREFETCH=str(audio_prefetch))
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return process, url
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("Streamlit server did not start within 60s")
+
+
+def process_stats(pid):
+    """CPU seconds and RSS / peak RSS in MB of a Linux process, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/status") as f:
+            status = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    return {"cpu_s": (int(fields[11]) + int(fields[12])) / ticks,
+            "rss_mb": int(status["VmRSS"].split()[0]) / 1024,
+            "peak_rss_mb": int(status["VmHWM"].split()[0]) / 1024}
+
+
+class Session:
+    """One browser-like websocket session: sends reruns with widget states, tracks the widgets shown."""
+
+    def __init__(self, url):
+        self.url = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+        self.connection = None
+        self.widgets = []       # (container, kind, proto, fragment id) of the widgets shown
+        self.values = {}        # widget id -> WidgetState the user has changed
+        self.auto_reruns = {}   # fragment id -> polling interval asked for since the last full run
+        self.pending = set()    # fragments showing an audio placeholder
+        self.cache = {}         # ForwardMsg hash -> message, for ref_hash replies
+        self.view = "Chapter Topology"
+        self.errors = 0
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+        self.connection = await websocket_connect(self.url, subprotocols=["streamlit"],
+                                                  max_message_size=512 * 1024 * 1024)
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+
+    async def rerun(self, trigger=None, fragment_id=""):
+        """Send one rerun (with an optional button trigger) and wait for the final script run."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.fragment_id = fragment_id
+        states = list(self.values.values())
+        if trigger is not None:
+            states.append(WidgetState(id=trigger, trigger_value=True))
+        message.rerun_script.widget_states.widgets.extend(states)
+        started = time.perf_counter()
+        await self.connection.write_message(message.SerializeToString(), binary=True)
+
+        widgets, pending = [], set()
+        while True:
+            raw = await self.connection.read_message()
+            if raw is None:
+                raise ConnectionError("server closed the session")
+            msg = ForwardMsg.FromString(raw)
+            if msg.WhichOneof("type") == "ref_hash":
+                msg = self.cache[msg.ref_hash]
+            elif msg.hash:
+                self.cache[msg.hash] = msg
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                widgets, pending = [], set()
+                if not msg.new_session.fragment_ids_this_run:
+                    # Browsers stop polling fragments when a full script run starts
+                    self.auto_reruns = {}
+            elif kind == "auto_rerun":
+                self.auto_reruns[msg.auto_rerun.fragment_id] = msg.auto_rerun.interval
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    self.errors += 1
+                elif element_type == "markdown" and "Generating audio" in element.markdown.body:
+                    pending.add(msg.delta.fragment_id)
+                elif element_type in ("selectbox", "radio", "button"):
+                    widgets.append((msg.metadata.delta_path[0], element_type, getattr(element, element_type),
+                                    msg.delta.fragment_id))
+            elif kind == "script_finished" and msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                if fragment_id:
+                    # Only the fragment was re-rendered; the rest of the page is unchanged
+                    widgets = [widget for widget in self.widgets if widget[3] != fragment_id] + widgets
+                    pending |= self.pending - {fragment_id}
+                self.widgets, self.pending = widgets, pending
+                return time.perf_counter() - started
+
+    async def play(self, trigger, fragment_id, timeout=120):
+        """Press an audio button and follow the card's polling until the placeholder is replaced."""
+        started = time.perf_counter()
+        await self.rerun(trigger, fragment_id)
+        while fragment_id in self.pending and fragment_id in self.auto_reruns:
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"audio not delivered within {timeout}s")
+            await asyncio.sleep(self.auto_reruns[fragment_id])
+            await self.rerun(fragment_id=fragment_id)
+        return time.perf_counter() - started
+
+    def find(self, kind, label=None, container=None):
+        return [proto for where, widget_kind, proto, _ in self.widgets
+                if widget_kind == kind and (label is None or proto.label == label)
+                and (container is None or where == container)]
+
+    def fragment_of(self, proto):
+        return next((fragment_id for _, _, widget, fragment_id in self.widgets if widget.id == proto.id), "")
+
+    def choose(self, proto, index):
+        """Set a selectbox or radio; returns the fragment to rerun ("" for the whole script)."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        self.values[proto.id] = WidgetState(id=proto.id, int_value=index)
+        return self.fragment_of(proto)
+
+
+async def simulate_user(url, steps, audio_rate, think_ms, rng, samples, audio_order="random"):
+    """One user's random walk; appends (view, action, seconds) to `samples`."""
+    session = Session(url)
+    played = set()
+    await session.connect()
+    try:
+        samples.append((session.view, "load", await session.rerun()))
+        for _ in range(steps):
+            await asyncio.sleep(rng.uniform(0, think_ms * 2) / 1000)
+            trigger, fragment_id = None, ""
+            roll = rng.random()
+            audio = [button for button in session.find("button")
+                     if button.label.startswith("🔊") and button.id not in played]
+            if roll < audio_rate and audio:
+                action = "audio"
+                button = audio[0] if audio_order == "sequential" else rng.choice(audio)
+                played.add(button.id)
+                trigger, fragment_id = button.id, session.fragment_of(button)
+            elif roll < audio_rate + 0.3:
+                action = "switch view"
+                selectbox = session.find("selectbox", VIEW_LABEL)[0]
+                index = rng.randrange(len(selectbox.options))
+                session.choose(selectbox, index)
+                session.view = selectbox.options[index].replace("📌 ", "")
+            elif roll < audio_rate + 0.35 and session.find("selectbox", CORPUS_LABEL):
+                action = "switch text"
+                selectbox = session.find("selectbox", CORPUS_LABEL)[0]
+                session.choose(selectbox, rng.randrange(len(selectbox.options)))
+            else:
+                action = "select"
+                choices = [proto for kind in ("radio", "selectbox") for proto in session.find(kind, container=0)]
+                if not choices:
+                    continue
+                widget = rng.choice(choices)
+                fragment_id = session.choose(widget, rng.randrange(len(widget.options)))
+            if action == "audio":
+                samples.append((session.view, action, await session.play(trigger, fragment_id)))
+            else:
+                samples.append((session.view, action, await session.rerun(trigger, fragment_id)))
+        return session
+    except Exception:
+        session.close()
+        raise
+
+
+def summarize(samples):
+    def stats(values):
+        values_ms = [value * 1000 for value in values]
+        return {"count": len(values_ms), "p50_ms": round(percentile(values_ms, 50), 1),
+                "p99_ms": round(percentile(values_ms, 99), 1)}
+
+    by_view, by_action = {}, {}
+    for view, action, seconds in samples:
+        by_view.setdefault(view, []).append(seconds)
+        by_action.setdefault(action, []).append(seconds)
+    return ({view: stats(values) for view, values in sorted(by_view.items())},
+            {action: stats(values) for action, values in sorted(by_action.items())})
+
+
+async def run_load(url, users, steps, audio_rate, think_ms, ramp_s, seed, pid=None, audio_order="random"):
+    """Run every user; returns elapsed seconds, samples, sessions, failures and server stats."""
+    samples = []
+    before = process_stats(pid) if pid else None
+
+    async def user(index):
+        await asyncio.sleep(ramp_s * index / max(users, 1))
+        return await simulate_user(url, steps, audio_rate, think_ms, random.Random(seed + index), samples,
+                                   audio_order)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(user(index) for index in range(users)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    sessions = [result for result in results if isinstance(result, Session)]
+    failures = [repr(result) for result in results if not isinstance(result, Session)]
+    # Sessions are still connected here, so their server-side state counts towards RSS
+    after = process_stats(pid) if pid else None
+    for session in sessions:
+        session.close()
+    return elapsed, samples, sessions, failures, (before, after)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Load-test a running server instead of launching one")
+    parser.add_argument("--app", default=APP, help="Streamlit script to launch")
+    parser.add_argument("--server-pid", type=int, help="PID of the --url server, for CPU and RSS figures")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent sessions")
+    parser.add_argument("--steps", type=int, default=10, help="Interactions per user after the first load")
+    parser.add_argument("--audio-rate", type=float, default=0.2, help="Share of interactions that press an audio button")
+    parser.add_argument("--think-ms", type=float, default=500, help="Mean pause between a user's interactions")
+    parser.add_argument("--ramp-s", type=float, default=2.0, help="Spread user arrivals over this many seconds")
+    parser.add_argument("--tts-latency-ms", type=float, default=300, help="Latency of the local TTS stand-in")
+    parser.add_argument("--real-tts", action="store_true", help="Call the real gTTS service")
+    parser.add_argument("--audio-prefetch", type=int, default=0, help="GRAPHGITA_AUDIO_PREFETCH for the launched app")
+    parser.add_argument("--audio-order", choices=["random", "sequential"], default="random",
+                        help="Which audio button a user presses next")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve, args.tts_latency_ms, args.app)
+        return 0
+
+    process = None
+    if args.url:
+        url, pid = args.url, args.server_pid
+    else:
+        process, url = start_server(None if args.real_tts else args.tts_latency_ms, args.audio_prefetch, args.app)
+        pid = process.pid
+    try:
+        elapsed, samples, sessions, failures, (before, after) = asyncio.run(
+            run_load(url, args.users, args.steps, args.audio_rate, args.think_ms, args.ramp_s, args.seed, pid,
+                     args.audio_order))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    by_view, by_action = summarize(samples)
+    results = {
+        "target": args.url or "launched",
+        "users": args.users,
+        "steps": args.steps,
+        "elapsed_s": round(elapsed, 3),
+        "reruns": len(samples),
+        "reruns_per_sec": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "script_exceptions": sum(session.errors for session in sessions),
+        "failed_users": failures,
+        "views": by_view,
+        "actions": by_action,
+        "server": None
+    }
+    if before and after:
+        results["server"] = {
+            "cpu_s": round(after["cpu_s"] - before["cpu_s"], 2),
+            "cpu_s_per_session": round((after["cpu_s"] - before["cpu_s"]) / args.users, 3),
+            "cpu_ms_per_rerun": round((after["cpu_s"] - before["cpu_s"]) / max(len(samples), 1) * 1000, 1),
+            "rss_before_mb": round(before["rss_mb"], 1),
+            "rss_after_mb": round(after["rss_mb"], 1),
+            "rss_mb_per_session": round((after["rss_mb"] - before["rss_mb"]) / args.users, 2),
+            "peak_rss_mb": round(after["peak_rss_mb"], 1)
+        }
+    print(json.dumps(results, indent=4, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4, ensure_ascii=False)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Cold-start benchmark for the Streamlit apps: import cost and time to first render.
+
+For each app it reports
+- the import profile of the app module from `python -X importtime`, once Streamlit itself is
+  loaded (as it always is under `streamlit run`): total, plus its most expensive imports;
+- time to first render: from launching `streamlit run <app>` until a new browser session
+  receives its first finished script run, split into server start and first script run.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --apps app.py --repeat 5 --json startup.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from load_test import Session, start_server
+
+# Streamlit and an (unstarted) runtime first, as under `streamlit run`; then the app module
+IMPORT_SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+from streamlit.runtime import Runtime, RuntimeConfig
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
+Runtime(RuntimeConfig(script_path={path!r}, command_line=None,
+                      media_file_storage=MemoryMediaFileStorage("/media"),
+                      uploaded_file_manager=MemoryUploadedFileManager("/_stcore/upload_file")))
+__import__({module!r})
+"""
+
+
+def import_profile(app, top):
+    """Cumulative import time of the app module and its `top` most expensive direct imports, in ms."""
+    module = os.path.splitext(os.path.basename(app))[0]
+    script = IMPORT_SCRIPT.format(root=ROOT, path=app, module=module)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+
+    children, total_ms = [], None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 0:
+            if name == module:
+                total_ms = int(cumulative) / 1000
+                break
+            children = []
+        elif depth == 1:
+            children.append((name, int(cumulative) / 1000))
+    children.sort(key=lambda child: child[1], reverse=True)
+    return {"total_ms": round(total_ms or 0.0, 1),
+            "slowest": {name: round(ms, 1) for name, ms in children[:top]}}
+
+
+async def first_render(url):
+    session = Session(url)
+    await session.connect()
+    try:
+        return await session.rerun()
+    finally:
+        session.close()
+
+
+def time_to_first_render(app):
+    """(server start seconds, first script run seconds) for one cold launch."""
+    started = time.perf_counter()
+    process, url = start_server(None, app=app)
+    try:
+        ready = time.perf_counter() - started
+        return ready, asyncio.run(first_render(url))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", default="app.py,app_networkx_graphs.py", help="Comma separated app scripts")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold launches per app (medians are reported)")
+    parser.add_argument("--top", type=int, default=8, help="Slowest direct imports to list")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for app in args.apps.split(","):
+        path = os.path.join(ROOT, app)
+        imports = import_profile(path, args.top)
+        launches = [time_to_first_render(path) for _ in range(args.repeat)]
+        server_s = statistics.median(ready for ready, _ in launches)
+        render_s = statistics.median(render for _, render in launches)
+        results[app] = {
+            "import_ms": imports["total_ms"],
+            "slowest_imports_ms": imports["slowest"],
+            "server_start_s": round(server_s, 3),
+            "first_script_run_s": round(render_s, 3),
+            "time_to_first_render_s": round(statistics.median(ready + render for ready, render in launches), 3)
+        }
+    print(json.dumps(results, indent=4))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""Deterministic synthetic corpora in the bhagavad_gita_complete.json format, for scale testing.
+
+Generates any number of chapters and verses with every field the apps read. Keywords,
+themes, characters and problem references follow Zipfian distributions, so a few values
+are very common and most are rare, as in the real text. The same arguments and seed
+always produce the same corpus.
+
+    python benchmarks/synthetic_corpus.py --scale 100 --out /tmp/data/bhagavad_gita_complete.json
+    python benchmarks/synthetic_corpus.py --chapters 5000 --verses-per-chapter 60 --problems 2000 --validate
+"""
+import argparse
+import bisect
+import itertools
+import json
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# Real corpus: 18 chapters, 701 verses, 28 problems
+BASE_CHAPTERS = 18
+BASE_VERSES_PER_CHAPTER = 39
+BASE_PROBLEMS = 28
+# Fewest verses a generated chapter gets, however the per-chapter count is drawn
+MIN_VERSES_PER_CHAPTER = 5
+
+SEED_WORDS = [
+    "duty", "action", "detachment", "devotion", "knowledge", "self", "soul", "mind", "desire", "peace",
+    "wisdom", "renunciation", "meditation", "surrender", "karma", "dharma", "yoga", "faith", "equanimity",
+    "liberation", "ignorance", "ego", "attachment", "discipline", "sacrifice", "truth", "compassion",
+    "fear", "anger", "delusion", "purity", "senses", "nature", "consciousness", "eternity", "divine"
+]
+SYLLABLES = ["ka", "ma", "ra", "na", "ta", "ya", "va", "sa", "dha", "bha", "ja", "pra", "tma", "shi", "vi", "du"]
+DEVANAGARI = ["क", "म", "र", "न", "त", "य", "व", "स", "ध", "भ", "ज", "प्र", "त्म", "शि", "वि", "दु", "ं", "ः", "ा", "ि"]
+
+
+class Zipf:
+    """Draws items with probability proportional to 1 / rank ** s."""
+
+    def __init__(self, items, s, rng):
+        self.items = list(items)
+        self.cumulative = list(itertools.accumulate(1 / rank ** s for rank in range(1, len(self.items) + 1)))
+        self.rng = rng
+
+    def draw(self):
+        return self.items[bisect.bisect(self.cumulative, self.rng.random() * self.cumulative[-1])]
+
+    def sample(self, k):
+        """Up to k distinct items."""
+        seen = dict.fromkeys(self.draw() for _ in range(k * 2))
+        return list(seen)[:k]
+
+
+def vocabulary(size, rng):
+    """SEED_WORDS followed by pronounceable pseudo-words, `size` in total."""
+    words = list(SEED_WORDS[:size])
+    seen = set(words)
+    longest = 4
+    while len(SYLLABLES) ** longest < size * 4:
+        longest += 1
+    while len(words) < size:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, longest)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def sentence_pool(words, rng, count=512, length=(8, 24)):
+    """Filler sentences reused across records so generation stays fast at large scale."""
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(*length))).capitalize() + "."
+            for _ in range(count)]
+
+
+def generate_corpus(chapters=BASE_CHAPTERS, verses_per_chapter=BASE_VERSES_PER_CHAPTER, problems=BASE_PROBLEMS,
+                    vocabulary_size=2000, themes=400, characters=60, zipf_s=1.1, seed=0):
+    """Build a corpus dict with the same layout as data/bhagavad_gita_complete.json."""
+    rng = random.Random(seed)
+    words = vocabulary(vocabulary_size, rng)
+    sentences = sentence_pool(words, rng)
+    keyword_dist = Zipf([word.title() for word in words], zipf_s, rng)
+    theme_dist = Zipf([f"{rng.choice(words).title()} of {rng.choice(words).title()}" for _ in range(themes)],
+                      zipf_s, rng)
+    character_names = [f"{''.join(rng.choice(SYLLABLES) for _ in range(3)).title()}" for _ in range(characters)]
+    character_dist = Zipf(character_names, zipf_s, rng)
+    problem_names = [f"{rng.choice(words)}_{index}" for index in range(problems)]
+
+    def text(sentence_count):
+        return " ".join(rng.choice(sentences) for _ in range(sentence_count))
+
+    # Problems reference verses in Zipf-popular chapters, like the real map favours chapter 2
+    chapter_dist = Zipf(range(1, chapters + 1), zipf_s, rng)
+    verse_counts = [max(MIN_VERSES_PER_CHAPTER, int(rng.gauss(verses_per_chapter, verses_per_chapter / 3)))
+                    for _ in range(chapters)]
+    problem_map = {}
+    addressed = {}
+    chapter_problems = {}
+    for problem in problem_names:
+        references = []
+        for _ in range(rng.randint(2, 8)):
+            chapter = chapter_dist.draw()
+            shloka = rng.randint(1, verse_counts[chapter - 1])
+            if {"chapter": chapter, "shloka": shloka} not in references:
+                references.append({"chapter": chapter, "shloka": shloka})
+                addressed.setdefault((chapter, shloka), []).append(problem)
+                chapter_problems.setdefault(chapter, {})[problem] = None
+        problem_map[problem] = {"description": f"Dealing with {problem.split('_')[0]}: {text(1)}",
+                                "references": references}
+    # Every chapter addresses at least one problem, as the chapter schema requires
+    for chapter in range(1, chapters + 1):
+        if chapter not in chapter_problems and problem_names:
+            problem = rng.choice(problem_names)
+            shloka = rng.randint(1, verse_counts[chapter - 1])
+            references = problem_map[problem]["references"]
+            if {"chapter": chapter, "shloka": shloka} not in references:
+                references.append({"chapter": chapter, "shloka": shloka})
+                addressed.setdefault((chapter, shloka), []).append(problem)
+            chapter_problems[chapter] = {problem: None}
+
+    chapter_records = []
+    for number in range(1, chapters + 1):
+        count = verse_counts[number - 1]
+        shlokas = []
+        for shloka_number in range(1, count + 1):
+            shlokas.append({
+                "name": f"Shloka {shloka_number}",
+                "chapter": number,
+                "shloka_number": shloka_number,
+                "sanskrit_text": "".join(rng.choice(DEVANAGARI) for _ in range(rng.randint(40, 80))),
+                "transliteration": " ".join(rng.choice(SYLLABLES) + rng.choice(SYLLABLES) for _ in range(16)),
+                "interpretation": text(4),
+                "meaning": text(2),
+                "keywords": keyword_dist.sample(rng.randint(3, 6)),
+                "life_application": text(2),
+                "addresses_problems": addressed.get((number, shloka_number), [])
+            })
+        chapter_themes = theme_dist.sample(rng.randint(3, 6))
+        cast = character_dist.sample(rng.randint(2, 5))
+        key_events = [{"event": text(1)[:60].rstrip("."),
+                       "shlokas": sorted(rng.sample(range(1, count + 1), min(count, rng.randint(1, 5)))),
+                       "characters": rng.sample(cast, min(len(cast), rng.randint(1, 3)))}
+                      for _ in range(rng.randint(2, 5))]
+        chapter_records.append({
+            "number": number,
+            "name": f"{chapter_themes[0]} Yoga",
+            "summary": text(8),
+            "main_theme": chapter_themes[0],
+            "philosophical_aspects": chapter_themes[1:],
+            "life_problems_addressed": list(chapter_problems.get(number, {}))[:10],
+            "yoga_type": f"{rng.choice(SEED_WORDS).title()} Yoga",
+            "shlokas": shlokas,
+            "characters": [{"name": name, "description": text(1)} for name in cast],
+            "themes": [{"name": theme, "description": text(1)} for theme in chapter_themes],
+            "character_relationships": [{"from": a, "to": b, "description": text(1)}
+                                        for a, b in zip(cast, cast[1:])],
+            "theme_relationships": [{"theme": theme,
+                                     "shlokas": sorted(rng.sample(range(1, count + 1), min(count, 4))),
+                                     "description": text(1)} for theme in chapter_themes],
+            "key_events": key_events,
+            "philosophical_progression": text(3),
+            "chapter_relevance": text(2)
+        })
+    return {"problem_solutions_map": problem_map, "chapters": chapter_records}
+
+
+def scaled_arguments(scale):
+    """Generator arguments for a corpus `scale` times the size of the real one."""
+    return {"chapters": BASE_CHAPTERS * scale, "verses_per_chapter": BASE_VERSES_PER_CHAPTER,
+            "problems": BASE_PROBLEMS * scale, "vocabulary_size": min(200000, 2000 * scale),
+            "themes": min(40000, 400 * scale), "characters": min(5000, 60 * scale)}
+
+
+def validate(corpus, sample=50):
+    """Check sampled chapters and verses against the generation schemas; returns error messages."""
+    import jsonschema
+    from graphGita_schemas import CHAPTER_RELATIONSHIPS_SCHEMA, CHAPTER_SUMMARY_SCHEMA, SHLOKA_DETAILS_SCHEMA
+
+    errors = []
+    rng = random.Random(0)
+    for chapter in rng.sample(corpus["chapters"], min(sample, len(corpus["chapters"]))):
+        for schema in (CHAPTER_SUMMARY_SCHEMA, CHAPTER_RELATIONSHIPS_SCHEMA):
+            errors += [f"chapter {chapter['number']}: {e.message}"
+                       for e in jsonschema.Draft7Validator(schema).iter_errors(chapter)]
+        for shloka in chapter["shlokas"][:5]:
+            errors += [f"shloka {chapter['number']}.{shloka['shloka_number']}: {e.message}"
+                       for e in jsonschema.Draft7Validator(SHLOKA_DETAILS_SCHEMA).iter_errors(shloka)]
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, help="Size relative to the real corpus (sets the counts below)")
+    parser.add_argument("--chapters", type=int, default=BASE_CHAPTERS)
+    parser.add_argument("--verses-per-chapter", type=int, default=BASE_VERSES_PER_CHAPTER)
+    parser.add_argument("--problems", type=int, default=BASE_PROBLEMS)
+    parser.add_argument("--vocabulary-size", type=int, default=2000)
+    parser.add_argument("--themes", type=int, default=400)
+    parser.add_argument("--zipf-s", type=float, default=1.1, help="Zipf exponent for keywords, themes and references")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bhagavad_gita_complete.json")
+    parser.add_argument("--validate", action="store_true", help="Check a sample against the generation schemas")
+    args = parser.parse_args(argv)
+    if args.scale is not None and args.scale < 1:
+        parser.error("--scale must be at least 1")
+    # Every chapter must address a problem, so a corpus without problems fails --validate
+    for name in ("chapters", "problems", "vocabulary_size", "themes"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name.replace('_', '-')} must be at least 1")
+    if args.verses_per_chapter < MIN_VERSES_PER_CHAPTER:
+        parser.error(f"--verses-per-chapter must be at least {MIN_VERSES_PER_CHAPTER}")
+
+    if args.scale:
+        kwargs = scaled_arguments(args.scale)
+    else:
+        kwargs = {"chapters": args.chapters, "verses_per_chapter": args.verses_per_chapter,
+                  "problems": args.problems, "vocabulary_size": args.vocabulary_size, "themes": args.themes}
+    corpus = generate_corpus(zipf_s=args.zipf_s, seed=args.seed, **kwargs)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(corpus, f, ensure_ascii=False)
+    verses = sum(len(chapter["shlokas"]) for chapter in corpus["chapters"])
+    print(f"Wrote {len(corpus['chapters'])} chapters, {verses} verses, "
+          f"{len(corpus['problem_solutions_map'])} problems to {args.out}")
+
+    if args.validate:
+        errors = validate(corpus)
+        for error in errors[:20]:
+            print(f"INVALID {error}")
+        return 1 if errors else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,413 @@
+// WebGL renderer for gita_webgl.webgl_graph. Speaks the Streamlit component protocol
+// directly (no streamlit-component-lib, no build step): it receives typed arrays as
+// bytes arguments, draws edges as GL lines and nodes as round GL points, and only
+// redraws when the view changes. Clicking a node sends its index back to Python.
+//
+// Payload parts arrive only when their digest changed (gita_payload.delta); the others
+// are reused from earlier renders. A part that is missing here (the component was
+// mounted again) triggers a resync request, answered with every part.
+(function () {
+  "use strict";
+
+  const canvas = document.getElementById("canvas");
+  const stage = document.getElementById("stage");
+  const tooltip = document.getElementById("tooltip");
+  const legend = document.getElementById("legend");
+  const status = document.getElementById("status");
+  const gl = canvas.getContext("webgl", { antialias: true, alpha: false });
+
+  // Streamlit messaging
+  function send(type, data) {
+    window.parent.postMessage(Object.assign({ isStreamlitMessage: true, type: type }, data), "*");
+  }
+
+  // Payload parts received so far and their digests; the graph is rebuilt when they change
+  const parts = {};
+  const held = {};
+  let graph = null;
+  let built = null;
+  let resyncFor = null;
+  let resyncToken = null;
+  let height = 700;
+  let background = [1, 1, 1];
+  // World-to-clip transform: clip = world * scale + offset (scale keeps pixels square)
+  const view = { scale: 1, offset: [0, 0] };
+  let hovered = -1;
+  let selected = -1;
+  let dirty = false;
+
+  const NODE_VS = `
+    attribute vec2 a_pos; attribute vec3 a_color; attribute float a_size;
+    uniform vec2 u_scale; uniform vec2 u_offset; uniform float u_point;
+    varying vec3 v_color;
+    void main() {
+      gl_Position = vec4(a_pos * u_scale + u_offset, 0.0, 1.0);
+      gl_PointSize = a_size * u_point;
+      v_color = a_color;
+    }`;
+  const NODE_FS = `
+    precision mediump float; varying vec3 v_color; uniform vec3 u_ring;
+    void main() {
+      float d = length(gl_PointCoord - vec2(0.5));
+      if (d > 0.5) discard;
+      vec3 color = d > 0.38 ? mix(v_color, u_ring, 0.55) : v_color;
+      gl_FragColor = vec4(color, 1.0);
+    }`;
+  const EDGE_VS = `
+    attribute vec2 a_pos; attribute vec4 a_color;
+    uniform vec2 u_scale; uniform vec2 u_offset;
+    varying vec4 v_color;
+    void main() { gl_Position = vec4(a_pos * u_scale + u_offset, 0.0, 1.0); v_color = a_color; }`;
+  const EDGE_FS = `
+    precision mediump float; varying vec4 v_color;
+    void main() { gl_FragColor = v_color; }`;
+
+  function compile(vs, fs) {
+    const program = gl.createProgram();
+    [[gl.VERTEX_SHADER, vs], [gl.FRAGMENT_SHADER, fs]].forEach(function (pair) {
+      const shader = gl.createShader(pair[0]);
+      gl.shaderSource(shader, pair[1]);
+      gl.compileShader(shader);
+      if (!gl.getShaderParameter(shader, gl.COMPILE_STATUS)) throw new Error(gl.getShaderInfoLog(shader));
+      gl.attachShader(program, shader);
+    });
+    gl.linkProgram(program);
+    if (!gl.getProgramParameter(program, gl.LINK_STATUS)) throw new Error(gl.getProgramInfoLog(program));
+    return program;
+  }
+
+  const nodeProgram = gl && compile(NODE_VS, NODE_FS);
+  const edgeProgram = gl && compile(EDGE_VS, EDGE_FS);
+
+  function hexColor(hex) {
+    const value = parseInt(hex.replace("#", ""), 16);
+    return [(value >> 16 & 255) / 255, (value >> 8 & 255) / 255, (value & 255) / 255];
+  }
+
+  // Bytes arguments arrive as Uint8Array views that may not be aligned for wider types
+  function typed(bytes, Type) {
+    if (!bytes || !bytes.byteLength) return new Type(0);
+    const copy = new Uint8Array(bytes.byteLength);
+    copy.set(bytes);
+    return new Type(copy.buffer);
+  }
+
+  function buffer(data) {
+    const id = gl.createBuffer();
+    gl.bindBuffer(gl.ARRAY_BUFFER, id);
+    gl.bufferData(gl.ARRAY_BUFFER, data, gl.STATIC_DRAW);
+    return id;
+  }
+
+  function build(args) {
+    const positions = typed(args.positions, Float32Array);
+    const types = typed(args.types, Uint8Array);
+    const edges = typed(args.edges, Uint32Array);
+    const kinds = typed(args.edge_kinds, Uint8Array);
+    const count = types.length;
+    const palette = args.styles.map(function (style) { return hexColor(style.color); });
+    const sizes = args.styles.map(function (style) { return style.size; });
+    const edgePalette = args.edge_styles.map(function (style) { return hexColor(style.color); });
+
+    const colors = new Float32Array(count * 3);
+    const pointSizes = new Float32Array(count);
+    for (let i = 0; i < count; i++) {
+      colors.set(palette[types[i]] || [1, 1, 1], i * 3);
+      // create_node sizes are vis.js radii; points are drawn at a fraction of them
+      pointSizes[i] = (sizes[types[i]] || 25) * 0.3;
+    }
+    const edgeCount = edges.length / 2;
+    const edgePositions = new Float32Array(edgeCount * 4);
+    const edgeColors = new Float32Array(edgeCount * 8);
+    for (let e = 0; e < edgeCount; e++) {
+      const a = edges[2 * e], b = edges[2 * e + 1];
+      edgePositions.set([positions[2 * a], positions[2 * a + 1], positions[2 * b], positions[2 * b + 1]], e * 4);
+      const color = edgePalette[kinds[e]] || [0.6, 0.6, 0.6];
+      const alpha = kinds[e] === 0 ? 0.35 : 0.6;
+      edgeColors.set([color[0], color[1], color[2], alpha, color[0], color[1], color[2], alpha], e * 8);
+    }
+
+    let minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
+    for (let i = 0; i < count; i++) {
+      minX = Math.min(minX, positions[2 * i]); maxX = Math.max(maxX, positions[2 * i]);
+      minY = Math.min(minY, positions[2 * i + 1]); maxY = Math.max(maxY, positions[2 * i + 1]);
+    }
+    if (!count) { minX = minY = -1; maxX = maxY = 1; }
+
+    legend.innerHTML = args.styles.filter(function (style, index) {
+      return Array.prototype.indexOf.call(types, index) >= 0;
+    }).map(function (style) {
+      return '<div><span style="background:' + style.color + '"></span>' + style.type + "</div>";
+    }).join("");
+
+    return {
+      count: count, edgeCount: edgeCount, positions: positions, colors: colors, sizes: pointSizes,
+      labels: args.labels, bounds: [minX, minY, maxX, maxY],
+      grid: buildGrid(positions, count, [minX, minY, maxX, maxY]),
+      nodeBuffers: { a_pos: buffer(positions), a_color: buffer(colors), a_size: buffer(pointSizes) },
+      edgeBuffers: { a_pos: buffer(edgePositions), a_color: buffer(edgeColors) },
+      highlight: { a_pos: gl.createBuffer(), a_color: gl.createBuffer(), a_size: gl.createBuffer() }
+    };
+  }
+
+  // Uniform grid over world space so hover picking stays cheap on large graphs
+  function buildGrid(positions, count, bounds) {
+    const side = Math.max(1, Math.ceil(Math.sqrt(count / 4)));
+    const width = (bounds[2] - bounds[0]) || 1, heightWorld = (bounds[3] - bounds[1]) || 1;
+    const cells = new Map();
+    for (let i = 0; i < count; i++) {
+      const key = cellOf(positions[2 * i], positions[2 * i + 1]);
+      if (!cells.has(key)) cells.set(key, []);
+      cells.get(key).push(i);
+    }
+    function cellOf(x, y) {
+      const cx = Math.min(side - 1, Math.max(0, Math.floor((x - bounds[0]) / width * side)));
+      const cy = Math.min(side - 1, Math.max(0, Math.floor((y - bounds[1]) / heightWorld * side)));
+      return cy * side + cx;
+    }
+    return { side: side, cells: cells, cellWidth: width / side, cellHeight: heightWorld / side, bounds: bounds };
+  }
+
+  function fit() {
+    const b = graph.bounds;
+    const aspect = canvas.width / canvas.height;
+    const spanX = (b[2] - b[0]) || 1, spanY = (b[3] - b[1]) || 1;
+    view.scale = 1.9 / Math.max(spanX / aspect, spanY);
+    view.offset = [-(b[0] + b[2]) / 2 * view.scale / aspect, -(b[1] + b[3]) / 2 * view.scale];
+  }
+
+  function scaleVector() {
+    return [view.scale * canvas.height / canvas.width, view.scale];
+  }
+
+  function toWorld(px, py) {
+    const rect = canvas.getBoundingClientRect();
+    const clipX = (px - rect.left) / rect.width * 2 - 1, clipY = 1 - (py - rect.top) / rect.height * 2;
+    const s = scaleVector();
+    return [(clipX - view.offset[0]) / s[0], (clipY - view.offset[1]) / s[1]];
+  }
+
+  function pick(px, py) {
+    if (!graph || !graph.count) return -1;
+    const world = toWorld(px, py);
+    const rect = canvas.getBoundingClientRect();
+    // Pick radius: 8 CSS pixels in world units
+    const radius = 8 / (rect.height / 2) / view.scale;
+    const g = graph.grid;
+    const x0 = Math.floor((world[0] - radius - g.bounds[0]) / g.cellWidth);
+    const x1 = Math.floor((world[0] + radius - g.bounds[0]) / g.cellWidth);
+    const y0 = Math.floor((world[1] - radius - g.bounds[1]) / g.cellHeight);
+    const y1 = Math.floor((world[1] + radius - g.bounds[1]) / g.cellHeight);
+    let best = -1, bestDistance = radius * radius;
+    for (let cy = Math.max(0, y0); cy <= Math.min(g.side - 1, y1); cy++) {
+      for (let cx = Math.max(0, x0); cx <= Math.min(g.side - 1, x1); cx++) {
+        const members = g.cells.get(cy * g.side + cx);
+        if (!members) continue;
+        for (let m = 0; m < members.length; m++) {
+          const i = members[m];
+          const dx = graph.positions[2 * i] - world[0], dy = graph.positions[2 * i + 1] - world[1];
+          const distance = dx * dx + dy * dy;
+          if (distance <= bestDistance) { best = i; bestDistance = distance; }
+        }
+      }
+    }
+    return best;
+  }
+
+  function bind(program, buffers, sizes) {
+    Object.keys(buffers).forEach(function (name) {
+      const location = gl.getAttribLocation(program, name);
+      if (location < 0) return;
+      gl.bindBuffer(gl.ARRAY_BUFFER, buffers[name]);
+      gl.enableVertexAttribArray(location);
+      gl.vertexAttribPointer(location, sizes[name], gl.FLOAT, false, 0, 0);
+    });
+  }
+
+  function draw() {
+    dirty = false;
+    gl.viewport(0, 0, canvas.width, canvas.height);
+    gl.clearColor(background[0], background[1], background[2], 1);
+    gl.clear(gl.COLOR_BUFFER_BIT);
+    if (!graph) return;
+    const s = scaleVector();
+    const ratio = window.devicePixelRatio || 1;
+    // Points grow a little when zoomed in, but never past 3x
+    const pointScale = ratio * Math.min(3, Math.max(0.6, Math.sqrt(view.scale)));
+
+    gl.enable(gl.BLEND);
+    gl.blendFunc(gl.SRC_ALPHA, gl.ONE_MINUS_SRC_ALPHA);
+    gl.useProgram(edgeProgram);
+    gl.uniform2fv(gl.getUniformLocation(edgeProgram, "u_scale"), s);
+    gl.uniform2fv(gl.getUniformLocation(edgeProgram, "u_offset"), view.offset);
+    bind(edgeProgram, graph.edgeBuffers, { a_pos: 2, a_color: 4 });
+    gl.drawArrays(gl.LINES, 0, graph.edgeCount * 2);
+
+    gl.useProgram(nodeProgram);
+    gl.uniform2fv(gl.getUniformLocation(nodeProgram, "u_scale"), s);
+    gl.uniform2fv(gl.getUniformLocation(nodeProgram, "u_offset"), view.offset);
+    gl.uniform1f(gl.getUniformLocation(nodeProgram, "u_point"), pointScale);
+    gl.uniform3fv(gl.getUniformLocation(nodeProgram, "u_ring"), [0.25, 0.25, 0.25]);
+    bind(nodeProgram, graph.nodeBuffers, { a_pos: 2, a_color: 3, a_size: 1 });
+    gl.drawArrays(gl.POINTS, 0, graph.count);
+
+    // Hovered and selected nodes are drawn again on top, larger and ringed in red
+    const marked = [hovered, selected].filter(function (i) { return i >= 0; });
+    if (marked.length) {
+      const h = graph.highlight;
+      gl.bindBuffer(gl.ARRAY_BUFFER, h.a_pos);
+      gl.bufferData(gl.ARRAY_BUFFER, new Float32Array([].concat.apply([], marked.map(function (i) {
+        return [graph.positions[2 * i], graph.positions[2 * i + 1]];
+      }))), gl.DYNAMIC_DRAW);
+      gl.bindBuffer(gl.ARRAY_BUFFER, h.a_color);
+      gl.bufferData(gl.ARRAY_BUFFER, new Float32Array([].concat.apply([], marked.map(function (i) {
+        return Array.from(graph.colors.subarray(3 * i, 3 * i + 3));
+      }))), gl.DYNAMIC_DRAW);
+      gl.bindBuffer(gl.ARRAY_BUFFER, h.a_size);
+      gl.bufferData(gl.ARRAY_BUFFER, new Float32Array(marked.map(function (i) {
+        return graph.sizes[i] * 1.8;
+      })), gl.DYNAMIC_DRAW);
+      gl.uniform3fv(gl.getUniformLocation(nodeProgram, "u_ring"), [0.85, 0.1, 0.1]);
+      bind(nodeProgram, h, { a_pos: 2, a_color: 3, a_size: 1 });
+      gl.drawArrays(gl.POINTS, 0, marked.length);
+    }
+  }
+
+  function requestDraw() {
+    if (!dirty) {
+      dirty = true;
+      window.requestAnimationFrame(draw);
+    }
+  }
+
+  function resize() {
+    const ratio = window.devicePixelRatio || 1;
+    stage.style.height = height + "px";
+    const width = Math.max(1, Math.floor(stage.clientWidth * ratio));
+    const pixels = Math.max(1, Math.floor(height * ratio));
+    if (canvas.width !== width || canvas.height !== pixels) {
+      canvas.width = width;
+      canvas.height = pixels;
+      requestDraw();
+    }
+  }
+
+  function showTooltip(event) {
+    if (hovered < 0) {
+      tooltip.style.display = "none";
+      return;
+    }
+    const rect = stage.getBoundingClientRect();
+    tooltip.textContent = graph.labels[hovered];
+    tooltip.style.display = "block";
+    tooltip.style.left = Math.min(event.clientX - rect.left + 12, rect.width - tooltip.offsetWidth - 4) + "px";
+    tooltip.style.top = (event.clientY - rect.top + 12) + "px";
+  }
+
+  // Pan by dragging, zoom with the wheel around the cursor, click a node to select it
+  let drag = null;
+  canvas.addEventListener("mousedown", function (event) {
+    drag = { x: event.clientX, y: event.clientY, offset: view.offset.slice(), moved: false };
+    canvas.classList.add("dragging");
+  });
+  window.addEventListener("mouseup", function (event) {
+    if (drag && !drag.moved && graph) {
+      const index = pick(event.clientX, event.clientY);
+      if (index >= 0 && index !== selected) {
+        selected = index;
+        send("streamlit:setComponentValue", { value: { node: index, resync: resyncToken }, dataType: "json" });
+        requestDraw();
+      }
+    }
+    drag = null;
+    canvas.classList.remove("dragging");
+  });
+  canvas.addEventListener("mousemove", function (event) {
+    if (drag) {
+      const rect = canvas.getBoundingClientRect();
+      const dx = event.clientX - drag.x, dy = event.clientY - drag.y;
+      if (Math.abs(dx) + Math.abs(dy) > 3) drag.moved = true;
+      view.offset = [drag.offset[0] + dx / rect.width * 2, drag.offset[1] - dy / rect.height * 2];
+      requestDraw();
+      return;
+    }
+    const index = pick(event.clientX, event.clientY);
+    if (index !== hovered) {
+      hovered = index;
+      requestDraw();
+    }
+    showTooltip(event);
+  });
+  canvas.addEventListener("mouseleave", function () {
+    if (hovered >= 0) {
+      hovered = -1;
+      requestDraw();
+    }
+    tooltip.style.display = "none";
+  });
+  canvas.addEventListener("wheel", function (event) {
+    event.preventDefault();
+    const before = toWorld(event.clientX, event.clientY);
+    view.scale *= Math.exp(-event.deltaY * 0.0015);
+    view.scale = Math.min(400, Math.max(0.05, view.scale));
+    const after = toWorld(event.clientX, event.clientY);
+    const s = scaleVector();
+    view.offset = [view.offset[0] + (after[0] - before[0]) * s[0], view.offset[1] + (after[1] - before[1]) * s[1]];
+    requestDraw();
+  }, { passive: false });
+  canvas.addEventListener("dblclick", function () {
+    if (graph) {
+      fit();
+      requestDraw();
+    }
+  });
+  window.addEventListener("resize", resize);
+
+  window.addEventListener("message", function (event) {
+    const data = event.data;
+    if (!data || data.type !== "streamlit:render") return;
+    const args = data.args;
+    if (data.theme && data.theme.backgroundColor) background = hexColor(data.theme.backgroundColor);
+    if (data.theme) {
+      legend.style.color = data.theme.textColor || "";
+      status.style.color = data.theme.textColor || "";
+    }
+    if (args.height !== height) {
+      height = args.height;
+      send("streamlit:setFrameHeight", { height: height + 2 });
+    }
+    resize();
+    if (!gl) {
+      status.textContent = "WebGL is not available in this browser.";
+      return;
+    }
+    const digests = args.digests || {};
+    Object.keys(digests).forEach(function (name) {
+      if (args[name] !== undefined) {
+        parts[name] = args[name];
+        held[name] = digests[name];
+      }
+    });
+    const wanted = JSON.stringify(digests);
+    if (Object.keys(digests).some(function (name) { return held[name] !== digests[name]; })) {
+      // Asked once per payload; the next run sends every part
+      if (resyncFor !== wanted) {
+        resyncFor = wanted;
+        resyncToken = Date.now().toString(36) + Math.random().toString(36).slice(2, 8);
+        send("streamlit:setComponentValue", { value: { node: null, resync: resyncToken }, dataType: "json" });
+      }
+      return;
+    }
+    if (wanted !== built) {
+      built = wanted;
+      graph = build(parts);
+      hovered = selected = -1;
+      fit();
+      status.textContent = graph.count + " nodes · " + graph.edgeCount + " edges · drag to pan, scroll to zoom, double-click to reset";
+    }
+    requestDraw();
+  });
+
+  send("streamlit:componentReady", { apiVersion: 1 });
+  send("streamlit:setFrameHeight", { height: height + 2 });
+})();
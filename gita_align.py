@@ -0,0 +1,176 @@
+"""Cross-edition verse alignment for graphGita corpora.
+
+Corpora that are editions of the same text share a `work` in data/corpora.json. The
+alignment index maps every canonical verse id of a work ("2.47") to the position of that
+verse's record in each edition, so comparing a verse across editions is one lookup per
+edition instead of a scan of every corpus:
+
+    index = AlignmentIndex.build(registry)
+    for corpus_id, shloka in index.compare(registry, 'bhagavad_gita', '2.47'):
+        ...
+
+Editions with clean chapter/verse numbering are aligned by number. Editions marked
+`"alignment": "similarity"` (merged, split or renumbered verses) are aligned to the
+work's reference edition chapter by chapter, matching verses on transliteration
+similarity with an order-preserving dynamic programme.
+"""
+import json
+import os
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from gita_corpus import DATA_DIR, Corpus, CorpusRegistry
+
+ALIGNMENT_FILE = os.path.join(DATA_DIR, 'alignment_index.json')
+# Below this trigram similarity two verses are not considered the same verse
+MIN_SIMILARITY = 0.2
+
+
+def verse_id(chapter: int, shloka: int) -> str:
+    """Canonical verse id, e.g. "2.47"."""
+    return f"{chapter}.{shloka}"
+
+
+def parse_verse_id(value: str) -> Optional[Tuple[int, int]]:
+    """Parse "2.47", "2:47" or "2 47" into (chapter, shloka)."""
+    match = re.fullmatch(r'\s*(\d+)\s*[.:\s]\s*(\d+)\s*', value or '')
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def verse_trigrams(shloka: Dict) -> set:
+    """Character trigrams of a verse's transliteration (or Sanskrit text), without diacritics."""
+    text = shloka.get('transliteration') or shloka.get('sanskrit_text') or ''
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = re.sub(r'[^a-zऀ-ॿ]+', ' ', ''.join(c for c in text if not unicodedata.combining(c)))
+    text = ' '.join(text.split())
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def similarity(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def align_sequences(reference: List[set], edition: List[set]) -> List[Tuple[int, int, float]]:
+    """Order-preserving alignment of two verse sequences maximizing total similarity.
+
+    Returns (reference index, edition index, similarity) pairs; verses may be left
+    unaligned on either side, which covers merged, split and missing verses."""
+    n, m = len(reference), len(edition)
+    scores = [[similarity(r, e) for e in edition] for r in reference]
+    best = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for i in range(n - 1, -1, -1):
+        for j in range(m - 1, -1, -1):
+            match = scores[i][j] + best[i + 1][j + 1] if scores[i][j] >= MIN_SIMILARITY else 0.0
+            best[i][j] = max(match, best[i + 1][j], best[i][j + 1])
+
+    pairs = []
+    i = j = 0
+    while i < n and j < m:
+        if scores[i][j] >= MIN_SIMILARITY and best[i][j] == scores[i][j] + best[i + 1][j + 1]:
+            pairs.append((i, j, round(scores[i][j], 3)))
+            i += 1
+            j += 1
+        elif best[i][j] == best[i + 1][j]:
+            i += 1
+        else:
+            j += 1
+    return pairs
+
+
+class AlignmentIndex:
+    """Canonical verse id → per-edition record offsets, grouped by work.
+
+    An offset is (chapter position, shloka position) in the edition's canonical data, so
+    the record is `corpus.data['chapters'][c]['shlokas'][s]`."""
+
+    def __init__(self, works: Optional[Dict[str, Dict[str, Dict[str, List]]]] = None):
+        self.works = works or {}
+
+    @classmethod
+    def build(cls, registry: CorpusRegistry) -> 'AlignmentIndex':
+        editions_by_work: Dict[str, List[Corpus]] = {}
+        for corpus_id in registry.ids():
+            corpus = registry.corpora[corpus_id]
+            editions_by_work.setdefault(corpus.work, []).append(corpus)
+
+        index = cls()
+        for work, editions in editions_by_work.items():
+            # The first numbered edition defines the canonical verse ids of the work
+            numbered = [c for c in editions if c.spec.get('alignment', 'number') == 'number']
+            reference = registry.get((numbered or editions)[0].id)
+            verses = index.works.setdefault(work, {})
+            for corpus in editions:
+                corpus = registry.get(corpus.id)
+                if corpus is reference or corpus.spec.get('alignment', 'number') == 'number':
+                    index._add_by_number(verses, corpus)
+                else:
+                    index._add_by_similarity(verses, reference, corpus)
+        return index
+
+    @staticmethod
+    def _add_by_number(verses: Dict, corpus: Corpus) -> None:
+        for c, chapter in enumerate(corpus.data['chapters']):
+            for s, shloka in enumerate(chapter['shlokas']):
+                entry = verses.setdefault(verse_id(chapter['number'], shloka['shloka_number']), {})
+                entry[corpus.id] = [c, s]
+
+    @staticmethod
+    def _add_by_similarity(verses: Dict, reference: Corpus, corpus: Corpus) -> None:
+        for c, chapter in enumerate(corpus.data['chapters']):
+            ref_chapter = reference.get_chapter(chapter['number'])
+            if not ref_chapter:
+                continue
+            ref_shlokas = ref_chapter['shlokas']
+            pairs = align_sequences([verse_trigrams(s) for s in ref_shlokas],
+                                    [verse_trigrams(s) for s in chapter['shlokas']])
+            for ref_pos, pos, score in pairs:
+                entry = verses.setdefault(verse_id(chapter['number'], ref_shlokas[ref_pos]['shloka_number']), {})
+                entry[corpus.id] = [c, pos, score]
+
+    def offsets(self, work: str, verse: str) -> Dict[str, List]:
+        """Per-edition offsets of one verse ({} if no edition has it)."""
+        return self.works.get(work, {}).get(verse, {})
+
+    def compare(self, registry: CorpusRegistry, work: str, verse: str) -> List[Tuple[str, Dict]]:
+        """(corpus id, shloka record) for every edition of `work` that contains `verse`."""
+        records = []
+        for corpus_id, offset in self.offsets(work, verse).items():
+            data = registry.get(corpus_id).data
+            records.append((corpus_id, data['chapters'][offset[0]]['shlokas'][offset[1]]))
+        return records
+
+    def save(self, path: str = ALIGNMENT_FILE) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'works': self.works}, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str = ALIGNMENT_FILE) -> 'AlignmentIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)['works'])
+
+
+def load_or_build(registry: CorpusRegistry, path: str = ALIGNMENT_FILE) -> AlignmentIndex:
+    """Use the precomputed index if it is newer than every corpus file, otherwise rebuild it."""
+    if os.path.exists(path):
+        built = os.path.getmtime(path)
+        sources = [os.path.join(registry.data_dir, 'corpora.json')]
+        sources += [corpus.path for corpus in registry.corpora.values()]
+        if all(built >= os.path.getmtime(p) for p in sources if os.path.exists(p)):
+            return AlignmentIndex.load(path)
+    return AlignmentIndex.build(registry)
+
+
+if __name__ == "__main__":
+    # Precompute the index at build time: python gita_align.py [output path]
+    import sys
+
+    output = sys.argv[1] if len(sys.argv) > 1 else ALIGNMENT_FILE
+    alignment = AlignmentIndex.build(CorpusRegistry())
+    alignment.save(output)
+    for work, work_verses in alignment.works.items():
+        editions = {corpus_id for entry in work_verses.values() for corpus_id in entry}
+        print(f"{work}: {len(work_verses)} verses across {len(editions)} edition(s)")
+    print(f"Saved alignment index to {output}")
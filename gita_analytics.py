@@ -0,0 +1,277 @@
+"""Batch concept overlap and conflict analysis across graphGita corpora.
+
+Each chapter (or, with level='corpus', each whole corpus) becomes a bag of concept terms
+drawn from its themes, philosophical aspects, concepts, life problems and verse keywords.
+Pairwise overlap is the cosine similarity of TF-IDF vectors and conflict is the number of
+opposing concepts (OPPOSING_CONCEPTS) one side emphasizes against the other; both come
+out of matrix products rather than nested loops.
+
+For many corpora the row space is split into shards that a process pool scores in
+parallel. The matrices are placed in shared memory once, so workers do not receive
+their own pickled copies.
+
+    python gita_analytics.py --level chapter --workers 8 --top-k 10 --output data/concept_edges.json
+
+Edges written to data/concept_edges.json are loaded into the shared knowledge graph by
+CorpusRegistry.ensure_graph, so the apps and the API show them; --into-graph reports
+how many concept edges the graph holds. Only chapter-level edges can be loaded: the
+graph has no node per corpus.
+"""
+import argparse
+import json
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from gita_corpus import CorpusRegistry, add_concept_edges, node_id
+
+STOPWORDS = {
+    'the', 'and', 'of', 'to', 'in', 'for', 'with', 'on', 'as', 'by', 'an', 'or', 'is', 'are',
+    'its', 'from', 'that', 'this', 'into', 'through', 'one', 'ones', 'all', 'not', 'his', 'her',
+    'their', 'our', 'your', 'be', 'being', 'at', 'over', 'between', 'vs', 'versus', 'nature'
+}
+
+CONCEPT_EDGE_TYPES = ('concept_overlap', 'concept_conflict')
+
+# Concept pairs treated as conflicting emphases when two texts lean on opposite sides
+OPPOSING_CONCEPTS = [
+    ('action', 'renunciation'),
+    ('action', 'inaction'),
+    ('attachment', 'detachment'),
+    ('duality', 'nonduality'),
+    ('desire', 'desirelessness'),
+    ('ego', 'egolessness'),
+    ('bondage', 'liberation'),
+    ('ignorance', 'knowledge'),
+    ('devotion', 'knowledge'),
+    ('worldly', 'renunciation'),
+    ('effort', 'effortlessness'),
+    ('doership', 'nondoership')
+]
+
+
+def concept_terms(text: str) -> List[str]:
+    """Lower-cased concept words, with hyphenated compounds joined ("non-duality" -> "nonduality")."""
+    text = re.sub(r'(\w)-(\w)', r'\1\2', text.lower())
+    return [word for word in re.findall(r'[a-z]{3,}', text) if word not in STOPWORDS]
+
+
+def chapter_terms(chapter: Dict) -> List[str]:
+    """All concept terms of one canonical chapter record."""
+    phrases = [chapter['main_theme'], chapter['yoga_type']]
+    phrases += chapter['philosophical_aspects'] + chapter['life_problems_addressed']
+    phrases += [theme.get('name', '') for theme in chapter['themes']]
+    phrases += [concept.get('concept', '') for concept in chapter['concepts']]
+    phrases += [keyword for shloka in chapter['shlokas'] for keyword in shloka['keywords']]
+    return [term for phrase in phrases if isinstance(phrase, str) for term in concept_terms(phrase)]
+
+
+def collect_units(registry: CorpusRegistry, level: str = 'chapter',
+                  corpus_ids: Optional[Iterable[str]] = None) -> Tuple[List[str], List[str], List[List[str]]]:
+    """Return (node ids, corpus ids, term lists) for every chapter or corpus analyzed."""
+    ids, owners, documents = [], [], []
+    for corpus_id in corpus_ids or registry.ids():
+        corpus = registry.get(corpus_id)
+        chapters = corpus.data['chapters']
+        if level == 'corpus':
+            ids.append(node_id(corpus_id, 'Corpus'))
+            owners.append(corpus_id)
+            documents.append([term for chapter in chapters for term in chapter_terms(chapter)])
+        else:
+            for chapter in chapters:
+                ids.append(node_id(corpus_id, f"Chapter_{chapter['number']}"))
+                owners.append(corpus_id)
+                documents.append(chapter_terms(chapter))
+    return ids, owners, documents
+
+
+def build_matrices(documents: List[List[str]], max_features: int = 4096):
+    """Term-count documents -> (L2-normalized TF-IDF matrix, presence matrix, opposition matrix, vocabulary).
+
+    The vocabulary keeps the `max_features` terms with the highest document frequency, which
+    bounds the dense matrices at units x max_features float32."""
+    df: Dict[str, int] = {}
+    for terms in documents:
+        for term in set(terms):
+            df[term] = df.get(term, 0) + 1
+    vocabulary = sorted(df, key=lambda term: (-df[term], term))[:max_features]
+    column = {term: i for i, term in enumerate(vocabulary)}
+
+    rows = [row for row, terms in enumerate(documents) for term in terms if term in column]
+    cols = [column[term] for terms in documents for term in terms if term in column]
+    counts = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+    np.add.at(counts, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), 1)
+
+    n = len(documents)
+    idf = np.array([math.log((1 + n) / (1 + df[term])) + 1 for term in vocabulary], dtype=np.float32)
+    tfidf = np.log1p(counts) * idf
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    tfidf /= np.where(norms == 0, 1, norms)
+
+    presence = (counts > 0).astype(np.float32)
+    # opposed[i, t] > 0 if unit i mentions a concept that opposes term t
+    opposed = np.zeros_like(presence)
+    for a, b in opposition_columns(vocabulary):
+        opposed[:, b] += presence[:, a]
+        opposed[:, a] += presence[:, b]
+    return tfidf, presence, opposed, vocabulary
+
+
+def opposition_columns(vocabulary: List[str]) -> List[Tuple[int, int]]:
+    """Vocabulary column pairs of the OPPOSING_CONCEPTS present in `vocabulary`."""
+    column = {term: i for i, term in enumerate(vocabulary)}
+    return [(column[a], column[b]) for a, b in OPPOSING_CONCEPTS if a in column and b in column]
+
+
+# Worker-side views of the shared matrices, attached once per process by _attach
+_SHARED: Dict[str, np.ndarray] = {}
+_HANDLES: List[shared_memory.SharedMemory] = []
+
+
+def _to_shared(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, Tuple]:
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _attach(specs: Dict[str, Tuple]) -> None:
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _HANDLES.append(shm)
+        _SHARED[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def score_shard(start: int, stop: int, owners: List[int], top_k: int, min_similarity: float,
+                cross_corpus_only: bool) -> List[Tuple]:
+    """Score rows [start, stop) against every later row; returns (i, j, kind, weight) tuples.
+
+    At most `top_k` overlap and `top_k` conflict edges are kept per row, so the output
+    grows linearly with the number of units rather than quadratically."""
+    tfidf, presence, opposed = _SHARED['tfidf'], _SHARED['presence'], _SHARED['opposed']
+    similarity = tfidf[start:stop] @ tfidf.T
+    conflicts = opposed[start:stop] @ presence.T
+    owners = np.asarray(owners)
+    columns = np.arange(similarity.shape[1])
+    edges = []
+    for offset, i in enumerate(range(start, stop)):
+        mask = columns > i
+        if cross_corpus_only:
+            mask &= owners != owners[i]
+        overlap = np.where(mask & (similarity[offset] >= min_similarity), similarity[offset], 0.0)
+        conflict = np.where(mask, conflicts[offset], 0.0)
+        for kind, row in (('concept_overlap', overlap), ('concept_conflict', conflict)):
+            candidates = np.nonzero(row)[0]
+            if top_k and len(candidates) > top_k:
+                candidates = candidates[np.argpartition(-row[candidates], top_k)[:top_k]]
+            edges.extend((i, int(j), kind, round(float(row[j]), 4)) for j in candidates)
+    return edges
+
+
+def shared_terms(tfidf: np.ndarray, vocabulary: List[str], i: int, j: int, limit: int = 5) -> List[str]:
+    """The terms contributing most to the similarity of units i and j."""
+    contribution = tfidf[i] * tfidf[j]
+    top = np.argpartition(-contribution, limit)[:limit] if limit < len(contribution) else np.arange(len(contribution))
+    top = top[np.argsort(-contribution[top])]
+    return [vocabulary[t] for t in top if contribution[t] > 0]
+
+
+def opposing_terms(presence: np.ndarray, vocabulary: List[str], pairs: List[Tuple[int, int]],
+                   i: int, j: int) -> List[str]:
+    """The opposing concept pairs split between units i and j, e.g. "attachment/detachment"."""
+    return [f"{vocabulary[a]}/{vocabulary[b]}" for a, b in pairs
+            if (presence[i, a] and presence[j, b]) or (presence[i, b] and presence[j, a])]
+
+
+def analyze(registry: CorpusRegistry, level: str = 'chapter', corpus_ids: Optional[Iterable[str]] = None,
+            workers: Optional[int] = None, shard_size: int = 512, top_k: int = 10, min_similarity: float = 0.2,
+            cross_corpus_only: bool = False, max_features: int = 4096) -> List[Dict]:
+    """Compute overlap and conflict edges between every pair of chapters (or corpora)."""
+    ids, owners, documents = collect_units(registry, level, corpus_ids)
+    if len(ids) < 2:
+        return []
+    owner_codes = {owner: code for code, owner in enumerate(dict.fromkeys(owners))}
+    owners = [owner_codes[owner] for owner in owners]
+    tfidf, presence, opposed, vocabulary = build_matrices(documents, max_features)
+    shards = [(start, min(start + shard_size, len(ids))) for start in range(0, len(ids), shard_size)]
+    workers = workers or os.cpu_count() or 1
+
+    handles = []
+    try:
+        if workers == 1 or len(shards) == 1:
+            _SHARED.update(tfidf=tfidf, presence=presence, opposed=opposed)
+            results = [score_shard(start, stop, owners, top_k, min_similarity, cross_corpus_only)
+                       for start, stop in shards]
+        else:
+            specs = {}
+            for key, array in (('tfidf', tfidf), ('presence', presence), ('opposed', opposed)):
+                shm, specs[key] = _to_shared(array)
+                handles.append(shm)
+            with ProcessPoolExecutor(max_workers=min(workers, len(shards)), initializer=_attach,
+                                     initargs=(specs,)) as pool:
+                futures = [pool.submit(score_shard, start, stop, owners, top_k, min_similarity, cross_corpus_only)
+                           for start, stop in shards]
+                results = [future.result() for future in futures]
+    finally:
+        _SHARED.clear()
+        for shm in handles:
+            shm.close()
+            shm.unlink()
+
+    pairs = opposition_columns(vocabulary)
+    edges = []
+    for i, j, kind, weight in (edge for shard in results for edge in shard):
+        terms = shared_terms(tfidf, vocabulary, i, j) if kind == 'concept_overlap' else \
+            opposing_terms(presence, vocabulary, pairs, i, j)
+        edges.append({'source': ids[i], 'target': ids[j], 'type': kind, 'weight': weight, 'terms': terms})
+    return edges
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concept overlap and conflict analysis across corpora")
+    parser.add_argument('--level', choices=['chapter', 'corpus'], default='chapter')
+    parser.add_argument('--corpora', help="Comma separated corpus ids (default: all)")
+    parser.add_argument('--workers', type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument('--shard-size', type=int, default=512, help="Rows scored per task")
+    parser.add_argument('--top-k', type=int, default=10, help="Overlap and conflict edges kept per node (0 = all)")
+    parser.add_argument('--min-similarity', type=float, default=0.2)
+    parser.add_argument('--max-features', type=int, default=4096)
+    parser.add_argument('--cross-corpus-only', action='store_true')
+    parser.add_argument('--output', default=None,
+                        help="Write edges as JSON to this file (the graph loads chapter-level edges only)")
+    parser.add_argument('--into-graph', action='store_true',
+                        help="Also add the edges to the shared knowledge graph and report how many were added")
+    args = parser.parse_args(argv)
+    if args.into_graph and args.level == 'corpus':
+        # The graph has chapter nodes but no node per corpus
+        parser.error("--into-graph needs --level chapter")
+
+    registry = CorpusRegistry()
+    edges = analyze(registry, args.level, args.corpora.split(',') if args.corpora else None,
+                    args.workers, args.shard_size, args.top_k, args.min_similarity,
+                    args.cross_corpus_only, args.max_features)
+    overlaps = [edge for edge in edges if edge['type'] == 'concept_overlap']
+    conflicts = [edge for edge in edges if edge['type'] == 'concept_conflict']
+    print(f"{len(overlaps)} overlap edges, {len(conflicts)} conflict edges")
+    for edge in sorted(overlaps, key=lambda e: -e['weight'])[:10]:
+        print(f"  {edge['source']} ~ {edge['target']} {edge['weight']:.3f} ({', '.join(edge['terms'])})")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(edges, f, indent=2)
+        print(f"Saved edges to {args.output}")
+    if args.into_graph:
+        for corpus_id in args.corpora.split(',') if args.corpora else registry.ids():
+            registry.ensure_graph(corpus_id)
+        added = add_concept_edges(registry.graph, edges)
+        # ensure_graph may already have loaded them from data/concept_edges.json
+        on_graph = sum(1 for _, _, kind in registry.graph.edges(data='type') if kind in CONCEPT_EDGE_TYPES)
+        print(f"{on_graph} concept edges on the knowledge graph ({added} added by this run, "
+              f"{registry.graph.number_of_edges()} edges in total)")
+
+
+if __name__ == "__main__":
+    main()
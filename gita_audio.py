@@ -0,0 +1,210 @@
+"""Shared background text-to-speech for the graphGita apps.
+
+Verse audio is synthesized by a small pool of worker threads fed from a bounded priority
+queue, so pressing an audio button never blocks a script run on gTTS. One AudioService is
+shared by every session of the process:
+
+    service = AudioService()
+    job = service.request(text, 'hi')     # None when the queue is full
+    job.done()                            # poll; job.audio / job.error once it is
+    service.cached(text, 'hi')            # the clip's bytes while it stays cached
+
+Identical (text, lang) requests are deduplicated while in flight (singleflight), and
+finished clips are kept in an LRU cache, so a verse is synthesized once however many
+users press its button.
+
+prefetch() queues clips a user is likely to play next on a separate low-priority queue.
+Its own worker waits while any on-demand request is queued, and a token bucket caps
+prefetch synthesis per minute. Pressing the button of a clip that is still waiting
+in the prefetch queue moves it to the on-demand queue.
+"""
+import hashlib
+import itertools
+import queue
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from gita_metrics import timed
+
+WORKERS = 4
+MAX_QUEUE = 64
+CACHE_SIZE = 512
+PREFETCH_WORKERS = 1
+PREFETCH_QUEUE = 32
+PREFETCH_PER_MINUTE = 60
+# Lower values are served first
+ON_DEMAND = 0
+PREFETCH = 1
+
+AudioKey = Tuple[str, str]
+
+
+def audio_key(text: str, lang: str) -> AudioKey:
+    return lang, hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+@timed('generate_audio')
+def synthesize(text: str, lang: str = 'hi') -> bytes:
+    """MP3 bytes for `text`; English is read with an Indian accent"""
+    from gtts import gTTS
+
+    if lang == 'en':
+        lang = 'en-IN'
+    audio_bytes = BytesIO()
+    gTTS(text=text, lang=lang).write_to_fp(audio_bytes)
+    return audio_bytes.getvalue()
+
+
+class Job:
+    """One synthesis request; shared by every session that asked for the same clip."""
+
+    def __init__(self, key: AudioKey, text: str, lang: str, priority: int):
+        self.key = key
+        self.text = text
+        self.lang = lang
+        self.priority = priority
+        self.audio: Optional[bytes] = None
+        self.error: Optional[str] = None
+        self.claimed = False
+        self._done = threading.Event()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+
+class AudioService:
+    def __init__(self, workers: int = WORKERS, max_queue: int = MAX_QUEUE, cache_size: int = CACHE_SIZE,
+                 synthesize: Callable[[str, str], bytes] = synthesize, prefetch_workers: int = PREFETCH_WORKERS,
+                 prefetch_queue: int = PREFETCH_QUEUE, prefetch_per_minute: int = PREFETCH_PER_MINUTE):
+        self.cache_size = cache_size
+        self.prefetch_per_minute = prefetch_per_minute
+        self._synthesize = synthesize
+        self._queue: queue.PriorityQueue = queue.PriorityQueue(maxsize=max_queue)
+        self._prefetch_queue: queue.Queue = queue.Queue(maxsize=prefetch_queue)
+        self._tokens = float(prefetch_per_minute)
+        self._refilled = time.monotonic()
+        self._order = itertools.count()
+        self._in_flight: Dict[AudioKey, Job] = {}
+        self._cache: 'OrderedDict[AudioKey, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'cache_hits': 0, 'deduplicated': 0, 'rejected': 0,
+                      'synthesized': 0, 'failed': 0, 'prefetched': 0, 'prefetch_skipped': 0, 'promoted': 0}
+        for index in range(workers):
+            threading.Thread(target=self._work, args=(self._queue,),
+                             name=f'graphgita-audio-{index}', daemon=True).start()
+        for index in range(prefetch_workers):
+            threading.Thread(target=self._work, args=(self._prefetch_queue,),
+                             name=f'graphgita-audio-prefetch-{index}', daemon=True).start()
+
+    def request(self, text: str, lang: str = 'hi', priority: int = ON_DEMAND) -> Optional[Job]:
+        """The job for (text, lang): cached, already in flight, or newly queued; None if the queue is full."""
+        key = audio_key(text, lang)
+        with self._lock:
+            self.stats['requests'] += 1
+            job = self._cache.get(key)
+            if job:
+                self._cache.move_to_end(key)
+                self.stats['cache_hits'] += 1
+                return job
+            job = self._in_flight.get(key)
+            if job:
+                self.stats['deduplicated'] += 1
+                if job.priority > priority and not job.claimed:
+                    self._promote(job, priority)
+                return job
+            job = Job(key, text, lang, priority)
+            try:
+                self._queue.put_nowait((priority, next(self._order), job))
+            except queue.Full:
+                self.stats['rejected'] += 1
+                return None
+            self._in_flight[key] = job
+            return job
+
+    def prefetch(self, clips: Iterable[Tuple[str, str]], limit: int) -> int:
+        """Queue the first `limit` (text, lang) clips at low priority, within the prefetch budget.
+
+        Returns how many were queued; clips already cached or in flight are skipped."""
+        queued = 0
+        with self._lock:
+            for text, lang in itertools.islice(clips, limit):
+                key = audio_key(text, lang)
+                if key in self._cache or key in self._in_flight:
+                    continue
+                if not self._take_token():
+                    self.stats['prefetch_skipped'] += 1
+                    break
+                job = Job(key, text, lang, PREFETCH)
+                try:
+                    self._prefetch_queue.put_nowait((PREFETCH, next(self._order), job))
+                except queue.Full:
+                    self.stats['prefetch_skipped'] += 1
+                    break
+                self._in_flight[key] = job
+                self.stats['prefetched'] += 1
+                queued += 1
+        return queued
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def cached(self, text: str, lang: str = 'hi') -> Optional[bytes]:
+        """MP3 bytes of a finished clip still in the cache, else None; not counted as a request."""
+        key = audio_key(text, lang)
+        with self._lock:
+            job = self._cache.get(key)
+            if job is None:
+                return None
+            self._cache.move_to_end(key)
+            return job.audio
+
+    def _promote(self, job: Job, priority: int) -> None:
+        """Also queue a waiting prefetch job on the on-demand queue; whichever worker claims it first runs it."""
+        try:
+            self._queue.put_nowait((priority, next(self._order), job))
+        except queue.Full:
+            return
+        job.priority = priority
+        self.stats['promoted'] += 1
+
+    def _take_token(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.prefetch_per_minute,
+                           self._tokens + (now - self._refilled) * self.prefetch_per_minute / 60)
+        self._refilled = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _work(self, jobs: queue.Queue) -> None:
+        while True:
+            priority, _, job = jobs.get()
+            # Prefetch never competes with on-demand requests for the synthesis service
+            while priority == PREFETCH and not self._queue.empty():
+                time.sleep(0.05)
+            with self._lock:
+                if job.claimed:
+                    continue
+                job.claimed = True
+            try:
+                job.audio = self._synthesize(job.text, job.lang)
+            except Exception as e:
+                job.error = str(e)
+            with self._lock:
+                self._in_flight.pop(job.key, None)
+                if job.error is None:
+                    self.stats['synthesized'] += 1
+                    self._cache[job.key] = job
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+                else:
+                    # Failures are not cached, so the next press retries
+                    self.stats['failed'] += 1
+            job._done.set()
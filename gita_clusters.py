@@ -0,0 +1,212 @@
+"""Level-of-detail views of a corpus knowledge graph.
+
+ClusterTree.build(corpus) groups a corpus once into a hierarchy:
+
+    corpus -> chapters -> keyword communities -> verses
+           -> life problems -> problems
+
+Keyword communities are Louvain communities of a chapter's verses, linked by the keywords
+they share. No cluster has more than FANOUT children; longer lists (chapters of a large
+corpus, verses of a large community) are split into range clusters, so every level stays
+small however large the corpus is.
+
+lod_graph(tree, expanded) then returns what a graph component should draw: the top-level
+clusters, with the clusters in `expanded` opened (most recent first) while the payload
+stays within NODE_BUDGET nodes. Problem references between hidden nodes are aggregated
+onto their visible clusters as counted edges:
+
+    tree = ClusterTree.build(registry.get('bhagavad_gita'))
+    nodes, edges, opened = lod_graph(tree, ['Chapter_2', 'Chapter_2/1'])
+"""
+import itertools
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+FANOUT = 20
+NODE_BUDGET = 60
+# Chapters with more verses than this are split into keyword communities
+COMMUNITY_MIN_VERSES = 12
+ROOT = ''
+PROBLEMS = 'Problems'
+
+
+def keyword_communities(shlokas: List[Dict], seed: int = 0) -> List[List[int]]:
+    """Indexes of `shlokas` grouped into communities of verses sharing keywords, in verse order."""
+    import networkx as nx
+
+    K = nx.Graph()
+    K.add_nodes_from(range(len(shlokas)))
+    by_keyword: Dict[str, List[int]] = {}
+    for index, shloka in enumerate(shlokas):
+        for keyword in {keyword.lower() for keyword in shloka.get('keywords', [])}:
+            by_keyword.setdefault(keyword, []).append(index)
+    for members in by_keyword.values():
+        # A keyword in most of the chapter's verses does not separate anything
+        if len(members) > len(shlokas) // 2:
+            continue
+        for a, b in itertools.combinations(members, 2):
+            K.add_edge(a, b, weight=K.get_edge_data(a, b, {'weight': 0})['weight'] + 1)
+
+    communities = nx.community.louvain_communities(K, weight='weight', seed=seed)
+    groups = [sorted(community) for community in communities if len(community) > 1]
+    unlinked = sorted(index for community in communities if len(community) == 1 for index in community)
+    if unlinked:
+        groups.append(unlinked)
+    return sorted(groups, key=lambda group: group[0])
+
+
+class ClusterTree:
+    """Cluster hierarchy of one corpus, as parent/children links and display attributes by node id.
+
+    Leaf ids are the corpus graph's local ids (Shloka_2_47, Problem_anger); a chapter
+    cluster has its chapter's id (Chapter_2)."""
+
+    def __init__(self, corpus_id: str):
+        self.corpus_id = corpus_id
+        self.children: Dict[str, List[str]] = {}
+        self.parent: Dict[str, str] = {}
+        self.labels: Dict[str, str] = {}
+        self.types: Dict[str, str] = {}
+        self.leaves: Dict[str, int] = {}
+        # Problem references between leaves or chapters, with their multiplicity
+        self.edges: Counter = Counter()
+
+    def is_cluster(self, node: str) -> bool:
+        return bool(self.children.get(node))
+
+    def within(self, node: str, cluster: str) -> bool:
+        """Whether `node` is `cluster` or lies inside it."""
+        while node != cluster:
+            if node not in self.parent:
+                return False
+            node = self.parent[node]
+        return True
+
+    def node(self, node: str, label: str, node_type: str) -> str:
+        self.labels[node] = label
+        self.types[node] = node_type
+        return node
+
+    def attach(self, parent: str, nodes: List[str]) -> None:
+        """Make `nodes` the children of `parent`, through range clusters when there are more than FANOUT."""
+        while len(nodes) > FANOUT:
+            groups = []
+            for start in range(0, len(nodes), FANOUT):
+                members = nodes[start:start + FANOUT]
+                first, last = (self.labels[member].split(':')[0] for member in (members[0], members[-1]))
+                group = self.node(f"{parent or self.corpus_id}/{members[0]}..{members[-1]}",
+                                  f"{first} – {last}", 'event')
+                self._link(group, members)
+                groups.append(group)
+            nodes = groups
+        self._link(parent, nodes)
+
+    def _link(self, parent: str, nodes: List[str]) -> None:
+        self.children[parent] = nodes
+        for node in nodes:
+            self.parent[node] = parent
+
+    def _count_leaves(self, node: str) -> int:
+        self.leaves[node] = sum(self._count_leaves(child) for child in self.children.get(node, [])) or 1
+        return self.leaves[node]
+
+    @classmethod
+    def build(cls, corpus, seed: int = 0) -> 'ClusterTree':
+        """Cluster one loaded gita_corpus.Corpus."""
+        tree = cls(corpus.id)
+        chapters = []
+        for chapter in corpus.data.get('chapters', []):
+            number = chapter['number']
+            chapter_id = tree.node(f"Chapter_{number}", f"Chapter {number}: {chapter.get('name', '')}", 'chapter')
+            shlokas = chapter.get('shlokas', [])
+            verses = [tree.node(f"Shloka_{number}_{shloka['shloka_number']}",
+                                f"Shloka {number}.{shloka['shloka_number']}", 'shloka') for shloka in shlokas]
+            groups = keyword_communities(shlokas, seed) if len(shlokas) > COMMUNITY_MIN_VERSES else []
+            if len(groups) > 1:
+                communities = []
+                for index, group in enumerate(groups):
+                    keywords = Counter(keyword.title() for member in group for keyword in shlokas[member].get('keywords', []))
+                    label = ' · '.join(keyword for keyword, _ in keywords.most_common(2)) or 'Other verses'
+                    community = tree.node(f"{chapter_id}/{index}", label, 'theme')
+                    tree.attach(community, [verses[member] for member in group])
+                    communities.append(community)
+                tree.attach(chapter_id, communities)
+            elif verses:
+                tree.attach(chapter_id, verses)
+            chapters.append(chapter_id)
+
+        problems = []
+        for problem, details in corpus.data.get('problem_solutions_map', {}).items():
+            problem_id = tree.node(f"Problem_{problem}", problem.replace('_', ' ').title(), 'problem')
+            problems.append(problem_id)
+            for ref in details.get('references', []):
+                # One edge per reference: to the verse, or to its chapter when the verse is missing
+                verse, chapter = f"Shloka_{ref['chapter']}_{ref['shloka']}", f"Chapter_{ref['chapter']}"
+                target = verse if verse in tree.labels else chapter
+                if target in tree.labels:
+                    tree.edges[(problem_id, target)] += 1
+
+        if problems:
+            tree.node(PROBLEMS, "Life problems", 'problem')
+            tree.attach(PROBLEMS, problems)
+        tree.attach(ROOT, chapters)
+        if problems:
+            tree.children[ROOT].append(PROBLEMS)
+            tree.parent[PROBLEMS] = ROOT
+        tree._count_leaves(ROOT)
+        return tree
+
+
+def lod_graph(tree: ClusterTree, expanded: List[str],
+              budget: int = NODE_BUDGET) -> Tuple[List[Dict], List[Tuple[str, str, int]], List[str]]:
+    """Visible nodes and edges with the clusters in `expanded` (oldest first) opened.
+
+    Opening a cluster keeps it as a hub linked to its children and opens its closed
+    ancestors too. The most recent expansions win when they do not all fit in `budget`.
+    Returns (nodes, edges, opened): nodes as dicts with id, label, type, leaves and
+    expanded; edges as (source, target, count), count 0 for hub-to-child links; opened
+    lists the clusters of `expanded` that are open, oldest first."""
+    opened = {ROOT}
+    size = len(tree.children.get(ROOT, []))
+    for cluster in reversed(expanded):
+        chain, node = [], cluster
+        while node not in opened and tree.is_cluster(node) and node in tree.parent:
+            chain.append(node)
+            node = tree.parent[node]
+        if node not in opened or not chain:
+            continue
+        cost = sum(len(tree.children[member]) for member in chain)
+        if size + cost <= budget:
+            opened.update(chain)
+            size += cost
+
+    nodes, edges, visible = [], [], set()
+    stack = list(reversed(tree.children.get(ROOT, [])))
+    while stack:
+        node = stack.pop()
+        visible.add(node)
+        is_open = node in opened
+        label = tree.labels[node]
+        if tree.is_cluster(node):
+            label = f"{'▾ ' if is_open else ''}{label} ({tree.leaves[node]})"
+        nodes.append({'id': node, 'label': label, 'type': tree.types[node],
+                      'leaves': tree.leaves[node], 'expanded': is_open})
+        if is_open:
+            edges += [(node, child, 0) for child in tree.children[node]]
+            stack.extend(reversed(tree.children[node]))
+
+    def representative(node: str) -> Optional[str]:
+        """The node itself when visible, else its nearest visible (closed) ancestor."""
+        while node not in visible:
+            if node not in tree.parent:
+                return None
+            node = tree.parent[node]
+        return node
+
+    aggregated: Counter = Counter()
+    for (source, target), count in tree.edges.items():
+        a, b = representative(source), representative(target)
+        if a and b and a != b and not (a in opened and tree.parent.get(b) == a):
+            aggregated[(a, b)] += count
+    edges += [(a, b, count) for (a, b), count in aggregated.items()]
+    return nodes, edges, [cluster for cluster in expanded if cluster in opened]
@@ -0,0 +1,241 @@
+"""Corpus registry shared by the graphGita apps.
+
+Registers the corpora listed in data/corpora.json (plus any other `*_complete.json` file
+under data/), normalizes and indexes each one only when it is first requested, and adds it to one shared knowledge graph whose node ids
+are namespaced by corpus ("bhagavad_gita:Chapter_2", "ashtavakra_gita:Shloka_1_3").
+Concept overlap and conflict edges written by gita_analytics.py to data/concept_edges.json
+are added to the graph as the corpora they connect are graphed.
+"""
+import glob
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from gita_ingest import load_corpus_file
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+DATA_DIR = os.environ.get('GRAPHGITA_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+CORPUS_SUFFIX = '_complete.json'
+MANIFEST = 'corpora.json'
+CONCEPT_EDGES = 'concept_edges.json'
+DEFAULT_CORPUS = 'bhagavad_gita'
+
+
+def node_id(corpus_id: str, local_id: str) -> str:
+    """Namespace a graph node id ("Chapter_2") with its corpus."""
+    return f"{corpus_id}:{local_id}"
+
+
+def local_node_id(namespaced_id: str) -> str:
+    """Strip the corpus namespace from a graph node id."""
+    return namespaced_id.split(':', 1)[-1]
+
+
+def display_node_id(namespaced_id: str, corpus_id: str) -> str:
+    """Local id for nodes of `corpus_id`; nodes of other corpora (linked by concept edges) keep their namespace."""
+    prefix = f"{corpus_id}:"
+    return namespaced_id[len(prefix):] if namespaced_id.startswith(prefix) else namespaced_id
+
+
+class Corpus:
+    """One corpus file; its JSON is parsed, normalized and indexed on first access."""
+
+    def __init__(self, corpus_id: str, path: str, title: Optional[str] = None, spec: Optional[Dict] = None):
+        self.id = corpus_id
+        self.path = path
+        self.title = title or corpus_id.replace('_', ' ').title()
+        self.spec = spec or {}
+        # Corpora sharing a work are editions of the same text (see gita_align.py)
+        self.work = self.spec.get('work', corpus_id)
+        self.report = None
+        # Changes whenever the corpus file does; part of the key of anything rendered from it
+        self.version = None
+        self._data = None
+        self.chapters: Dict[int, Dict] = {}
+        self.shlokas: Dict[Tuple[int, int], Dict] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    @property
+    def data(self) -> Dict:
+        if self._data is None:
+            self.load()
+        return self._data
+
+    def load(self) -> Dict:
+        """Parse the corpus file into the canonical model and build its lookup indexes."""
+        stat = os.stat(self.path)
+        data, self.report = load_corpus_file(self.path, self.spec, self.id)
+        self.version = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+        if self.report.errors:
+            print(f"Corpus {self.id} loaded with {len(self.report.errors)} validation errors")
+        self.chapters = {chapter['number']: chapter for chapter in data.get('chapters', [])}
+        self.shlokas = {
+            (chapter['number'], shloka['shloka_number']): shloka
+            for chapter in data.get('chapters', [])
+            for shloka in chapter.get('shlokas', [])
+        }
+        self._data = data
+        return data
+
+    def get_chapter(self, number: int) -> Optional[Dict]:
+        if not self.loaded:
+            self.load()
+        return self.chapters.get(number)
+
+    def get_shloka(self, chapter: int, shloka: int) -> Optional[Dict]:
+        if not self.loaded:
+            self.load()
+        return self.shlokas.get((chapter, shloka))
+
+
+class CorpusRegistry:
+    """Discovers corpora by file name and loads, indexes and graphs them on demand.
+
+    Discovery only lists file names, so start-up cost does not depend on how many or how
+    large the corpora are; each corpus is parsed once, the first time a view asks for it."""
+
+    def __init__(self, data_dir: str = DATA_DIR):
+        self.data_dir = data_dir
+        self.corpora: Dict[str, Corpus] = {}
+        self._graph = None
+        self.lock = threading.RLock()
+        self._graphed = set()
+        self._concept_edges = None
+        self.discover()
+
+    def discover(self) -> List[str]:
+        """Register the corpora in data/corpora.json and any other `<corpus_id>_complete.json` file."""
+        manifest_path = os.path.join(self.data_dir, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            for corpus_id, spec in manifest.items():
+                if corpus_id not in self.corpora:
+                    path = os.path.join(self.data_dir, spec.get('file', f'{corpus_id}{CORPUS_SUFFIX}'))
+                    self.corpora[corpus_id] = Corpus(corpus_id, path, spec.get('title'), spec)
+        for path in sorted(glob.glob(os.path.join(self.data_dir, f'*{CORPUS_SUFFIX}'))):
+            corpus_id = os.path.basename(path)[:-len(CORPUS_SUFFIX)]
+            if corpus_id not in self.corpora:
+                self.corpora[corpus_id] = Corpus(corpus_id, path)
+        return self.ids()
+
+    def title(self, corpus_id: str) -> str:
+        return self.corpora[corpus_id].title
+
+    def ids(self) -> List[str]:
+        return sorted(self.corpora, key=lambda corpus_id: (corpus_id != DEFAULT_CORPUS, corpus_id))
+
+    def get(self, corpus_id: str = DEFAULT_CORPUS) -> Corpus:
+        """Return a loaded corpus, parsing it on first use."""
+        corpus = self.corpora[corpus_id]
+        if not corpus.loaded:
+            with self.lock:
+                if not corpus.loaded:
+                    corpus.load()
+        return corpus
+
+    def preload(self, corpus_ids: Optional[List[str]] = None, graph: bool = True) -> List[str]:
+        """Load (and graph) corpora now instead of on first request.
+
+        Used by servers that build everything once in a parent process and then fork
+        workers, which share the loaded data copy-on-write (see gita_serve.py)."""
+        corpus_ids = corpus_ids or self.ids()
+        for corpus_id in corpus_ids:
+            self.get(corpus_id)
+            if graph:
+                self.ensure_graph(corpus_id)
+        return corpus_ids
+
+    @property
+    def graph(self) -> 'nx.Graph':
+        """The shared knowledge graph; networkx is only imported once a view needs it."""
+        if self._graph is None:
+            with self.lock:
+                if self._graph is None:
+                    import networkx as nx
+                    self._graph = nx.Graph()
+        return self._graph
+
+    def ensure_graph(self, corpus_id: str = DEFAULT_CORPUS) -> 'nx.Graph':
+        """Add a corpus to the shared graph (once) and return the graph."""
+        if corpus_id in self._graphed:
+            return self.graph
+        corpus = self.get(corpus_id)
+        with self.lock:
+            if corpus_id not in self._graphed:
+                add_corpus_to_graph(self.graph, corpus)
+                # Edges to corpora graphed later are added when those are
+                add_concept_edges(self.graph, self.concept_edges())
+                self._graphed.add(corpus_id)
+        return self.graph
+
+    def concept_edges(self) -> List[Dict]:
+        """Edges from data/concept_edges.json (see gita_analytics.py), or none if it was not generated."""
+        if self._concept_edges is None:
+            path = os.path.join(self.data_dir, CONCEPT_EDGES)
+            self._concept_edges = []
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._concept_edges = json.load(f)
+        return self._concept_edges
+
+
+def add_corpus_to_graph(G: 'nx.Graph', corpus: Corpus) -> None:
+    """Add problem, chapter and shloka nodes of one corpus under its namespace.
+
+    Nodes carry only identifying attributes; verse text stays in the corpus indexes."""
+    data = corpus.data
+    cid = corpus.id
+
+    # Add problem nodes first
+    for problem, details in data.get('problem_solutions_map', {}).items():
+        problem_id = node_id(cid, f"Problem_{problem}")
+        G.add_node(problem_id,
+                   type='problem',
+                   corpus=cid,
+                   name=problem,
+                   description=details['description'])
+
+        # Add references as edges to both chapter and shloka
+        for ref in details['references']:
+            G.add_edge(problem_id, node_id(cid, f"Chapter_{ref['chapter']}"))
+            G.add_edge(problem_id, node_id(cid, f"Shloka_{ref['chapter']}_{ref['shloka']}"))
+
+    # Add chapter and shloka nodes
+    for chapter in data.get('chapters', []):
+        chapter_id = node_id(cid, f"Chapter_{chapter['number']}")
+        G.add_node(chapter_id,
+                   type='chapter',
+                   corpus=cid,
+                   name=chapter.get('name', ''),
+                   number=chapter.get('number', 0),
+                   main_theme=chapter.get('main_theme', ''))
+
+        for shloka in chapter.get('shlokas', []):
+            shloka_id = node_id(cid, f"Shloka_{chapter['number']}_{shloka['shloka_number']}")
+            G.add_node(shloka_id,
+                       type='shloka',
+                       corpus=cid,
+                       chapter=chapter['number'],
+                       number=shloka['shloka_number'])
+            G.add_edge(chapter_id, shloka_id)
+
+
+def add_concept_edges(G: 'nx.Graph', edges: List[Dict]) -> int:
+    """Add gita_analytics edges between nodes already in `G` as typed, weighted edges.
+
+    Edges to nodes that are not in the graph (yet), and node pairs the corpora already
+    link, are skipped. Returns the number of edges added."""
+    added = 0
+    for edge in edges:
+        source, target = edge['source'], edge['target']
+        if source in G and target in G and not G.has_edge(source, target):
+            G.add_edge(source, target, type=edge['type'], weight=edge['weight'], terms=edge.get('terms', []))
+            added += 1
+    return added
@@ -0,0 +1,265 @@
+"""Static-site export of the graphGita views.
+
+Pre-renders every corpus, chapter, verse, problem and theme page to HTML, and every
+chapter and problem ego graph to JSON (the same payloads as api/index.py), so the site
+can be served from a CDN without running Python:
+
+    python gita_export.py --out site
+    python gita_export.py --out site --corpora bhagavad_gita --force
+
+Exports are incremental. Each page is keyed by a hash of the records it is rendered from
+(graph pages by a hash of their payload) plus EXPORT_VERSION, and the hashes are kept in
+<out>/export-manifest.json. A re-export only renders and writes pages whose inputs changed,
+and it deletes pages that no longer exist.
+Exporting some corpora (--corpora) leaves the pages of the others, and their manifest
+entries, as they are; the home page lists every corpus in the merged manifest.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+
+from api import index as api
+
+EXPORT_VERSION = 1
+MANIFEST_NAME = 'export-manifest.json'
+
+STYLE = """
+body { font-family: system-ui, sans-serif; max-width: 960px; margin: 0 auto; padding: 1rem 2rem; color: #2c3e50; }
+nav a { margin-right: 1rem; } a { color: #6e48aa; }
+.sanskrit { white-space: pre-wrap; font-size: 1.2rem; background: #f8f9fa; padding: 1rem; border-radius: 8px; }
+ul.verses { columns: 4; } .muted { color: #666; }
+"""
+
+
+def slug(text: str) -> str:
+    """File-name-safe slug with a short hash so distinct themes never collide."""
+    base = re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')[:60]
+    return f"{base}-{hashlib.sha1(text.encode('utf-8')).hexdigest()[:6]}"
+
+
+def fingerprint(*parts) -> str:
+    payload = json.dumps([EXPORT_VERSION, *parts], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def e(value) -> str:
+    return html.escape(str(value))
+
+
+def page(title: str, body: str, depth: int, corpus_id: str = '') -> str:
+    root = '../' * depth
+    links = f'<a href="{root}index.html">All texts</a>'
+    if corpus_id:
+        links += (f'<a href="{root}{corpus_id}/index.html">Chapters</a>'
+                  f'<a href="{root}{corpus_id}/problems/index.html">Life challenges</a>'
+                  f'<a href="{root}{corpus_id}/themes/index.html">Themes</a>')
+    return (f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+            f'<meta name="viewport" content="width=device-width, initial-scale=1">'
+            f'<title>{e(title)}</title><style>{STYLE}</style></head>'
+            f'<body><nav>{links}</nav><h1>{e(title)}</h1>{body}</body></html>')
+
+
+def verse_section(shloka: Dict) -> str:
+    parts = [f'<div class="sanskrit">{e(shloka["sanskrit_text"])}</div>']
+    for label, field in (('Transliteration', 'transliteration'), ('Meaning', 'meaning'),
+                         ('Interpretation', 'interpretation'), ('Life Application', 'life_application'),
+                         ('Reflection', 'reflection')):
+        if shloka[field]:
+            parts.append(f'<h3>{label}</h3><p>{e(shloka[field])}</p>')
+    if shloka['keywords']:
+        parts.append(f'<p class="muted">Keywords: {e(", ".join(shloka["keywords"]))}</p>')
+    return ''.join(parts)
+
+
+def verse_link(corpus_id: str, chapter: int, shloka: int, depth: int) -> str:
+    return f'{"../" * depth}{corpus_id}/verses/{chapter}/{shloka}.html'
+
+
+def render_home(titles: List[Tuple[str, str]]) -> str:
+    items = ''.join(f'<li><a href="{corpus_id}/index.html">{e(title)}</a></li>' for corpus_id, title in titles)
+    return page('graphGita', f'<ul>{items}</ul>', 0)
+
+
+def render_corpus(corpus_id: str, title: str, overview: List[Tuple]) -> str:
+    items = ''.join(f'<li value="{number}"><a href="chapters/{number}.html">{e(name)}</a> '
+                    f'<span class="muted">{e(theme)}</span></li>' for number, name, theme in overview)
+    return page(title, f'<ol>{items}</ol>', 1, corpus_id)
+
+
+def render_chapter(corpus_id: str, title: str, chapter: Dict) -> str:
+    number = chapter['number']
+    body = f"<p>{e(chapter['summary'])}</p>"
+    if chapter['main_theme']:
+        body += f"<h2>Main Theme</h2><p><em>{e(chapter['main_theme'])}</em></p>"
+    if chapter['philosophical_aspects']:
+        body += '<h2>Philosophical Aspects</h2><ul>'
+        body += ''.join(f'<li>{e(aspect)}</li>' for aspect in chapter['philosophical_aspects']) + '</ul>'
+    body += '<h2>Shlokas</h2><ul class="verses">' + ''.join(
+        f'<li><a href="{verse_link(corpus_id, number, s["shloka_number"], 2)}">Shloka {s["shloka_number"]}</a></li>'
+        for s in chapter['shlokas']) + '</ul>'
+    body += f'<p class="muted"><a href="../graph/Chapter_{number}.json">Graph data (JSON)</a></p>'
+    return page(f"{title} – Chapter {number}: {chapter['name']}", body, 2, corpus_id)
+
+
+def render_verse(corpus_id: str, title: str, chapter: int, shloka: Dict) -> str:
+    body = verse_section(shloka) + f'<p><a href="../../chapters/{chapter}.html">Back to chapter {chapter}</a></p>'
+    return page(f"{title} – Chapter {chapter}, Shloka {shloka['shloka_number']}", body, 3, corpus_id)
+
+
+def render_problems(corpus_id: str, title: str, problems: Dict) -> str:
+    if not problems:
+        return page(f"{title} – Life Challenges", '<p>No life challenges are mapped for this text yet.</p>', 2, corpus_id)
+    items = ''.join(f'<li><a href="{slug(problem)}.html">{e(problem.replace("_", " ").title())}</a> '
+                    f'<span class="muted">{e(details["description"])}</span></li>'
+                    for problem, details in problems.items())
+    return page(f"{title} – Life Challenges", f'<ul>{items}</ul>', 2, corpus_id)
+
+
+def render_problem(corpus_id: str, title: str, problem: str, details: Dict, verses: List[Tuple]) -> str:
+    body = f"<p>{e(details['description'])}</p>"
+    for ref, shloka in verses:
+        if shloka:
+            body += (f'<h2><a href="{verse_link(corpus_id, ref["chapter"], ref["shloka"], 2)}">'
+                     f'Chapter {ref["chapter"]}, Shloka {ref["shloka"]}</a></h2>' + verse_section(shloka))
+    body += f'<p class="muted"><a href="../graph/Problem_{slug(problem)}.json">Graph data (JSON)</a></p>'
+    return page(f"{title} – {problem.replace('_', ' ').title()}", body, 2, corpus_id)
+
+
+def render_themes(corpus_id: str, title: str, themes: List[Dict]) -> str:
+    items = ''.join(f'<li><a href="{slug(theme["theme"])}.html">{e(theme["theme"])}</a> '
+                    f'<span class="muted">({theme["shlokas"]} shlokas)</span></li>' for theme in themes)
+    return page(f"{title} – Philosophical Themes", f'<ul>{items}</ul>', 2, corpus_id)
+
+
+def render_theme(corpus_id: str, title: str, theme: str, overview: List[Tuple]) -> str:
+    body = ''.join(f'<h2><a href="../chapters/{number}.html">Chapter {number}: {e(name)}</a></h2><p>{e(summary)}</p>'
+                   for number, name, summary in overview)
+    return page(f"{title} – {theme}", body, 2, corpus_id)
+
+
+def render_graph(corpus_id: str, local_id: str) -> str:
+    return json.dumps(api.get_graph({}, corpus_id, local_id), ensure_ascii=False)
+
+
+def graph_page(corpus_id: str, local_id: str) -> Tuple[str, Callable[[], str]]:
+    """Graph pages are fingerprinted by their payload, since the shared graph also holds
+    edges from outside the corpus record (concept edges, see gita_corpus.py)."""
+    payload = render_graph(corpus_id, local_id)
+    return fingerprint(payload), lambda: payload
+
+
+def corpus_of(relative_path: str) -> str:
+    """Corpus id an output path belongs to ('' for the home page)."""
+    return relative_path.split('/', 1)[0] if '/' in relative_path else ''
+
+
+def plan_pages(registry, corpus_ids: List[str],
+               listed: List[str] = None) -> Dict[str, Tuple[str, Callable[[], str]]]:
+    """Every output path with the fingerprint of its inputs and a function that renders it.
+
+    The home page links to `listed` (default: `corpus_ids`)."""
+    titles = [(corpus_id, registry.title(corpus_id) if corpus_id in registry.corpora else corpus_id)
+              for corpus_id in listed or corpus_ids]
+    pages = {'index.html': (fingerprint(titles), partial(render_home, titles))}
+
+    for corpus_id in corpus_ids:
+        corpus = registry.get(corpus_id)
+        title = corpus.title
+        chapters = corpus.data['chapters']
+        problems = corpus.data['problem_solutions_map']
+
+        overview = [(c['number'], c['name'], c['main_theme']) for c in chapters]
+        pages[f'{corpus_id}/index.html'] = (fingerprint(title, overview),
+                                            partial(render_corpus, corpus_id, title, overview))
+
+        for chapter in chapters:
+            number = chapter['number']
+            pages[f'{corpus_id}/chapters/{number}.html'] = (fingerprint(title, chapter),
+                                                             partial(render_chapter, corpus_id, title, chapter))
+            pages[f'{corpus_id}/graph/Chapter_{number}.json'] = graph_page(corpus_id, f'Chapter_{number}')
+            for shloka in chapter['shlokas']:
+                pages[f'{corpus_id}/verses/{number}/{shloka["shloka_number"]}.html'] = (
+                    fingerprint(title, number, shloka), partial(render_verse, corpus_id, title, number, shloka))
+
+        pages[f'{corpus_id}/problems/index.html'] = (fingerprint(title, problems),
+                                                     partial(render_problems, corpus_id, title, problems))
+        for problem, details in problems.items():
+            verses = [(ref, corpus.get_shloka(ref['chapter'], ref['shloka'])) for ref in details['references']]
+            pages[f'{corpus_id}/problems/{slug(problem)}.html'] = (
+                fingerprint(title, problem, details, [shloka for _, shloka in verses]),
+                partial(render_problem, corpus_id, title, problem, details, verses))
+            pages[f'{corpus_id}/graph/Problem_{slug(problem)}.json'] = graph_page(corpus_id, f'Problem_{problem}')
+
+        themes = api.themes_with_counts(corpus)
+        pages[f'{corpus_id}/themes/index.html'] = (fingerprint(title, themes),
+                                                   partial(render_themes, corpus_id, title, themes))
+        for theme in themes:
+            name = theme['theme']
+            related = [(c['number'], c['name'], c['summary']) for c in chapters
+                       if name in c['main_theme'] or name in c['philosophical_aspects']]
+            pages[f'{corpus_id}/themes/{slug(name)}.html'] = (fingerprint(title, name, related),
+                                                              partial(render_theme, corpus_id, title, name, related))
+    return pages
+
+
+def export(out_dir: str, corpus_ids: List[str] = None, force: bool = False) -> Dict[str, int]:
+    """Render changed pages into `out_dir`; returns counts of written, unchanged and removed files."""
+    registry = api.get_registry()
+    corpus_ids = corpus_ids or registry.ids()
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+
+    # Pages of corpora not being exported keep their files and manifest entries
+    exported = set(corpus_ids)
+    manifest = {path: digest for path, digest in previous.items() if corpus_of(path) not in exported | {''}}
+    kept = {corpus_of(path) for path in manifest}
+    listed = [corpus_id for corpus_id in registry.ids() if corpus_id in exported | kept]
+    listed += sorted(kept - set(listed))
+
+    pages = plan_pages(registry, corpus_ids, listed)
+    stats = {'written': 0, 'unchanged': 0, 'removed': 0}
+    for relative_path, (digest, render) in pages.items():
+        manifest[relative_path] = digest
+        target = os.path.join(out_dir, relative_path)
+        if not force and previous.get(relative_path) == digest and os.path.exists(target):
+            stats['unchanged'] += 1
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write(render())
+        stats['written'] += 1
+
+    for relative_path in set(previous) - set(manifest):
+        # Only paths of the exported corpora can be missing from the merged manifest
+        target = os.path.join(out_dir, relative_path)
+        if os.path.exists(target):
+            os.remove(target)
+            stats['removed'] += 1
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the graphGita views as a static site")
+    parser.add_argument('--out', default='site', help="Output directory")
+    parser.add_argument('--corpora', help="Comma separated corpus ids (default: all)")
+    parser.add_argument('--force', action='store_true', help="Ignore the manifest and re-render every page")
+    args = parser.parse_args(argv)
+
+    stats = export(args.out, args.corpora.split(',') if args.corpora else None, args.force)
+    print(f"Exported to {args.out}: {stats['written']} written, {stats['unchanged']} unchanged, "
+          f"{stats['removed']} removed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""Schema-normalizing ingestion for graphGita corpora.
+
+Every corpus is mapped once, when it is loaded, into one canonical chapter/shloka model
+(the Bhagavad Gita layout the views are written against). How a corpus's own fields map
+onto the canonical ones is declared in data/corpora.json, so a corpus with a different
+JSON layout is added by configuration:
+
+    "ashtavakra_gita": {
+        "file": "ashtavakra_gita_complete.json",
+        "title": "Ashtavakra Gita",
+        "shloka_fields": {"life_application": ["real_life_application"]}
+    }
+
+Each canonical field takes the first non-empty value among its source paths. Paths are
+dotted keys where a number indexes a list and `*` maps over it ("themes.*.name").
+Corpora that need more than field mapping can register a function in ADAPTERS.
+"""
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Canonical fields and the empty value used when a corpus has no source for them
+CHAPTER_FIELDS = {
+    'number': 0,
+    'name': '',
+    'summary': '',
+    'main_theme': '',
+    'philosophical_aspects': [],
+    'life_problems_addressed': [],
+    'yoga_type': '',
+    'characters': [],
+    'themes': [],
+    'character_relationships': [],
+    'theme_relationships': [],
+    'key_events': [],
+    'concepts': [],
+    'philosophical_progression': '',
+    'chapter_relevance': ''
+}
+
+SHLOKA_FIELDS = {
+    'shloka_number': 0,
+    'sanskrit_text': '',
+    'transliteration': '',
+    'interpretation': '',
+    'meaning': '',
+    'keywords': [],
+    'life_application': '',
+    'reflection': '',
+    'addresses_problems': []
+}
+
+REQUIRED_CHAPTER_FIELDS = ('number', 'name', 'summary')
+REQUIRED_SHLOKA_FIELDS = ('shloka_number', 'sanskrit_text')
+
+# Values written by earlier generation runs when the model output could not be parsed
+PLACEHOLDER_PATTERN = re.compile(r'^\s*(Generated\b|Error\b)', re.IGNORECASE)
+
+
+class IngestReport:
+    """Validation findings for one corpus, collected while it is normalized."""
+
+    def __init__(self, corpus_id: str):
+        self.corpus_id = corpus_id
+        self.issues: List[Dict[str, str]] = []
+        self.unmapped_fields = set()
+        self.chapters = 0
+        self.shlokas = 0
+
+    def add(self, level: str, location: str, message: str) -> None:
+        self.issues.append({'level': level, 'location': location, 'message': message})
+
+    @property
+    def errors(self) -> List[Dict[str, str]]:
+        return [issue for issue in self.issues if issue['level'] == 'error']
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'corpus': self.corpus_id,
+            'chapters': self.chapters,
+            'shlokas': self.shlokas,
+            'errors': len(self.errors),
+            'warnings': len(self.issues) - len(self.errors),
+            'unmapped_fields': sorted(self.unmapped_fields),
+            'issues': self.issues
+        }
+
+    def summary(self) -> str:
+        lines = [f"{self.corpus_id}: {self.chapters} chapters, {self.shlokas} shlokas, "
+                 f"{len(self.errors)} errors, {len(self.issues) - len(self.errors)} warnings"]
+        if self.unmapped_fields:
+            lines.append(f"  unmapped source fields: {', '.join(sorted(self.unmapped_fields))}")
+        for issue in self.issues:
+            lines.append(f"  {issue['level'].upper()} {issue['location']}: {issue['message']}")
+        return "\n".join(lines)
+
+
+def resolve_path(record: Any, path: str) -> Any:
+    """Follow a dotted path ("themes.0.name", "themes.*.name") into a JSON record."""
+    values = [record]
+    mapped = False
+    for segment in path.split('.'):
+        next_values = []
+        for value in values:
+            if segment == '*' and isinstance(value, list):
+                next_values.extend(value)
+                mapped = True
+            elif segment.isdigit() and isinstance(value, list):
+                if int(segment) < len(value):
+                    next_values.append(value[int(segment)])
+            elif isinstance(value, dict) and segment in value:
+                next_values.append(value[segment])
+        values = next_values
+    if mapped:
+        return values
+    return values[0] if values else None
+
+
+def is_placeholder(value: Any) -> bool:
+    if isinstance(value, str):
+        return bool(PLACEHOLDER_PATTERN.match(value))
+    if isinstance(value, list) and value:
+        return all(is_placeholder(item) for item in value)
+    return False
+
+
+def is_empty(value: Any) -> bool:
+    return value is None or value == '' or value == [] or value == {}
+
+
+def map_fields(record: Dict, fields: Dict[str, Any], overrides: Dict[str, List[str]],
+               report: IngestReport, location: str) -> Dict:
+    """Build a canonical record: each field takes the first usable value among its source paths."""
+    result = {}
+    consumed = set()
+    for field, empty in fields.items():
+        value = None
+        for path in overrides.get(field, [field]):
+            candidate = resolve_path(record, path)
+            consumed.add(path.split('.', 1)[0])
+            if is_placeholder(candidate):
+                report.add('warning', location, f"placeholder value in '{path}' ignored")
+                continue
+            if isinstance(empty, int) and isinstance(candidate, str):
+                if not candidate.strip().isdigit():
+                    report.add('error', location, f"'{path}' is not a number: {candidate!r}")
+                    continue
+                candidate = int(candidate)
+            if not is_empty(candidate):
+                value = candidate
+                break
+        result[field] = value if value is not None else (list(empty) if isinstance(empty, list) else empty)
+    report.unmapped_fields.update(key for key in record if key not in consumed and key not in ('shlokas', 'name', 'chapter'))
+    return result
+
+
+def normalize_corpus(raw: Dict, spec: Dict, corpus_id: str) -> Tuple[Dict, IngestReport]:
+    """Map a raw corpus onto the canonical model and validate it."""
+    report = IngestReport(corpus_id)
+    chapter_overrides = spec.get('chapter_fields', {})
+    shloka_overrides = spec.get('shloka_fields', {})
+    problems = resolve_path(raw, spec.get('problem_solutions_map', 'problem_solutions_map')) or {}
+
+    problems_by_shloka = {}
+    for problem, details in problems.items():
+        for ref in details.get('references', []):
+            problems_by_shloka.setdefault((ref['chapter'], ref['shloka']), []).append(problem)
+
+    chapters = []
+    seen_shlokas = set()
+    for raw_chapter in resolve_path(raw, spec.get('chapters', 'chapters')) or []:
+        chapter = map_fields(raw_chapter, CHAPTER_FIELDS, chapter_overrides, report,
+                             f"chapter {raw_chapter.get('number', '?')}")
+        location = f"chapter {chapter['number']}"
+        for field in REQUIRED_CHAPTER_FIELDS:
+            if is_empty(chapter[field]):
+                report.add('error', location, f"missing '{field}'")
+
+        shlokas = []
+        for raw_shloka in raw_chapter.get('shlokas', []):
+            shloka = map_fields(raw_shloka, SHLOKA_FIELDS, shloka_overrides, report,
+                                f"{location} shloka {raw_shloka.get('shloka_number', '?')}")
+            key = (chapter['number'], shloka['shloka_number'])
+            shloka['name'] = f"Shloka {shloka['shloka_number']}"
+            shloka['chapter'] = chapter['number']
+            if not shloka['addresses_problems']:
+                shloka['addresses_problems'] = problems_by_shloka.get(key, [])
+            for field in REQUIRED_SHLOKA_FIELDS:
+                if is_empty(shloka[field]):
+                    report.add('error', f"{location} shloka {shloka['shloka_number']}", f"missing '{field}'")
+            if is_empty(shloka['meaning']) and is_empty(shloka['interpretation']):
+                report.add('warning', f"{location} shloka {shloka['shloka_number']}", "no meaning or interpretation")
+            if key in seen_shlokas:
+                report.add('error', f"{location} shloka {shloka['shloka_number']}", "duplicate shloka number")
+            seen_shlokas.add(key)
+            shlokas.append(shloka)
+
+        shlokas.sort(key=lambda s: s['shloka_number'])
+        numbers = [s['shloka_number'] for s in shlokas]
+        if numbers and numbers != list(range(1, len(numbers) + 1)):
+            report.add('warning', location, "shloka numbers are not contiguous from 1")
+        chapter['shlokas'] = shlokas
+        chapters.append(chapter)
+        report.shlokas += len(shlokas)
+
+    chapters.sort(key=lambda c: c['number'])
+    report.chapters = len(chapters)
+    for problem, details in problems.items():
+        for ref in details.get('references', []):
+            if (ref['chapter'], ref['shloka']) not in seen_shlokas:
+                report.add('warning', f"problem {problem}",
+                           f"references missing shloka {ref['chapter']}:{ref['shloka']}")
+
+    return {'problem_solutions_map': problems, 'chapters': chapters}, report
+
+
+# Adapter functions by name; corpora select one with "adapter" in data/corpora.json
+ADAPTERS: Dict[str, Callable[[Dict, Dict, str], Tuple[Dict, IngestReport]]] = {
+    'default': normalize_corpus
+}
+
+
+def load_corpus_file(path: str, spec: Optional[Dict] = None, corpus_id: str = '') -> Tuple[Dict, IngestReport]:
+    """Read a corpus file and return its canonical data and validation report."""
+    spec = spec or {}
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    adapter = ADAPTERS[spec.get('adapter', 'default')]
+    return adapter(raw, spec, corpus_id)
+
+
+if __name__ == "__main__":
+    # Print the validation report for every configured corpus: python gita_ingest.py [--json]
+    import sys
+    from gita_corpus import CorpusRegistry
+
+    registry = CorpusRegistry()
+    reports = [registry.get(corpus_id).report for corpus_id in registry.ids()]
+    if '--json' in sys.argv:
+        print(json.dumps([report.to_dict() for report in reports], indent=4))
+    else:
+        for report in reports:
+            print(report.summary())
+    sys.exit(1 if any(report.errors for report in reports) else 0)
@@ -0,0 +1,247 @@
+"""Render-time instrumentation for the graphGita apps.
+
+Timing spans are recorded while a Streamlit rerun runs and, when it ends, are filed
+under the view that was shown. This gives per-(view, span) latency histograms:
+
+    @timed('build_knowledge_graph')
+    def build_knowledge_graph(self): ...
+
+    with METRICS.rerun():            # wraps one script run
+        ...
+        METRICS.set_view(view_option)
+        with span('agraph_payload'):
+            ...
+
+METRICS.to_prometheus() exports the histograms in the Prometheus text format. Setting
+GRAPHGITA_METRICS_FILE writes that text after every rerun, for a node-exporter textfile
+collector. debug_panel() shows the same numbers in the sidebar (open the app with
+?debug=1 or set GRAPHGITA_DEBUG=1) and can cProfile one rerun.
+"""
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Upper bounds in seconds; the last bucket is +Inf
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+NO_VIEW = '-'
+
+_current = contextvars.ContextVar('graphgita_rerun', default=None)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = next((i for i, bound in enumerate(BUCKETS) if seconds <= bound), len(BUCKETS))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (max for the +Inf bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'mean_ms': round(self.total / self.count * 1000, 3) if self.count else 0.0,
+                'p50_ms': round(self.quantile(0.5) * 1000, 3), 'p99_ms': round(self.quantile(0.99) * 1000, 3),
+                'max_ms': round(self.max * 1000, 3)}
+
+
+class Metrics:
+    """Process-wide histograms keyed by (view, span), shared by every session."""
+
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def observe(self, view: str, name: str, seconds: float) -> None:
+        with self._lock:
+            self.histograms.setdefault((view, name), Histogram()).observe(seconds)
+
+    def record(self, name: str, seconds: float) -> None:
+        """File a span under the running rerun, or directly under no view outside of one."""
+        spans = _current.get()
+        if spans is not None:
+            spans['spans'].append((name, seconds))
+        else:
+            self.observe(NO_VIEW, name, seconds)
+
+    @contextmanager
+    def rerun(self):
+        """Collect the spans of one script run and file them under its view when it ends."""
+        state = {'view': NO_VIEW, 'spans': []}
+        token = _current.set(state)
+        started = time.perf_counter()
+        try:
+            yield state
+        finally:
+            _current.reset(token)
+            for name, seconds in state['spans']:
+                self.observe(state['view'], name, seconds)
+            self.observe(state['view'], 'rerun', time.perf_counter() - started)
+            path = os.environ.get('GRAPHGITA_METRICS_FILE')
+            if path:
+                try:
+                    self.write(path)
+                except OSError as e:
+                    # Exporting metrics never fails the user's script run
+                    print(f"Error writing metrics to {path}: {e}")
+
+    def set_view(self, view: str) -> None:
+        state = _current.get()
+        if state is not None:
+            state['view'] = view
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict]]:
+        with self._lock:
+            items = sorted(self.histograms.items())
+            result: Dict[str, Dict[str, Dict]] = {}
+            for (view, name), histogram in items:
+                result.setdefault(view, {})[name] = histogram.to_dict()
+        return result
+
+    def to_prometheus(self) -> str:
+        lines = ['# HELP graphgita_span_seconds Time spent in instrumented spans per view.',
+                 '# TYPE graphgita_span_seconds histogram']
+        with self._lock:
+            for (view, name), histogram in sorted(self.histograms.items()):
+                labels = f'view="{view}",span="{name}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    lines.append(f'graphgita_span_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'graphgita_span_seconds_sum{{{labels}}} {histogram.total:.6f}')
+                lines.append(f'graphgita_span_seconds_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str) -> None:
+        """Atomically write the Prometheus text, so a collector never reads a partial file.
+
+        Each write goes through its own temporary file next to `path`, so sessions finishing
+        reruns at the same time do not replace each other's."""
+        directory, name = os.path.split(os.path.abspath(path))
+        with self._write_lock:
+            fd, tmp_path = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(self.to_prometheus())
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+
+
+METRICS = Metrics()
+
+
+@contextmanager
+def span(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        METRICS.record(name, time.perf_counter() - started)
+
+
+def timed(name: Optional[str] = None):
+    """Decorator recording every call of a function as a span."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profiled(enabled: bool):
+    """cProfile the enclosed block when `enabled`; yields a dict that receives the stats."""
+    result: Dict[str, object] = {}
+    if not enabled:
+        yield result
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(30)
+        result['text'] = text.getvalue()
+        result['stats'] = profiler
+
+
+def debug_enabled() -> bool:
+    import streamlit as st
+    return os.environ.get('GRAPHGITA_DEBUG') == '1' or st.query_params.get('debug') == '1'
+
+
+def run_instrumented(main) -> None:
+    """Run a Streamlit main() inside a metrics rerun, with the optional debug panel and profiler."""
+    import streamlit as st
+
+    if not debug_enabled():
+        with METRICS.rerun():
+            main()
+        return
+
+    profile = st.session_state.pop('graphgita_profile_next', False)
+    with METRICS.rerun():
+        with profiled(profile) as result:
+            main()
+    if profile:
+        st.session_state['graphgita_last_profile'] = result['text']
+    debug_panel()
+
+
+def debug_panel() -> None:
+    """Sidebar panel with per-view latency tables, metric downloads and a one-rerun profiler."""
+    import streamlit as st
+
+    with st.sidebar.expander("🐞 Performance", expanded=False):
+        snapshot = METRICS.snapshot()
+        for view, spans in snapshot.items():
+            st.markdown(f"**{view}**")
+            st.table([{'span': name, **stats} for name, stats in spans.items()])
+        st.download_button("Download metrics (Prometheus)", METRICS.to_prometheus(),
+                           file_name="graphgita_metrics.prom", mime="text/plain")
+        st.download_button("Download metrics (JSON)", json.dumps(snapshot, indent=2),
+                           file_name="graphgita_metrics.json", mime="application/json")
+        if st.button("Profile next rerun", key="graphgita_profile_button"):
+            st.session_state['graphgita_profile_next'] = True
+        last_profile = st.session_state.get('graphgita_last_profile')
+        if last_profile:
+            st.markdown("**Last profiled rerun** (top 30 by cumulative time)")
+            st.code(last_profile, language=None)
@@ -0,0 +1,82 @@
+"""Compact graph payloads for the front-end graph components.
+
+streamlit_agraph's own encoding sends every node with its style (color, size, shape and
+a title repeating its id) and every edge with its color and `smooth` config. Payloads
+built here send each style once and refer to it by index instead, and use integer node
+ids (positions in the node list), mapped back to graph ids on the Python side:
+
+    data, options, ids = vis_payload(nodes, edges, config.to_dict(), NODE_STYLES, EDGE_STYLE)
+    clicked = ids[value]                          # the component returns an integer id
+
+Components built for this repo (gita_webgl.py) also get delta updates: their payload is
+split into parts with a digest each, and a rerun sends only the parts whose digest
+differs from what was last sent to the session:
+
+    args = delta(parts, digests, sent)           # `sent`: digests already in the browser
+
+A browser that no longer holds a part (the component was unmounted and mounted again)
+asks for a resync and gets every part on the next run.
+"""
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_STYLE = {'color': '#FFFFFF', 'size': 25}
+
+
+def dumps(value) -> str:
+    """JSON without whitespace; non-ASCII labels stay UTF-8 instead of \\u escapes."""
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def digest(value) -> str:
+    """Short content hash of a bytes part or a JSON-serializable part."""
+    data = value if isinstance(value, bytes) else dumps(value).encode('utf-8')
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+def vis_payload(nodes: List, edges: List, config: Dict, styles: Dict[str, Dict],
+                edge_style: Dict) -> Tuple[str, str, List[str]]:
+    """(data JSON, options JSON, node ids) for streamlit_agraph's vis.js front end.
+
+    `nodes` carry their type as `group` (see create_node). Styles become vis.js groups
+    named by their index, and `edge_style` the edge defaults, so nodes are sent as
+    {id, label, group} and edges as {from, to} with an optional label. Duplicate nodes
+    and edges to unknown nodes, which vis.js would not draw either, are dropped."""
+    groups: Dict[str, str] = {}
+    group_styles: Dict[str, Dict] = {}
+    index: Dict[str, int] = {}
+    encoded_nodes = []
+    for node in nodes:
+        if node.id in index:
+            continue
+        node_type = getattr(node, 'group', None)
+        if node_type not in groups:
+            groups[node_type] = str(len(groups))
+            group_styles[groups[node_type]] = {'shape': 'dot', **styles.get(node_type, DEFAULT_STYLE)}
+        index[node.id] = len(encoded_nodes)
+        encoded = {'id': index[node.id], 'group': groups[node_type]}
+        if node.label is not None:
+            encoded['label'] = node.label
+        encoded_nodes.append(encoded)
+
+    encoded_edges = []
+    for edge in edges:
+        source, target = index.get(edge.source), index.get(edge.to)
+        if source is None or target is None:
+            continue
+        encoded = {'from': source, 'to': target}
+        if getattr(edge, 'label', None):
+            encoded['label'] = edge.label
+        encoded_edges.append(encoded)
+
+    options = dict(config, groups=group_styles, edges={**(config.get('edges') or {}), **edge_style})
+    return dumps({'nodes': encoded_nodes, 'edges': encoded_edges}), dumps(options), list(index)
+
+
+def delta(parts: Dict, digests: Dict[str, str], sent: Optional[Dict[str, str]]) -> Dict:
+    """Component arguments: every part whose digest differs from `sent`, plus all digests."""
+    sent = sent or {}
+    args = {name: value for name, value in parts.items() if sent.get(name) != digests[name]}
+    args['digests'] = digests
+    return args
@@ -0,0 +1,99 @@
+"""Cached, off-thread rendering of the static graph images in app_networkx_graphs.py.
+
+Each image is drawn on its own matplotlib Figure (object-oriented API, never pyplot's
+global figure registry), saved to PNG or SVG bytes and dropped, so no figure outlives
+a render. Images are kept in an LRU cache keyed by (view, node, corpus version, style),
+so a repeat view is a lookup whichever session asks. Layouts are seeded, so the same
+graph always renders the same picture. One GraphRenderer is shared by every session:
+
+    renderer = GraphRenderer()
+    png = renderer.render(('chapter', 'bhagavad_gita:Chapter_2', corpus.version), CHAPTER_STYLE, build)
+
+`build()` returns (graph, node colors, labels, title) and only runs on a cache miss.
+Renders run on a small thread pool, which bounds how many figures exist at once, and
+concurrent requests for the same image share one render.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from gita_metrics import timed
+
+WORKERS = 2
+CACHE_SIZE = 256
+LAYOUT_SEED = 42
+
+CHAPTER_STYLE = {'figsize': (12, 8), 'node_size': 2000, 'font_size': 8, 'dpi': 100, 'format': 'png'}
+CHARACTER_STYLE = {'figsize': (10, 6), 'node_size': 2000, 'font_size': 8, 'dpi': 100, 'format': 'png'}
+THEME_STYLE = {'figsize': (8, 8), 'node_size': 2000, 'font_size': 8, 'dpi': 100, 'format': 'png'}
+
+# (graph, node colors, labels or None for node ids, title or None)
+GraphSpec = Tuple[object, List[str], Optional[Dict], Optional[str]]
+
+
+@timed('draw_graph')
+def draw_graph(G, node_colors: List[str], labels: Optional[Dict], title: Optional[str], style: Dict) -> bytes:
+    """Lay out and draw `G` on a fresh Figure; returns the encoded image."""
+    import networkx as nx
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=style['figsize'])
+    ax = fig.add_subplot()
+    pos = nx.spring_layout(G, seed=LAYOUT_SEED)
+    options = {'labels': labels} if labels is not None else {}
+    nx.draw(G, pos, ax=ax, with_labels=True, node_color=node_colors,
+            node_size=style['node_size'], font_size=style['font_size'], **options)
+    if title:
+        ax.set_title(title)
+    image = BytesIO()
+    fig.savefig(image, format=style['format'], dpi=style['dpi'], bbox_inches='tight')
+    return image.getvalue()
+
+
+class GraphRenderer:
+    def __init__(self, workers: int = WORKERS, cache_size: int = CACHE_SIZE,
+                 draw: Callable[..., bytes] = draw_graph):
+        self.cache_size = cache_size
+        self._draw = draw
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='graphgita-render')
+        self._cache: 'OrderedDict[Hashable, bytes]' = OrderedDict()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'cache_hits': 0, 'deduplicated': 0, 'rendered': 0, 'failed': 0}
+
+    def render(self, key: Hashable, style: Dict, build: Callable[[], GraphSpec]) -> bytes:
+        """The image for `key` in `style`, from the cache or rendered on the pool."""
+        key = (key, tuple(sorted(style.items())))
+        with self._lock:
+            self.stats['requests'] += 1
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+                self.stats['cache_hits'] += 1
+                return image
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._pool.submit(self._render, key, style, build)
+                self._in_flight[key] = future
+            else:
+                self.stats['deduplicated'] += 1
+        return future.result()
+
+    def _render(self, key: Hashable, style: Dict, build: Callable[[], GraphSpec]) -> bytes:
+        try:
+            image = self._draw(*build(), style)
+        except Exception:
+            # Failures are not cached, so the next view retries
+            with self._lock:
+                self._in_flight.pop(key, None)
+                self.stats['failed'] += 1
+            raise
+        with self._lock:
+            self._in_flight.pop(key, None)
+            self.stats['rendered'] += 1
+            self._cache[key] = image
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return image
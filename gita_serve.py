@@ -0,0 +1,137 @@
+"""Pre-forking server for the JSON API in api/index.py.
+
+The parent process loads every corpus, the shared graph, the search indexes and the
+precomputed responses once, then forks the workers. The workers share those pages
+copy-on-write instead of each parsing and indexing its own copy, and start warm:
+
+    python gita_serve.py --workers 4 --port 8000
+    python gita_serve.py --workers 4 --no-preload      # every worker loads on demand
+
+Following the gc module's advice for fork without exec, the collector is disabled while
+the parent loads and everything loaded is moved to the permanent generation
+(gc.freeze) before forking. Collections in the workers then never write to the headers
+of the shared objects, which would otherwise copy every page they live on.
+
+A worker that dies is replaced by a fresh fork. Workers that die within FAST_EXIT
+seconds of starting (a port or config error, say) are re-forked after a growing delay,
+and the server gives up after MAX_FAST_EXITS such exits in a row.
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# A worker exiting sooner than this after its fork counts as failing to start
+FAST_EXIT = 5.0
+MAX_FAST_EXITS = 5
+
+
+def bind(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, log_level: str) -> None:
+    import uvicorn
+
+    gc.enable()
+    config = uvicorn.Config(app, lifespan='on', log_level=log_level, access_log=False)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn(app, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        status = 0
+        try:
+            run_worker(app, sock, log_level)
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+        finally:
+            # os._exit skips the interpreter's flush of the standard streams
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+    return pid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-forking server for the graphGita JSON API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--corpora', help="Comma separated corpus ids to preload (default: all)")
+    parser.add_argument('--no-preload', action='store_true', help="Let every worker load corpora on demand")
+    parser.add_argument('--no-gc-freeze', action='store_true', help="Fork without freezing the preloaded objects")
+    parser.add_argument('--log-level', default='warning')
+    args = parser.parse_args(argv)
+
+    gc.disable()
+    from api import index
+
+    if not args.no_preload:
+        responses = index.preload(args.corpora.split(',') if args.corpora else None)
+        print(f"Preloaded {len(index.get_registry().corpora)} corpora and {responses} responses")
+    if not args.no_gc_freeze:
+        gc.freeze()
+
+    sock = bind(args.host, args.port)
+    workers = {spawn(index.app, sock, args.log_level): time.monotonic() for _ in range(args.workers)}
+    print(f"Serving http://{args.host}:{args.port} with {len(workers)} workers (parent {os.getpid()})")
+
+    stopping = False
+    fast_exits = 0
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = workers.pop(pid, None)
+        if stopping or started is None:
+            continue
+        fast_exits = fast_exits + 1 if time.monotonic() - started < FAST_EXIT else 0
+        if fast_exits >= MAX_FAST_EXITS:
+            print(f"Workers keep exiting within {FAST_EXIT:g}s of starting, giving up", file=sys.stderr)
+            stop(None, None)
+            continue
+        delay = min(10.0, 0.5 * 2 ** fast_exits) if fast_exits else 0.0
+        # A crashed worker is replaced by a fresh fork of the preloaded parent
+        print(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, "
+              f"restarting{f' in {delay:g}s' if delay else ''}")
+        time.sleep(delay)
+        if not stopping:
+            workers[spawn(index.app, sock, args.log_level)] = time.monotonic()
+    sock.close()
+    if fast_exits >= MAX_FAST_EXITS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Full-corpus graph explorer: a WebGL Streamlit component fed with typed arrays.
+
+vis.js (streamlit_agraph) and D3 slow down badly past a few hundred nodes with physics
+on. This component draws every corpus at once with WebGL instead, from positions computed
+here once per process, so the browser does no layout work:
+
+    payload = graph_payload([ClusterTree.build(corpus) for corpus in corpora], NODE_STYLES)
+    clicked = webgl_graph(payload, key='full_graph')  # namespaced id of the last clicked node
+
+The payload is a handful of little-endian typed arrays (float32 positions, uint8 node
+types and edge kinds, uint32 edge endpoints) sent as bytes arguments, plus a label list
+and a style table per node type. Node ids stay on the server: the browser only sees
+node indexes. Parts the session's browser already holds are not sent again (see
+gita_payload.delta). The front end (components/webgl_graph) is plain JavaScript that
+speaks the component messaging protocol itself, so there is no build step.
+
+Layout: each corpus is a ring of chapters. A chapter's verses sit on a sunflower spiral
+around it in keyword-community order (see gita_clusters.py), so communities stay together,
+and each life problem sits between the chapters it references.
+"""
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+from gita_clusters import ROOT, ClusterTree
+from gita_corpus import node_id
+from gita_payload import delta, digest
+
+COMPONENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'components', 'webgl_graph')
+GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))
+# Distance between the rings of two corpora, in chapter-ring radii
+CORPUS_SPACING = 2.8
+EDGE_KINDS = {'contains': '#B0B7C3', 'references': '#E0A800'}
+
+_component = None
+
+
+def leaf_ids(tree: ClusterTree, node: str) -> List[str]:
+    """Leaf ids under `node`, in tree order."""
+    found, stack = [], [node]
+    while stack:
+        current = stack.pop()
+        children = tree.children.get(current)
+        if children:
+            stack.extend(reversed(children))
+        elif current != node:
+            found.append(current)
+    return found
+
+
+def nodes_of_type(tree: ClusterTree, node_type: str) -> List[str]:
+    """Nodes of `node_type` in tree order, at any depth (chapters may sit under range clusters)."""
+    found, stack = [], [ROOT]
+    while stack:
+        current = stack.pop()
+        if current != ROOT and tree.types.get(current) == node_type:
+            found.append(current)
+            continue
+        stack.extend(reversed(tree.children.get(current, [])))
+    return found
+
+
+def cluster_layout(tree: ClusterTree, origin: Tuple[float, float] = (0.0, 0.0)) -> Dict[str, Tuple[float, float]]:
+    """Positions of every chapter, verse and problem of one corpus, by local id."""
+    chapters = nodes_of_type(tree, 'chapter')
+    count = max(1, len(chapters))
+    # Spiral radius that keeps neighbouring chapters apart
+    spread = min(0.35, 0.9 * math.sin(math.pi / count)) if count > 1 else 0.5
+    positions = {}
+    for index, chapter in enumerate(chapters):
+        angle = 2 * math.pi * index / count - math.pi / 2
+        cx, cy = origin[0] + math.cos(angle), origin[1] + math.sin(angle)
+        positions[chapter] = (cx, cy)
+        verses = leaf_ids(tree, chapter)
+        for rank, verse in enumerate(verses):
+            radius = spread * math.sqrt((rank + 0.5) / len(verses))
+            positions[verse] = (cx + radius * math.cos(rank * GOLDEN_ANGLE), cy + radius * math.sin(rank * GOLDEN_ANGLE))
+
+    references: Dict[str, List[Tuple[float, float]]] = {}
+    for (source, target), _ in tree.edges.items():
+        if target in positions:
+            references.setdefault(source, []).append(positions[target])
+    for rank, problem in enumerate(node for node in tree.labels if tree.types[node] == 'problem'
+                                   and not tree.is_cluster(node)):
+        points = references.get(problem, [origin])
+        # Pulled inside the ring, towards the centroid of what the problem references
+        x = origin[0] + 0.55 * (sum(point[0] for point in points) / len(points) - origin[0])
+        y = origin[1] + 0.55 * (sum(point[1] for point in points) / len(points) - origin[1])
+        jitter = 0.03 * math.sqrt(rank)
+        positions[problem] = (x + jitter * math.cos(rank * GOLDEN_ANGLE), y + jitter * math.sin(rank * GOLDEN_ANGLE))
+    return positions
+
+
+def graph_payload(trees: List[ClusterTree], styles: Dict[str, Dict]) -> Dict:
+    """Component arguments for the chapters, verses and problems of every tree, side by side.
+
+    `styles` maps node type to {'color': '#rrggbb', 'size': pixels}, as used by create_node."""
+    import numpy as np
+
+    ids, labels, types, xs, ys = [], [], [], [], []
+    edges, edge_kinds = [], []
+    type_index = {node_type: index for index, node_type in enumerate(styles)}
+    kind_index = {kind: index for index, kind in enumerate(EDGE_KINDS)}
+    for offset, tree in enumerate(trees):
+        positions = cluster_layout(tree, (offset * CORPUS_SPACING, 0.0))
+        index = {}
+        for local_id, (x, y) in positions.items():
+            index[local_id] = len(ids)
+            ids.append(node_id(tree.corpus_id, local_id))
+            labels.append(tree.labels[local_id])
+            types.append(type_index.get(tree.types[local_id], 0))
+            xs.append(x)
+            ys.append(y)
+        for chapter in nodes_of_type(tree, 'chapter'):
+            for verse in leaf_ids(tree, chapter):
+                edges.append((index[chapter], index[verse]))
+                edge_kinds.append(kind_index['contains'])
+        for (source, target), _ in tree.edges.items():
+            if source in index and target in index:
+                edges.append((index[source], index[target]))
+                edge_kinds.append(kind_index['references'])
+
+    parts = {
+        'positions': np.column_stack([xs, ys]).astype('<f4').tobytes() if ids else b'',
+        'types': np.asarray(types, dtype='u1').tobytes(),
+        'edges': np.asarray(edges, dtype='<u4').reshape(-1).tobytes(),
+        'edge_kinds': np.asarray(edge_kinds, dtype='u1').tobytes(),
+        'labels': labels,
+        'styles': [{'type': node_type, **style} for node_type, style in styles.items()],
+        'edge_styles': [{'kind': kind, 'color': color} for kind, color in EDGE_KINDS.items()]
+    }
+    return {'parts': parts, 'digests': {name: digest(value) for name, value in parts.items()}, 'ids': ids}
+
+
+def webgl_graph(payload: Dict, height: int = 700, key: str = 'webgl_graph') -> Optional[str]:
+    """Render the graph; returns the namespaced id of the last clicked node, if any.
+
+    The component's value is {'node': index or None, 'resync': token}; a new resync
+    token means the browser lost the parts it was sent, so all of them are sent again."""
+    global _component
+    import streamlit as st
+
+    if _component is None:
+        import streamlit.components.v1 as components
+
+        _component = components.declare_component('webgl_graph', path=COMPONENT_DIR)
+    state = st.session_state.setdefault(f"{key}_sent", {'digests': {}, 'resync': None})
+    value = st.session_state.get(key) or {}
+    if value.get('resync') and value['resync'] != state['resync']:
+        state['resync'], state['digests'] = value['resync'], {}
+    args = delta(payload['parts'], payload['digests'], state['digests'])
+    state['digests'] = dict(payload['digests'])
+    value = _component(**args, height=height, key=key, default=None) or {}
+    node = value.get('node')
+    return payload['ids'][node] if isinstance(node, int) and 0 <= node < len(payload['ids']) else None
@@ -0,0 +1,991 @@
+"""Provider-agnostic generation engine for the graphGita corpus.
+
+Produces bhagavad_gita_complete.json (chapter summaries, shloka details, chapter
+relationships and the problem -> shloka map) with any LLM provider:
+
+    python graphGita_engine.py --provider claude --endpoint https://... --chapters 1-3,6 --concurrency 8
+    python graphGita_engine.py --provider openai --chapters all --resume
+    python graphGita_engine.py --provider mock --chapters 2
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from graphGita_schemas import (CHAPTER_SUMMARY_SCHEMA, SHLOKA_DETAILS_SCHEMA, CHAPTER_RELATIONSHIPS_SCHEMA,
+                               RepairReport, generate_validated)
+
+# Define the chapter information with the correct structure - derived from original Gita book in gitrapress- Gorakhpur nad arhive.com sources after literature review
+# Sources:https://gitapress.org/bookdetail/gita-shankarbhashya-hindi-10
+# The Bhagavad Gita: The Original Sanskrit and an English Translation; Available at: https://archive.org/details/bhagavadgitaorig0000unse
+# Bhagavad-Gita As It Is (Original 1972 Edition); Available at: https://archive.org/details/bhagavadgitaasitisoriginal1972edition
+CHAPTER_INFO = {
+    "chapters": [
+        {"number": 1, "name": "Arjuna Visada Yoga", "total_shlokas": 47},
+        {"number": 2, "name": "Sankhya Yoga", "total_shlokas": 72},
+        {"number": 3, "name": "Karma Yoga", "total_shlokas": 43},
+        {"number": 4, "name": "Jnana Yoga", "total_shlokas": 42},
+        {"number": 5, "name": "Karma Sanyasa Yoga", "total_shlokas": 29},
+        {"number": 6, "name": "Dhyana Yoga", "total_shlokas": 47},
+        {"number": 7, "name": "Jnana Vijnana Yoga", "total_shlokas": 30},
+        {"number": 8, "name": "Aksara Brahma Yoga", "total_shlokas": 28},
+        {"number": 9, "name": "Raja Vidya Yoga", "total_shlokas": 34},
+        {"number": 10, "name": "Vibhuti Yoga", "total_shlokas": 42},
+        {"number": 11, "name": "Visvarupa Darsana Yoga", "total_shlokas": 55},
+        {"number": 12, "name": "Bhakti Yoga", "total_shlokas": 20},
+        {"number": 13, "name": "Ksetra Ksetrajna Vibhaga Yoga", "total_shlokas": 35},
+        {"number": 14, "name": "Gunatraya Vibhaga Yoga", "total_shlokas": 27},
+        {"number": 15, "name": "Purusottama Yoga", "total_shlokas": 20},
+        {"number": 16, "name": "Daivasura Sampad Vibhaga Yoga", "total_shlokas": 24},
+        {"number": 17, "name": "Sraddhatraya Vibhaga Yoga", "total_shlokas": 28},
+        {"number": 18, "name": "Moksa Sanyasa Yoga", "total_shlokas": 78}
+    ]
+}
+
+
+@lru_cache(maxsize=None)
+def load_chapter_info(path=None):
+    """Load chapter metadata on first use; defaults to the built-in CHAPTER_INFO."""
+    if path is None:
+        return CHAPTER_INFO
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# AWS client to access S3 and Textract
+class AWSClient:
+    def __init__(self, region_name='eu-west-1', endpoint_url=None, s3_client=None, max_workers=8,
+                 max_retries=3, chunk_size=1024 * 1024):
+        import boto3
+        # endpoint_url / s3_client let the ingestion path run against a local S3 stand-in (e.g. moto)
+        self.s3_client = s3_client or boto3.client('s3', region_name=region_name, endpoint_url=endpoint_url)
+        self.textract_client = boto3.client('textract', region_name=region_name)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.chunk_size = chunk_size
+
+    def iter_s3_keys(self, bucket_name, prefix, suffix='.json'):
+        """Yield every matching key under `prefix`, following list_objects_v2 pagination past 1000 keys."""
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                if obj['Key'].endswith(suffix) and not obj['Key'].endswith('/'):
+                    yield obj['Key']
+
+    def list_s3_documents(self, bucket_name, prefix):
+        from botocore.exceptions import ClientError
+        try:
+            return list(self.iter_s3_keys(bucket_name, prefix))
+        except ClientError as e:
+            print(f"Error accessing S3: {e}")
+            return []
+
+    def get_object(self, bucket_name, file_key):
+        """Read an object as UTF-8 text, decoding the body in streamed chunks and retrying transient errors."""
+        import codecs
+        from botocore.exceptions import BotoCoreError, ClientError
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.s3_client.get_object(Bucket=bucket_name, Key=file_key)
+                decoder = codecs.getincrementaldecoder('utf-8')()
+                parts = [decoder.decode(chunk) for chunk in response['Body'].iter_chunks(self.chunk_size)]
+                parts.append(decoder.decode(b'', final=True))
+                return ''.join(parts)
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') in ('NoSuchKey', 'AccessDenied', 'NoSuchBucket'):
+                    print(f"Error getting object from S3: {e}")
+                    return None
+                error = e
+            except UnicodeDecodeError as e:
+                # The same bytes come back on every attempt, so retrying cannot help
+                print(f"Error decoding object {file_key} from S3: {e}")
+                return None
+            except (BotoCoreError, OSError) as e:
+                error = e
+            if attempt < self.max_retries:
+                time.sleep(0.5 * (2 ** attempt))
+        print(f"Error getting object {file_key} from S3 after {self.max_retries + 1} attempts: {error}")
+        return None
+
+    def iter_documents(self, bucket_name, prefix, suffix='.json'):
+        """Yield (key, text) for every matching object, fetched by a bounded worker pool.
+
+        At most 2 * max_workers downloads are in flight, so memory stays bounded however many
+        keys the prefix holds. Results are yielded as they complete; failed objects are skipped."""
+        from concurrent.futures import FIRST_COMPLETED, wait
+        keys = self.iter_s3_keys(bucket_name, prefix, suffix)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {}
+            for key in keys:
+                pending[pool.submit(self.get_object, bucket_name, key)] = key
+                if len(pending) >= 2 * self.max_workers:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        text = future.result()
+                        if text is not None:
+                            yield pending[future], text
+                        del pending[future]
+            for future in list(pending):
+                text = future.result()
+                if text is not None:
+                    yield pending[future], text
+
+    def load_source_shlokas(self, bucket_name, prefix):
+        """Collect {(chapter, shloka): sanskrit_text} from source JSON documents in S3.
+
+        Documents may hold a whole corpus ({"chapters": [...]}), one chapter or one shloka record."""
+        source_texts = {}
+        for key, text in self.iter_documents(bucket_name, prefix):
+            try:
+                document = json.loads(text)
+            except json.JSONDecodeError as e:
+                print(f"Skipping {key}: invalid JSON ({e})")
+                continue
+            chapters = document.get("chapters") or [document]
+            for chapter in chapters:
+                shlokas = chapter.get("shlokas") or [chapter]
+                for shloka in shlokas:
+                    chapter_number = shloka.get("chapter", chapter.get("number"))
+                    if chapter_number and shloka.get("shloka_number") and shloka.get("sanskrit_text"):
+                        source_texts[(int(chapter_number), int(shloka["shloka_number"]))] = shloka["sanskrit_text"]
+        print(f"Loaded Sanskrit text for {len(source_texts)} shlokas from s3://{bucket_name}/{prefix}")
+        return source_texts
+
+
+# Base class for LLM providers: subclasses implement _complete(), retries and call stats live here
+class LLMProvider:
+    name = "base"
+
+    def __init__(self, max_retries=3, backoff=1.0):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "retries": 0, "failures": 0, "latencies": []}
+
+    def _complete(self, system_content, user_content, temperature, max_tokens):
+        raise NotImplementedError
+
+    def complete(self, system_content, user_content, temperature=0.1, max_tokens=300):
+        """Return the model's text response, retrying transient failures; "" if every attempt fails."""
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                response = self._complete(system_content, user_content, temperature, max_tokens)
+            except Exception as e:
+                print(f"Error in {self.name} call (attempt {attempt + 1}): {e}")
+                response = None
+            with self._lock:
+                self.stats["calls"] += 1
+                self.stats["latencies"].append(time.perf_counter() - started)
+                if response is None and attempt < self.max_retries:
+                    self.stats["retries"] += 1
+            if response is not None:
+                return response.strip()
+            if attempt < self.max_retries:
+                time.sleep(self.backoff * (2 ** attempt))
+        with self._lock:
+            self.stats["failures"] += 1
+        return ""
+
+
+# Claude behind an API Gateway / Lambda handler (Bedrock message format)
+class ClaudeHTTPProvider(LLMProvider):
+    name = "claude"
+
+    def __init__(self, api_endpoint, timeout=120, **kwargs):
+        super().__init__(**kwargs)
+        self.api_endpoint = api_endpoint
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        import requests
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _complete(self, system_content, user_content, temperature, max_tokens):
+        payload = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": f"System: {system_content}\n\nUser: {user_content}"
+                }
+            ]
+        }
+        response = self._session().post(self.api_endpoint, json=payload,
+                                        headers={'Content-Type': 'application/json'}, timeout=self.timeout)
+        if response.status_code == 200:
+            claude_response = response.json()
+
+            if 'content' in claude_response and isinstance(claude_response['content'], list):
+                return claude_response['content'][0]['text']
+            elif 'completion' in claude_response:
+                return claude_response['completion']
+            elif 'body' in claude_response:
+                body = json.loads(claude_response['body'])
+                if 'content' in body and isinstance(body['content'], list):
+                    return body['content'][0]['text']
+                elif 'completion' in body:
+                    return body['completion']
+
+        print(f"Unexpected response from Claude endpoint ({response.status_code}): {response.text[:200]}")
+        return None
+
+
+class OpenAIProvider(LLMProvider):
+    name = "openai"
+
+    def __init__(self, model="gpt-4o", api_key=None, **kwargs):
+        super().__init__(**kwargs)
+        from openai import OpenAI
+        self.model = model
+        self.client = OpenAI(api_key=api_key or os.environ.get("OPENAI_API_KEY"))
+
+    def _complete(self, system_content, user_content, temperature, max_tokens):
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_content},
+                {"role": "user", "content": user_content}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content
+
+
+# Offline provider returning deterministic, schema-valid answers; used for dry runs and benchmarks
+class MockProvider(LLMProvider):
+    name = "mock"
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=42, **kwargs):
+        kwargs.setdefault("backoff", 0.0)
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    def _complete(self, system_content, user_content, temperature, max_tokens):
+        with self._lock:
+            fail = self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise RuntimeError("mock provider error")
+        return mock_response(system_content, user_content)
+
+
+def mock_response(system_content, user_content):
+    """Deterministic stand-in answer for each prompt type the engine sends."""
+    if '"summary"' in system_content:
+        return json.dumps({
+            "summary": "Mock chapter summary",
+            "main_theme": "Duty",
+            "philosophical_aspects": ["Duty", "Detachment"],
+            "life_problems_addressed": ["Confusion"],
+            "yoga_type": "Karma Yoga"
+        })
+    if "transliteration" in system_content:
+        return json.dumps({
+            "transliteration": "dharma-ksetre kuru-ksetre",
+            "interpretation": "Mock interpretation",
+            "meaning": "Mock meaning",
+            "keywords": ["Duty", "Action"],
+            "life_application": "Mock life application"
+        })
+    if '"characters"' in system_content:
+        shlokas = sorted({int(word) for word in user_content.replace(":", " ").split() if word.isdigit()})[:5]
+        return json.dumps({
+            "characters": [{"name": "Arjuna", "description": "Warrior"}, {"name": "Krishna", "description": "Guide"}],
+            "themes": [{"name": "Duty", "description": "Acting without attachment"}],
+            "character_relationships": [{"from": "Arjuna", "to": "Krishna", "description": "Student and teacher"}],
+            "theme_relationships": [{"theme": "Duty", "shlokas": shlokas, "description": "Mock"}],
+            "key_events": [{"event": "Krishna teaches Arjuna", "shlokas": shlokas, "characters": ["Arjuna", "Krishna"]}],
+            "philosophical_progression": "Mock progression",
+            "chapter_relevance": "Mock relevance"
+        })
+    if '"philosophical_progression"' in system_content:
+        return json.dumps({"philosophical_progression": "Mock progression", "chapter_relevance": "Mock relevance"})
+    return "धर्मक्षेत्रे कुरुक्षेत्रे"
+
+
+PROVIDERS = {
+    "claude": ClaudeHTTPProvider,
+    "openai": OpenAIProvider,
+    "mock": MockProvider
+}
+
+
+def get_provider(name, **kwargs):
+    """Instantiate a provider by name ("claude", "openai" or "mock")."""
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown provider '{name}'. Choose from: {', '.join(sorted(PROVIDERS))}")
+    return PROVIDERS[name](**kwargs)
+
+
+# Runs the summary -> shlokas -> relationships pipeline for each chapter against one provider
+class GenerationEngine:
+    def __init__(self, provider, concurrency=4, report=None, window_size=20, source_texts=None):
+        self.provider = provider
+        self.source_texts = source_texts or {}
+        self.concurrency = concurrency
+        self.window_size = window_size
+        self.report = report or RepairReport()
+        self.problem_solutions_map = create_problem_solutions_map()
+        self.shloka_problem_map = build_shloka_problem_map(self.problem_solutions_map)
+
+    def call(self, system_content, user_content, temperature=0.1, max_tokens=300):
+        return self.provider.complete(system_content, user_content, temperature=temperature, max_tokens=max_tokens)
+
+    # Function to generate a summary of a chapter
+    def generate_chapter_summary(self, chapter_number, chapter_name):
+        system_content = f"""You are an expert on the Bhagavad Gita. Provide a comprehensive analysis of Chapter {chapter_number}: {chapter_name} strictly in JSON format with the following structure and no other format:
+    {{
+        "summary": "Brief summary of the chapter",
+        "main_theme": "The overarching theme of the chapter",
+        "philosophical_aspects": ["List of key philosophical concepts addressed"],
+        "life_problems_addressed": ["List of life problems or questions this chapter helps address"],
+        "yoga_type": "The primary type of yoga (if any) discussed in this chapter (e.g., Bhakti Yoga, Karma Yoga, etc.)"
+    }}"""
+        user_content = f"Provide a comprehensive analysis of Chapter {chapter_number}: {chapter_name} of the Bhagavad Gita as specified."
+
+        return generate_validated(self.call, system_content, user_content, CHAPTER_SUMMARY_SCHEMA,
+                                  "chapter_summary", context=f"Chapter {chapter_number}", report=self.report,
+                                  temperature=0.7, max_tokens=500)
+
+    # Function to generate the Sanskrit text for a given shloka
+    def generate_sanskrit_shloka(self, chapter_number, shloka_number):
+        system_content = "You are an expert in Sanskrit and the Bhagavad Gita. Generate only the Sanskrit text for the specified shloka without any additional text or explanations."
+        user_content = f"Generate the Sanskrit text for Bhagavad Gita Chapter {chapter_number}, Shloka {shloka_number}."
+        return self.call(system_content, user_content, temperature=0.1, max_tokens=300)
+
+    # Function to generate detailed graph schema information about a shloka
+    def generate_shloka_details(self, chapter_number, shloka_text, shloka_number):
+        system_content = """You are an expert on the Bhagavad Gita. Provide detailed information about the given verse in a structured JSON format.
+    Your response MUST be a valid JSON object strictly with the following keys:
+    - transliteration: The Sanskrit verse written in Latin script (as a single line without line breaks).
+    - interpretation: A deeper analysis of the verse's significance and implications.
+    - meaning: A concise explanation of the verse's meaning without any prefixes or introductions.
+    - keywords: An array of key philosophical teachings, themes, or abstract concepts presented in this shloka (exclude specific names of individuals).
+    - life_application: How the teachings of this shloka can be applied to solve real-life problems or questions.
+    Do not include any text outside of this JSON structure. Do not use markdown code block syntax or any other formatting."""
+
+        user_content = f"""Analyze the following Bhagavad Gita verse (Chapter {chapter_number}, Shloka {shloka_number}) and provide the details in the specified JSON format: {shloka_text}
+    Remember, your entire response must be a valid JSON object without any additional formatting or text."""
+
+        return generate_validated(self.call, system_content, user_content, SHLOKA_DETAILS_SCHEMA,
+                                  "shloka_details", context=f"Chapter {chapter_number}, Shloka {shloka_number}",
+                                  report=self.report, temperature=0.1, max_tokens=800)
+
+    # Function to analyze the relationships between characters, themes, and shlokas in a chapter for creating a better graph struct schema
+    def analyze_chapter_relationships(self, chapter_number, shlokas, chapter_summary):
+        """Analyze a chapter in one call, or map-reduce over verse windows when it exceeds `window_size`."""
+        print(f"Analyzing chapter {chapter_number} relationships...")
+        if not self.window_size or len(shlokas) <= self.window_size:
+            return self.analyze_shloka_window(chapter_number, shlokas, chapter_summary)
+
+        # Map: analyze bounded verse windows in parallel; each window is validated and repaired on its own
+        windows = [shlokas[i:i + self.window_size] for i in range(0, len(shlokas), self.window_size)]
+        print(f"Chapter {chapter_number}: map-reduce over {len(windows)} windows of up to {self.window_size} shlokas")
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            analyses = list(pool.map(
+                lambda window: self.analyze_shloka_window(chapter_number, window, chapter_summary), windows))
+
+        # Reduce: deterministic merge of entities, then one small call for the chapter-level prose
+        merged = merge_chapter_analyses(analyses, [shloka["shloka_number"] for shloka in shlokas])
+        merged.update(self.summarize_chapter_progression(chapter_number, chapter_summary, windows, analyses))
+        return merged
+
+    def analyze_shloka_window(self, chapter_number, shlokas, chapter_summary):
+        """Relationship analysis for a list of shlokas (a whole chapter or one window of it)."""
+        first, last = shlokas[0]["shloka_number"], shlokas[-1]["shloka_number"]
+        system_content = """You are an expert on the Bhagavad Gita. Analyze the given shlokas from the chapter and identify overall relationships between characters, themes, and shlokas.
+    Return a JSON object with the following structure:
+    {
+        "characters": [{"name": "Character Name", "description": "Brief description of the character's role in this chapter"}],
+        "themes": [{"name": "Theme Name", "description": "Brief description of the theme's significance in this chapter"}],
+        "character_relationships": [{"from": "Character A", "to": "Character B", "description": "Description of the relationship"}],
+        "theme_relationships": [{"theme": "Theme Name", "shlokas": [shloka numbers], "description": "How the theme manifests in these shlokas"}],
+        "key_events": [{"event": "Event description", "shlokas": [shloka numbers], "characters": ["Character names involved"]}],
+        "philosophical_progression": "Description of how philosophical concepts develop through the chapter",
+        "chapter_relevance": "Explanation of how this chapter fits into the broader context of the Bhagavad Gita"
+    }
+    Ensure your response is a valid JSON object. Do not include any text outside of the JSON structure."""
+
+        user_content = f"""Analyze the following shlokas from the Bhagavad Gita chapter and provide the relationships as specified.
+    Chapter Summary: {json.dumps(chapter_summary)}
+
+    Shlokas:
+    """
+        for shloka in shlokas:
+            user_content += f"Shloka {shloka['shloka_number']}:\n"
+            user_content += f"Sanskrit: {shloka['sanskrit_text']}\n"
+            user_content += f"Meaning: {shloka['meaning']}\n"
+            user_content += f"Interpretation: {shloka['interpretation']}\n"
+            user_content += f"Keywords: {', '.join(shloka['keywords'])}\n\n"
+
+        return generate_validated(self.call, system_content, user_content, CHAPTER_RELATIONSHIPS_SCHEMA,
+                                  "chapter_relationships", context=f"Chapter {chapter_number}, Shlokas {first}-{last}",
+                                  report=self.report, temperature=0.3, max_tokens=2000)
+
+    def summarize_chapter_progression(self, chapter_number, chapter_summary, windows, analyses):
+        """Reduce step for the prose fields: combine per-window progressions into chapter-level text."""
+        system_content = """You are an expert on the Bhagavad Gita. You are given how philosophical concepts develop in consecutive sections of one chapter.
+    Return a JSON object with exactly these keys:
+    {
+        "philosophical_progression": "Description of how philosophical concepts develop through the whole chapter",
+        "chapter_relevance": "Explanation of how this chapter fits into the broader context of the Bhagavad Gita"
+    }
+    Do not include any text outside of the JSON structure."""
+        user_content = f"Chapter {chapter_number} Summary: {json.dumps(chapter_summary)}\n\n"
+        for window, analysis in zip(windows, analyses):
+            user_content += (f"Shlokas {window[0]['shloka_number']}-{window[-1]['shloka_number']}: "
+                             f"{analysis.get('philosophical_progression', '')}\n")
+        return generate_validated(self.call, system_content, user_content, CHAPTER_PROGRESSION_SCHEMA,
+                                  "chapter_progression", context=f"Chapter {chapter_number}",
+                                  report=self.report, temperature=0.3, max_tokens=800)
+
+    def generate_shloka(self, chapter_number, shloka_number):
+        """Generate one complete shloka record, preferring ingested source text over a generated one."""
+        shloka_text = self.source_texts.get((chapter_number, shloka_number))
+        if not shloka_text:
+            shloka_text = self.generate_sanskrit_shloka(chapter_number, shloka_number)
+        details = self.generate_shloka_details(chapter_number, shloka_text, shloka_number)
+        return {
+            "name": f"Shloka {shloka_number}",
+            "chapter": chapter_number,
+            "shloka_number": shloka_number,
+            "sanskrit_text": shloka_text,
+            "transliteration": details["transliteration"],
+            "interpretation": details["interpretation"],
+            "meaning": details["meaning"],
+            "keywords": details["keywords"],
+            "life_application": details["life_application"],
+            "addresses_problems": self.shloka_problem_map.get(f"{chapter_number}:{shloka_number}", [])
+        }
+
+    def generate_chapter(self, chapter, existing=None):
+        """Generate (or complete, when `existing` holds a partial record) one chapter.
+
+        Shlokas are generated concurrently; shlokas already present in `existing` are reused."""
+        chapter_number = chapter["number"]
+        total_shlokas = chapter["total_shlokas"]
+        print(f"\nGenerating Chapter {chapter_number}: {chapter['name']}")
+
+        if existing and existing.get("summary"):
+            chapter_data = dict(existing)
+            chapter_summary = {key: chapter_data.get(key) for key in CHAPTER_SUMMARY_SCHEMA["required"]}
+        else:
+            chapter_summary = self.generate_chapter_summary(chapter_number, chapter["name"])
+            # Shlokas already generated are kept when only the summary is missing
+            chapter_data = {**(existing or {}), "number": chapter_number, "name": chapter["name"], **chapter_summary}
+            chapter_data.setdefault("shlokas", [])
+
+        done = {shloka["shloka_number"]: shloka for shloka in chapter_data.get("shlokas", [])}
+        missing = [n for n in range(1, total_shlokas + 1) if n not in done]
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                futures = {n: pool.submit(self.generate_shloka, chapter_number, n) for n in missing}
+                for n, future in futures.items():
+                    try:
+                        done[n] = future.result()
+                        print(f"Processed Shloka {n} of {total_shlokas}")
+                    except Exception as e:
+                        print(f"Error generating Chapter {chapter_number}, Shloka {n}: {e}")
+        chapter_data["shlokas"] = [done[n] for n in sorted(done)]
+
+        # Only analyze relationships once every shloka exists, so a resumed run picks it up later
+        if len(done) == total_shlokas and (missing or "key_events" not in chapter_data):
+            chapter_data.update(self.analyze_chapter_relationships(chapter_number, chapter_data["shlokas"], chapter_summary))
+        return chapter_data
+
+
+CHAPTER_PROGRESSION_SCHEMA = {
+    "type": "object",
+    "required": ["philosophical_progression", "chapter_relevance"],
+    "properties": {
+        "philosophical_progression": CHAPTER_RELATIONSHIPS_SCHEMA["properties"]["philosophical_progression"],
+        "chapter_relevance": CHAPTER_RELATIONSHIPS_SCHEMA["properties"]["chapter_relevance"]
+    }
+}
+
+
+def _entity_key(name):
+    return " ".join(str(name).split()).casefold()
+
+
+def _merge_unique(target, values):
+    for value in values:
+        if value not in target:
+            target.append(value)
+
+
+def merge_chapter_analyses(analyses, shloka_numbers):
+    """Deterministically merge per-window relationship analyses into one chapter analysis.
+
+    Characters, themes, relationships and events are deduplicated on case/whitespace-insensitive
+    names (the first spelling seen wins, the longest description is kept), shloka lists are unioned,
+    sorted and restricted to `shloka_numbers`, and output order follows first appearance."""
+    valid_shlokas = set(shloka_numbers)
+    names = {}
+
+    def canonical(name):
+        return names.setdefault(_entity_key(name), name)
+
+    def keep_longer(record, description):
+        if len(description or "") > len(record["description"]):
+            record["description"] = description
+
+    characters, themes, relationships, theme_relationships, events = {}, {}, {}, {}, {}
+    for analysis in analyses:
+        for character in analysis.get("characters", []):
+            record = characters.setdefault(_entity_key(character["name"]),
+                                           {"name": canonical(character["name"]), "description": ""})
+            keep_longer(record, character.get("description"))
+        for theme in analysis.get("themes", []):
+            record = themes.setdefault(_entity_key(theme["name"]), {"name": theme["name"], "description": ""})
+            keep_longer(record, theme.get("description"))
+        for rel in analysis.get("character_relationships", []):
+            key = (_entity_key(rel["from"]), _entity_key(rel["to"]))
+            record = relationships.setdefault(key, {"from": canonical(rel["from"]), "to": canonical(rel["to"]),
+                                                    "description": ""})
+            keep_longer(record, rel.get("description"))
+        for rel in analysis.get("theme_relationships", []):
+            record = theme_relationships.setdefault(_entity_key(rel["theme"]),
+                                                    {"theme": rel["theme"], "shlokas": [], "description": ""})
+            _merge_unique(record["shlokas"], rel.get("shlokas", []))
+            keep_longer(record, rel.get("description"))
+        for event in analysis.get("key_events", []):
+            record = events.setdefault(_entity_key(event["event"]),
+                                       {"event": event["event"], "shlokas": [], "characters": []})
+            _merge_unique(record["shlokas"], event.get("shlokas", []))
+            _merge_unique(record["characters"], [canonical(name) for name in event.get("characters", [])])
+
+    for record in list(theme_relationships.values()) + list(events.values()):
+        record["shlokas"] = sorted(n for n in record["shlokas"] if n in valid_shlokas)
+    return {
+        "characters": list(characters.values()),
+        "themes": list(themes.values()),
+        "character_relationships": list(relationships.values()),
+        "theme_relationships": list(theme_relationships.values()),
+        "key_events": list(events.values())
+    }
+
+
+def build_shloka_problem_map(problem_solutions_map):
+    """Reverse mapping "chapter:shloka" -> [problem, ...] for problem lookup."""
+    shloka_problem_map = {}
+    for problem, data in problem_solutions_map.items():
+        for ref in data["references"]:
+            shloka_problem_map.setdefault(f"{ref['chapter']}:{ref['shloka']}", []).append(problem)
+    return shloka_problem_map
+
+
+def is_chapter_complete(chapter_data, chapter):
+    return len(chapter_data.get("shlokas", [])) == chapter["total_shlokas"] and "key_events" in chapter_data
+
+
+# Report failure contexts: "Chapter 2", "Chapter 2, Shloka 47" or "Chapter 2, Shlokas 1-20"
+FAILURE_CONTEXT = re.compile(r"Chapter (\d+)(?:, Shloka (\d+)$)?")
+
+
+def failure_chapter(failure):
+    match = FAILURE_CONTEXT.match(failure.get("context", ""))
+    return int(match.group(1)) if match else None
+
+
+def drop_failed(chapter_data, failures):
+    """Copy of a saved chapter without the records a generation report lists as failed.
+
+    Failed shloka details drop the shloka, a failed summary drops the summary fields and a
+    failed relationship analysis drops key_events, so generate_chapter makes them again."""
+    chapter_data = dict(chapter_data)
+    failed_shlokas = set()
+    for failure in failures:
+        match = FAILURE_CONTEXT.match(failure.get("context", ""))
+        if failure["output"] == "shloka_details" and match and match.group(2):
+            failed_shlokas.add(int(match.group(2)))
+        elif failure["output"] == "chapter_summary":
+            for key in CHAPTER_SUMMARY_SCHEMA["required"]:
+                chapter_data.pop(key, None)
+        elif failure["output"] in ("chapter_relationships", "chapter_progression"):
+            chapter_data.pop("key_events", None)
+    chapter_data["shlokas"] = [shloka for shloka in chapter_data.get("shlokas", [])
+                               if shloka["shloka_number"] not in failed_shlokas]
+    return chapter_data
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temporary file and rename it, so an interrupted run never leaves a half-written corpus."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as json_file:
+        json.dump(data, json_file, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def parse_chapters(value, chapter_info):
+    """Parse "all", "1,2,6" or "1-3,18" into a sorted list of known chapter numbers."""
+    known = {chapter["number"] for chapter in chapter_info["chapters"]}
+    if value.strip().lower() == "all":
+        return sorted(known)
+    numbers = set()
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            numbers.update(range(int(start), int(end) + 1))
+        else:
+            numbers.add(int(part))
+    unknown = numbers - known
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown chapter numbers: {sorted(unknown)}")
+    return sorted(numbers)
+
+
+def run(engine, chapter_numbers, output_filename, resume=False, chapter_info=None, failures=None):
+    """Generate the requested chapters into `output_filename`, checkpointing after every chapter.
+
+    Chapters already in the file that were not requested are kept. With `resume`, the
+    requested chapters reuse what the file holds, except the records listed in `failures`
+    (the previous run's report), which are generated again; without it they are regenerated."""
+    chapter_info = chapter_info or load_chapter_info()
+    gita_data = {"problem_solutions_map": engine.problem_solutions_map, "chapters": []}
+    if os.path.exists(output_filename):
+        with open(output_filename, "r", encoding="utf-8") as f:
+            gita_data["chapters"] = json.load(f).get("chapters", [])
+        print(f"{'Resuming from' if resume else 'Merging into'} {output_filename} "
+              f"({len(gita_data['chapters'])} chapters present)")
+    existing = {chapter["number"]: chapter for chapter in gita_data["chapters"]}
+
+    for chapter in chapter_info["chapters"]:
+        if chapter["number"] not in chapter_numbers:
+            continue
+        previous = existing.get(chapter["number"]) if resume else None
+        chapter_failures = [failure for failure in failures or [] if failure_chapter(failure) == chapter["number"]]
+        if previous and chapter_failures:
+            print(f"Regenerating {len(chapter_failures)} failed records of Chapter {chapter['number']}")
+            previous = drop_failed(previous, chapter_failures)
+        if previous and is_chapter_complete(previous, chapter):
+            print(f"Skipping Chapter {chapter['number']}: already complete")
+            continue
+        try:
+            existing[chapter["number"]] = engine.generate_chapter(chapter, previous)
+        except Exception as e:
+            print(f"Error processing Chapter {chapter['number']}: {str(e)}")
+            continue
+        gita_data["chapters"] = [existing[number] for number in sorted(existing)]
+        write_json_atomic(output_filename, gita_data)
+
+    gita_data["chapters"] = [existing[number] for number in sorted(existing)]
+    write_json_atomic(output_filename, gita_data)
+    return gita_data
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Generate the graphGita corpus with an LLM provider.")
+    parser.add_argument("--provider", choices=sorted(PROVIDERS), default="claude")
+    parser.add_argument("--endpoint", default=os.environ.get("CLAUDE_API_ENDPOINT"),
+                        help="API Gateway URL of the Claude Lambda handler (claude provider)")
+    parser.add_argument("--model", default="gpt-4o", help="Model name (openai provider)")
+    parser.add_argument("--chapters", default="all", help='"all", or chapter numbers/ranges such as "1,2,6" or "1-3"')
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallel shloka generations per chapter")
+    parser.add_argument("--resume", action="store_true", help="Reuse chapters and shlokas already in the output file, regenerating those the report lists as failed")
+    parser.add_argument("--output", default="bhagavad_gita_complete.json")
+    parser.add_argument("--report", default="generation_report.json")
+    parser.add_argument("--chapter-info", default=None, help="Optional chapter metadata JSON (number, name, total_shlokas)")
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--source-bucket", help="S3 bucket with source shloka JSON documents (Sanskrit text)")
+    parser.add_argument("--source-prefix", default="", help="Key prefix of the source documents")
+    parser.add_argument("--s3-endpoint-url", help="Alternative S3 endpoint, e.g. a local S3 stand-in")
+    parser.add_argument("--window-size", type=int, default=20,
+                        help="Analyze chapter relationships in parallel windows of this many shlokas (0 = single call)")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    chapter_info = load_chapter_info(args.chapter_info)
+    try:
+        chapter_numbers = parse_chapters(args.chapters, chapter_info)
+    except (ValueError, argparse.ArgumentTypeError) as e:
+        print(f"Invalid --chapters value: {e}")
+        return 2
+
+    provider_kwargs = {"max_retries": args.max_retries}
+    if args.provider == "claude":
+        if not args.endpoint:
+            print("The claude provider needs --endpoint or CLAUDE_API_ENDPOINT.")
+            return 2
+        provider_kwargs["api_endpoint"] = args.endpoint
+    elif args.provider == "openai":
+        provider_kwargs["model"] = args.model
+    source_texts = None
+    if args.source_bucket:
+        aws_client = AWSClient(endpoint_url=args.s3_endpoint_url, max_workers=args.concurrency)
+        source_texts = aws_client.load_source_shlokas(args.source_bucket, args.source_prefix)
+    engine = GenerationEngine(get_provider(args.provider, **provider_kwargs), concurrency=args.concurrency,
+                              window_size=args.window_size, source_texts=source_texts)
+
+    previous_failures = []
+    if os.path.exists(args.report):
+        with open(args.report, "r", encoding="utf-8") as f:
+            previous_failures = json.load(f).get("failures", [])
+    run(engine, chapter_numbers, args.output, resume=args.resume, chapter_info=chapter_info,
+        failures=previous_failures if args.resume else None)
+    print(f"\nGeneration complete. Data saved to {args.output}")
+
+    # Report how many calls needed a targeted repair and which records still need attention
+    print(engine.report.summary())
+    report = engine.report.to_dict()
+    # Failures of chapters this run did not touch stay listed for a later --resume
+    report["failures"] += [failure for failure in previous_failures if failure_chapter(failure) not in chapter_numbers]
+    write_json_atomic(args.report, report)
+    return 0
+
+
+# Function to create a mapping of problems to their solutions based on authentic versions of the Bhagavad Gita available on archive.org
+def create_problem_solutions_map():
+    """Complete mapping of problems to common human problems based on authentic versions of the Bhagavad Gita available on archive.org
+    Problems covered:
+    Source Texts:
+    1. Sri Aurobindo's Bhagavad Gita
+    URL: https://archive.org/details/sri-aurobindo-the-bhagavat-gita
+    Addresses:
+    - Anger: Managing and overcoming anger
+    - Coping with death of a loved one
+    - Guilt: Dealing with guilt and feelings of sinfulness
+    - Laziness: Strategies to combat laziness and procrastination
+    - Lust: Controlling desires and sensual cravings
+    - Inner peace: Finding tranquility and inner peace
+
+    2. Paramahansa Yogananda's Gita
+    URL: https://archive.org/details/the-bhagavad-gita-paramahansa-yogananda
+    Addresses:
+    - Depression: Dealing with depression and mental suffering
+    - Dealing with envy
+    - Discrimination: Handling discrimination and unfair treatment
+    - Fear: Overcoming fear and anxiety
+    - Greed: Overcoming material attachment
+    - Loneliness: Addressing feelings of isolation
+    - Forgiveness: Learning and practicing forgiveness
+    - Temptation: Dealing with various temptations
+
+    3. Bhagavad Gita As It Is (1972)
+    URL: https://archive.org/details/bhagavadgitaasitisoriginal1972edition
+    Addresses:
+    - Confusion: Gaining clarity
+    - Lack of motivation: Strategies to stay motivated
+    - Forgetfulness: Improving memory
+    - Hopelessness: Finding renewed purpose
+    - Pride: Managing ego and arrogance
+    - Uncontrolled mind: Gaining mental mastery
+    """
+    return {
+        # Part 1
+        "anger": {
+            "description": "Managing and overcoming anger",
+            "references": [
+                {"chapter": 2, "shloka": 56},
+                {"chapter": 2, "shloka": 62},
+                {"chapter": 2, "shloka": 63},
+                {"chapter": 5, "shloka": 26},
+                {"chapter": 16, "shloka": 1},
+                {"chapter": 16, "shloka": 2},
+                {"chapter": 16, "shloka": 3},
+                {"chapter": 16, "shloka": 21}
+            ]
+        },
+        "depression": {
+            "description": "Dealing with depression and mental suffering",
+            "references": [
+                {"chapter": 2, "shloka": 3},
+                {"chapter": 2, "shloka": 14},
+                {"chapter": 5, "shloka": 21}
+            ]
+        },
+        "confusion": {
+            "description": "Clearing confusion and gaining clarity",
+            "references": [
+                {"chapter": 2, "shloka": 7},
+                {"chapter": 3, "shloka": 2},
+                {"chapter": 18, "shloka": 61}
+            ]
+        },
+        "dealing_with_envy": {
+            "description": "Dealing with envy and jealousy",
+            "references": [
+                {"chapter": 12, "shloka": 13},
+                {"chapter": 12, "shloka": 14},
+                {"chapter": 16, "shloka": 19},
+                {"chapter": 18, "shloka": 71}
+            ]
+        },
+        "death_of_loved_one": {
+            "description": "Coping with death of a loved one",
+            "references": [
+                {"chapter": 2, "shloka": 13},
+                {"chapter": 2, "shloka": 20},
+                {"chapter": 2, "shloka": 22},
+                {"chapter": 2, "shloka": 25},
+                {"chapter": 2, "shloka": 27}
+            ]
+        },
+        "demotivated": {
+            "description": "Dealing with lack of motivation",
+            "references": [
+                {"chapter": 11, "shloka": 33},
+                {"chapter": 18, "shloka": 48},
+                {"chapter": 18, "shloka": 78}
+            ]
+        },
+        "discriminated": {
+            "description": "Dealing with discrimination and unfair treatment",
+            "references": [
+                {"chapter": 5, "shloka": 18},
+                {"chapter": 5, "shloka": 19},
+                {"chapter": 6, "shloka": 32},
+                {"chapter": 9, "shloka": 29}
+            ]
+        },
+        # Part 2
+        "fear": {
+            "description": "Overcoming fear and anxiety",
+            "references": [
+                {"chapter": 4, "shloka": 10},
+                {"chapter": 11, "shloka": 50},
+                {"chapter": 18, "shloka": 30}
+            ]
+        },
+        "feeling_sinful": {
+            "description": "Dealing with guilt and feelings of sinfulness",
+            "references": [
+                {"chapter": 4, "shloka": 36},
+                {"chapter": 4, "shloka": 37},
+                {"chapter": 5, "shloka": 10},
+                {"chapter": 9, "shloka": 30},
+                {"chapter": 10, "shloka": 3},
+                {"chapter": 14, "shloka": 6},
+                {"chapter": 18, "shloka": 66}
+            ]
+        },
+        "forgetfulness": {
+            "description": "Dealing with forgetfulness",
+            "references": [
+                {"chapter": 15, "shloka": 15},
+                {"chapter": 18, "shloka": 61}
+            ]
+        },
+        "greed": {
+            "description": "Overcoming greed and attachment",
+            "references": [
+                {"chapter": 14, "shloka": 17},
+                {"chapter": 16, "shloka": 21},
+                {"chapter": 17, "shloka": 25}
+            ]
+        },
+        "laziness": {
+            "description": "Overcoming laziness and procrastination",
+            "references": [
+                {"chapter": 3, "shloka": 8},
+                {"chapter": 3, "shloka": 20},
+                {"chapter": 6, "shloka": 16},
+                {"chapter": 18, "shloka": 39}
+            ]
+        },
+        "loneliness": {
+            "description": "Dealing with feelings of loneliness",
+            "references": [
+                {"chapter": 6, "shloka": 30},
+                {"chapter": 9, "shloka": 29},
+                {"chapter": 13, "shloka": 16},
+                {"chapter": 13, "shloka": 18}
+            ]
+        },
+        # Part 3
+        "losing_hope": {
+            "description": "Dealing with hopelessness and despair",
+            "references": [
+                {"chapter": 4, "shloka": 11},
+                {"chapter": 6, "shloka": 22},
+                {"chapter": 9, "shloka": 34},
+                {"chapter": 18, "shloka": 66},
+                {"chapter": 18, "shloka": 78}
+            ]
+        },
+        "lust": {
+            "description": "Controlling lust and sensual desires",
+            "references": [
+                {"chapter": 3, "shloka": 37},
+                {"chapter": 3, "shloka": 41},
+                {"chapter": 3, "shloka": 43},
+                {"chapter": 5, "shloka": 22},
+                {"chapter": 16, "shloka": 21}
+            ]
+        },
+        "practicing_forgiveness": {
+            "description": "Learning and practicing forgiveness",
+            "references": [
+                {"chapter": 11, "shloka": 44},
+                {"chapter": 12, "shloka": 13},
+                {"chapter": 12, "shloka": 14},
+                {"chapter": 16, "shloka": 1},
+                {"chapter": 16, "shloka": 2},
+                {"chapter": 16, "shloka": 3}
+            ]
+        },
+        "pride": {
+            "description": "Managing ego and pride",
+            "references": [
+                {"chapter": 16, "shloka": 4},
+                {"chapter": 16, "shloka": 13},
+                {"chapter": 16, "shloka": 14},
+                {"chapter": 16, "shloka": 15},
+                {"chapter": 18, "shloka": 26},
+                {"chapter": 18, "shloka": 58}
+            ]
+        },
+        "seeking_peace": {
+            "description": "Finding inner peace and tranquility",
+            "references": [
+                {"chapter": 2, "shloka": 66},
+                {"chapter": 2, "shloka": 71},
+                {"chapter": 4, "shloka": 39},
+                {"chapter": 5, "shloka": 29},
+                {"chapter": 8, "shloka": 28}
+            ]
+        },
+        "temptation": {
+            "description": "Dealing with temptations",
+            "references": [
+                {"chapter": 2, "shloka": 60},
+                {"chapter": 2, "shloka": 61},
+                {"chapter": 2, "shloka": 70},
+                {"chapter": 7, "shloka": 14}
+            ]
+        },
+        "uncontrolled_mind": {
+            "description": "Managing an uncontrolled mind",
+            "references": [
+                {"chapter": 6, "shloka": 5},
+                {"chapter": 6, "shloka": 6},
+                {"chapter": 6, "shloka": 26},
+                {"chapter": 6, "shloka": 35}
+            ]
+        }
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(main())
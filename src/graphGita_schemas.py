@@ -0,0 +1,245 @@
+import json
+import threading
+import jsonschema
+
+# JSON Schemas for every structured output the generation pipeline asks the model for.
+# They mirror the prompts in graphGita_engine.py and the record
+# layout of data/bhagavad_gita_complete.json, so anything that validates can be shipped as is.
+NON_EMPTY_STRING = {"type": "string", "minLength": 1}
+STRING_LIST = {"type": "array", "items": NON_EMPTY_STRING, "minItems": 1}
+SHLOKA_NUMBERS = {"type": "array", "items": {"type": "integer", "minimum": 1}}
+
+CHAPTER_SUMMARY_SCHEMA = {
+    "type": "object",
+    "required": ["summary", "main_theme", "philosophical_aspects", "life_problems_addressed", "yoga_type"],
+    "properties": {
+        "summary": NON_EMPTY_STRING,
+        "main_theme": NON_EMPTY_STRING,
+        "philosophical_aspects": STRING_LIST,
+        "life_problems_addressed": STRING_LIST,
+        "yoga_type": NON_EMPTY_STRING
+    }
+}
+
+SHLOKA_DETAILS_SCHEMA = {
+    "type": "object",
+    "required": ["transliteration", "interpretation", "meaning", "keywords", "life_application"],
+    "properties": {
+        "transliteration": NON_EMPTY_STRING,
+        "interpretation": NON_EMPTY_STRING,
+        "meaning": NON_EMPTY_STRING,
+        "keywords": STRING_LIST,
+        "life_application": NON_EMPTY_STRING
+    }
+}
+
+CHAPTER_RELATIONSHIPS_SCHEMA = {
+    "type": "object",
+    "required": ["characters", "themes", "character_relationships", "theme_relationships",
+                 "key_events", "philosophical_progression", "chapter_relevance"],
+    "properties": {
+        "characters": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["name", "description"],
+                "properties": {"name": NON_EMPTY_STRING, "description": {"type": "string"}}
+            }
+        },
+        "themes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["name", "description"],
+                "properties": {"name": NON_EMPTY_STRING, "description": {"type": "string"}}
+            }
+        },
+        "character_relationships": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["from", "to", "description"],
+                "properties": {"from": NON_EMPTY_STRING, "to": NON_EMPTY_STRING, "description": {"type": "string"}}
+            }
+        },
+        "theme_relationships": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["theme", "shlokas", "description"],
+                "properties": {"theme": NON_EMPTY_STRING, "shlokas": SHLOKA_NUMBERS, "description": {"type": "string"}}
+            }
+        },
+        "key_events": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["event", "shlokas", "characters"],
+                "properties": {
+                    "event": NON_EMPTY_STRING,
+                    "shlokas": SHLOKA_NUMBERS,
+                    "characters": {"type": "array", "items": NON_EMPTY_STRING}
+                }
+            }
+        },
+        "philosophical_progression": NON_EMPTY_STRING,
+        "chapter_relevance": NON_EMPTY_STRING
+    }
+}
+
+
+# Tracks how many model calls produced valid output straight away, how many needed a
+# targeted repair, and which records still failed after repair (so they can be regenerated).
+class RepairReport:
+    def __init__(self):
+        self.counts = {}
+        self.failures = []
+        self._lock = threading.Lock()
+
+    def record(self, label, outcome, context="", fields=None):
+        with self._lock:
+            counts = self.counts.setdefault(label, {"calls": 0, "valid": 0, "repaired": 0, "failed": 0})
+            counts["calls"] += 1
+            counts[outcome] += 1
+            if outcome == "failed":
+                self.failures.append({"output": label, "context": context, "fields": sorted(fields or [])})
+
+    def to_dict(self):
+        return {"counts": self.counts, "failures": self.failures}
+
+    def summary(self):
+        lines = ["Structured output report:"]
+        for label, counts in sorted(self.counts.items()):
+            lines.append(f"  {label}: {counts['calls']} calls, {counts['valid']} valid, "
+                         f"{counts['repaired']} repaired, {counts['failed']} failed")
+        for failure in self.failures:
+            lines.append(f"  FAILED {failure['output']} [{failure['context']}]: {', '.join(failure['fields'])}")
+        return "\n".join(lines)
+
+
+REPAIR_REPORT = RepairReport()
+
+
+def extract_json(text):
+    """Extract the first JSON object from a model response.
+
+    Tolerates markdown fences, prose around the object, raw newlines inside strings and
+    responses cut off mid-stream (open containers are closed, and a trailing member that
+    is incomplete or ends in an unterminated string is dropped whole, even when it is an
+    array with complete items). Raises ValueError if no object can be recovered."""
+    if not text:
+        raise ValueError("Empty response")
+    start = text.find('{')
+    if start == -1:
+        raise ValueError("No JSON object found in response")
+
+    stack = []
+    cut_points = []  # end index of each comma between top-level members
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+        elif ch in '}]':
+            if stack and stack[-1] == ch:
+                stack.pop()
+            if not stack:
+                return json.loads(text[start:i + 1], strict=False)
+        elif ch == ',' and len(stack) == 1:
+            cut_points.append(i)
+
+    # The response was truncated: close what is open, then fall back to the last complete member.
+    # A string cut off mid-value is never closed, so its member is dropped and re-requested
+    # instead of shipping the truncated text. The fallback only cuts between top-level
+    # members: cutting inside an open array would ship a list with its tail missing.
+    candidates = []
+    if not in_string:
+        candidates.append(text[start:].rstrip().rstrip(',') + ''.join(reversed(stack)))
+    candidates += [text[start:end] + '}' for end in reversed(cut_points)]
+    for candidate in candidates:
+        try:
+            return json.loads(candidate, strict=False)
+        except json.JSONDecodeError:
+            continue
+    raise ValueError("Could not recover a JSON object from truncated response")
+
+
+def invalid_fields(data, schema):
+    """Return the top-level properties of `data` that are missing or fail `schema`."""
+    if not isinstance(data, dict):
+        return set(schema["required"])
+    bad = set()
+    for error in jsonschema.Draft7Validator(schema).iter_errors(data):
+        if error.absolute_path:
+            bad.add(error.absolute_path[0])
+        elif error.validator == "required":
+            bad.update(key for key in schema["required"] if key not in data)
+    return bad
+
+
+def empty_value(property_schema):
+    """Neutral value for a property that could not be generated."""
+    return [] if property_schema.get("type") == "array" else ""
+
+
+def generate_validated(call, system_content, user_content, schema, label, context="",
+                       report=REPAIR_REPORT, max_repairs=1, **call_kwargs):
+    """Call the model, validate its JSON against `schema` and re-request only the invalid fields.
+
+    Fields that are still invalid after `max_repairs` targeted retries are set to empty
+    values and recorded in `report`, instead of writing error placeholders into the corpus."""
+    data = {}
+    response = call(system_content, user_content, **call_kwargs)
+    try:
+        data = extract_json(response)
+    except ValueError as e:
+        print(f"Could not extract JSON for {label} {context}: {e}")
+    if not isinstance(data, dict):
+        data = {}
+    data = {key: value for key, value in data.items() if key in schema["properties"]}
+
+    bad = invalid_fields(data, schema)
+    if not bad:
+        report.record(label, "valid", context)
+        return data
+
+    for attempt in range(max_repairs):
+        print(f"Re-requesting invalid fields for {label} {context}: {', '.join(sorted(bad))}")
+        partial_schema = {
+            "type": "object",
+            "required": sorted(bad),
+            "properties": {key: schema["properties"][key] for key in bad}
+        }
+        repair_user_content = f"""{user_content}
+
+    Your previous answer was missing these fields or had invalid values for them: {', '.join(sorted(bad))}.
+    Return a JSON object containing ONLY these keys, matching this JSON Schema: {json.dumps(partial_schema)}
+    Do not include any text outside of the JSON object."""
+        response = call(system_content, repair_user_content, **call_kwargs)
+        try:
+            patch = extract_json(response)
+        except ValueError as e:
+            print(f"Could not extract JSON from repair response for {label} {context}: {e}")
+            continue
+        if isinstance(patch, dict):
+            data.update({key: value for key, value in patch.items() if key in bad})
+        bad = invalid_fields(data, schema)
+        if not bad:
+            report.record(label, "repaired", context)
+            return data
+
+    report.record(label, "failed", context, bad)
+    for key in bad:
+        data[key] = empty_value(schema["properties"][key])
+    return data
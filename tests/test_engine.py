@@ -0,0 +1,63 @@
+import json
+
+from graphGita_engine import GenerationEngine, MockProvider, run
+from graphGita_schemas import RepairReport
+
+CHAPTER_INFO = {"chapters": [{"number": 1, "name": "One", "total_shlokas": 3},
+                             {"number": 2, "name": "Two", "total_shlokas": 2}]}
+
+
+def engine():
+    return GenerationEngine(MockProvider(), concurrency=2, report=RepairReport(), window_size=0)
+
+
+def load_chapters(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return {chapter["number"]: chapter for chapter in json.load(f)["chapters"]}
+
+
+def test_run_keeps_chapters_not_requested(tmp_path):
+    output = str(tmp_path / "corpus.json")
+    run(engine(), [1, 2], output, chapter_info=CHAPTER_INFO)
+    chapters = load_chapters(output)
+    chapters[1]["summary"] = "kept"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"chapters": list(chapters.values())}, f)
+
+    run(engine(), [2], output, chapter_info=CHAPTER_INFO)
+    chapters = load_chapters(output)
+    assert sorted(chapters) == [1, 2]
+    assert chapters[1]["summary"] == "kept"
+
+
+def test_resume_keeps_shlokas_when_the_summary_is_missing(tmp_path):
+    output = str(tmp_path / "corpus.json")
+    run(engine(), [1], output, chapter_info=CHAPTER_INFO)
+    chapter = load_chapters(output)[1]
+    chapter["summary"] = ""
+    del chapter["key_events"]
+    chapter["shlokas"][0]["meaning"] = "kept"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"chapters": [chapter]}, f)
+
+    run(engine(), [1], output, resume=True, chapter_info=CHAPTER_INFO)
+    chapter = load_chapters(output)[1]
+    assert chapter["summary"] == "Mock chapter summary"
+    assert chapter["shlokas"][0]["meaning"] == "kept"
+
+
+def test_resume_regenerates_records_that_failed(tmp_path):
+    output = str(tmp_path / "corpus.json")
+    run(engine(), [1], output, chapter_info=CHAPTER_INFO)
+    chapter = load_chapters(output)[1]
+    chapter["shlokas"][0]["meaning"] = "kept"
+    chapter["shlokas"][1]["meaning"] = ""
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"chapters": [chapter]}, f)
+
+    failures = [{"output": "shloka_details", "context": "Chapter 1, Shloka 2", "fields": ["meaning"]}]
+    run(engine(), [1], output, resume=True, chapter_info=CHAPTER_INFO, failures=failures)
+    shlokas = load_chapters(output)[1]["shlokas"]
+    assert [shloka["shloka_number"] for shloka in shlokas] == [1, 2, 3]
+    assert shlokas[0]["meaning"] == "kept"
+    assert shlokas[1]["meaning"] == "Mock meaning"
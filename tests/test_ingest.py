@@ -0,0 +1,51 @@
+import json
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from graphGita_engine import AWSClient
+
+BUCKET = "graphgita-sources"
+REGION = "eu-west-1"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        s3 = boto3.client("s3", region_name=REGION)
+        s3.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": REGION})
+        yield AWSClient(region_name=REGION, s3_client=s3, max_workers=4)
+
+
+def put_shlokas(s3, count):
+    keys = set()
+    for index in range(count):
+        key = f"shlokas/{index:05d}.json"
+        s3.put_object(Bucket=BUCKET, Key=key, Body=json.dumps(
+            {"chapter": 1 + index // 100, "shloka_number": 1 + index % 100, "sanskrit_text": f"text {index}"}))
+        keys.add(key)
+    return keys
+
+
+def test_keys_and_documents_follow_pagination(client):
+    keys = put_shlokas(client.s3_client, 1205)
+    client.s3_client.put_object(Bucket=BUCKET, Key="shlokas/README.txt", Body=b"not a source")
+
+    assert set(client.iter_s3_keys(BUCKET, "shlokas/")) == keys
+    documents = dict(client.iter_documents(BUCKET, "shlokas/"))
+    assert set(documents) == keys
+    assert json.loads(documents["shlokas/01204.json"])["sanskrit_text"] == "text 1204"
+    assert len(client.load_source_shlokas(BUCKET, "shlokas/")) == 1205
+
+
+def test_undecodable_object_fails_without_retries(client, monkeypatch):
+    client.s3_client.put_object(Bucket=BUCKET, Key="shlokas/bad.json", Body=b'{"sanskrit_text": "\xff\xfe"}')
+    calls = []
+    get_object = client.s3_client.get_object
+    monkeypatch.setattr(client.s3_client, "get_object", lambda **kwargs: calls.append(kwargs) or get_object(**kwargs))
+
+    assert client.get_object(BUCKET, "shlokas/bad.json") is None
+    assert len(calls) == 1
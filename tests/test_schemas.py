@@ -0,0 +1,34 @@
+import pytest
+
+from graphGita_schemas import SHLOKA_DETAILS_SCHEMA, extract_json, invalid_fields
+
+
+def test_extract_json_from_fenced_response():
+    assert extract_json('Here you go:\n```json\n{"meaning": "The soul is eternal"}\n```') == \
+        {"meaning": "The soul is eternal"}
+
+
+def test_extract_json_drops_member_cut_off_mid_string():
+    # The truncated text must not pass as a complete value
+    assert extract_json('{"transliteration": "x", "meaning": "The soul is eter') == {"transliteration": "x"}
+
+
+def test_extract_json_string_cut_off_in_first_member_is_unrecoverable():
+    with pytest.raises(ValueError):
+        extract_json('{"meaning": "The soul is eter')
+
+
+def test_extract_json_drops_array_cut_off_mid_item():
+    assert extract_json('{"meaning": "x", "keywords": ["dharma", "kar') == {"meaning": "x"}
+    with pytest.raises(ValueError):
+        extract_json('{"keywords": ["dharma", "kar')
+
+
+def test_truncated_member_is_reported_invalid():
+    data = extract_json('{"transliteration": "x", "meaning": "The soul is eter')
+    assert "meaning" in invalid_fields(data, SHLOKA_DETAILS_SCHEMA)
+
+
+def test_extract_json_closes_open_containers():
+    assert extract_json('{"keywords": ["dharma", "karma"]') == {"keywords": ["dharma", "karma"]}
+    assert extract_json('{"a": 1, "b": [1, 2') == {"a": 1, "b": [1, 2]}